@@ -4,8 +4,13 @@ layout (location = 0) in vec3 in_position;
 layout (location = 1) in vec2 in_texcoords;
 layout (location = 2) in float in_tex;
 
-uniform mat4 m_proj;
-uniform mat4 m_view;
+// shared camera block -- filled once per frame by the active Camera3D
+layout (std140) uniform Camera {
+    mat4 m_proj;
+    mat4 m_view;
+    vec4 u_camera;
+};
+
 uniform mat4 m_model;
 
 out vec2 f_uv;
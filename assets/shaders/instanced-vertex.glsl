@@ -0,0 +1,24 @@
+#version 330 core
+
+layout (location = 0) in vec3 in_position;
+layout (location = 1) in vec2 in_texcoords;
+layout (location = 2) in float in_tex;
+
+// per instance -- takes up locations 3 to 6
+layout (location = 3) in mat4 in_model;
+
+// shared camera block -- filled once per frame by the active Camera3D
+layout (std140) uniform Camera {
+    mat4 m_proj;
+    mat4 m_view;
+    vec4 u_camera;
+};
+
+out vec2 f_uv;
+out float f_tex;
+
+void main() {
+    f_tex = in_tex;
+    f_uv = in_texcoords;
+    gl_Position = m_proj * m_view * in_model * vec4(in_position, 1.0);
+}
@@ -5,8 +5,13 @@ layout (location = 1) in vec3 in_normal;
 layout (location = 2) in vec3 in_position;
 
 
-uniform mat4 m_proj;
-uniform mat4 m_view;
+// shared camera block -- filled once per frame by the active Camera3D
+layout (std140) uniform Camera {
+    mat4 m_proj;
+    mat4 m_view;
+    vec4 u_camera;
+};
+
 uniform mat4 m_model;
 
 out vec3 f_position;
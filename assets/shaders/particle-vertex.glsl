@@ -0,0 +1,32 @@
+#version 330 core
+
+// per vertex -- unit diamond corner
+layout (location = 0) in vec2 in_corner;
+
+// per instance
+layout (location = 1) in vec2 in_position;
+layout (location = 2) in float in_rotation;
+layout (location = 3) in float in_size;
+layout (location = 4) in vec3 in_color;
+
+// framebuffer size in pixels
+uniform vec2 u_resolution;
+
+out vec3 f_color;
+
+void main() {
+    float r = radians(in_rotation);
+    float c = cos(r);
+    float s = sin(r);
+
+    // rotate + scale the corner, then move into pixel space
+    vec2 pixel = in_position + in_size * vec2(
+        in_corner.x * c - in_corner.y * s,
+        in_corner.x * s + in_corner.y * c
+    );
+
+    // pixel space (y down) -> ndc (y up)
+    vec2 ndc = pixel / u_resolution * 2.0 - 1.0;
+    f_color = in_color / 255.0;
+    gl_Position = vec4(ndc.x, -ndc.y, 0.0, 1.0);
+}
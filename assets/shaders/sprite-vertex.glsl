@@ -0,0 +1,16 @@
+#version 330 core
+
+layout (location = 0) in vec2 in_position;
+layout (location = 1) in vec2 in_texcoords;
+
+// framebuffer size in pixels
+uniform vec2 u_resolution;
+
+out vec2 f_uv;
+
+void main() {
+    // pixel space (y down) -> ndc (y up)
+    vec2 ndc = in_position / u_resolution * 2.0 - 1.0;
+    f_uv = in_texcoords;
+    gl_Position = vec4(ndc.x, -ndc.y, 0.0, 1.0);
+}
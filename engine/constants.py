@@ -1,7 +1,6 @@
 import glm
 import pygame
 
-
 # ======================================================================== #
 # context
 # ======================================================================== #
@@ -34,6 +33,8 @@ MGL_FRAMEBUFFER_VAO = None
 MGL_FRAMEBUFFER_VBO = None
 MGL_FRAMEBUFFER_SHADER = None
 MGL_FRAMEBUFFER_RENDERING_MANIFOLD = None
+MGL_CAMERA_UBO = None
+MGL_STATE = None
 
 BACKGROUND_COLOR = (255, 0, 0)
 
@@ -55,15 +56,70 @@ CTX_INPUT_HANDLER = None
 CTX_SIGNAL_HANDLER = None
 CTX_RESOURCE_MANAGER = None
 CTX_GAMESTATE_MANAGER = None
+CTX_JOB_SYSTEM = None
+CTX_SPRITE_BATCH = None
+CTX_RENDER_QUEUE = None
+CTX_PARTICLE_BATCH = None
+
+# job system -- 0 = pick from cpu count
+DEFAULT_JOB_THREAD_WORKERS = 0
+DEFAULT_JOB_PROCESS_WORKERS = 0
+
+# particle constants -- columns start small + double up to the capacity
+DEFAULT_PARTICLE_CAPACITY = 100_000
+DEFAULT_PARTICLE_START_CAPACITY = 256
+
+# instancing constants -- starting capacity, grows by doubling
+DEFAULT_INSTANCE_CAPACITY = 64
+
+# signal constants -- queued packets before the ring grows (power of two)
+# validation -- "emit" checks arg types once per emit, "none" skips the check
+DEFAULT_SIGNAL_QUEUE_CAPACITY = 4096
+DEFAULT_SIGNAL_VALIDATION = "emit"
+
+# sprite batch constants -- sprites per frame before the buffer grows
+DEFAULT_SPRITE_BATCH_CAPACITY = 1024
+
+# texture atlas constants -- page size must be a power of two
+DEFAULT_ATLAS_PAGE_SIZE = 2048
+DEFAULT_ATLAS_PADDING = 1
+
+# mesh cache constants -- binary copies of parsed model files
+DEFAULT_MESH_CACHE_FOLDER = "assets/.cache/meshes"
 
 # world constants
 DEFAULT_CHUNK_PIXEL_WIDTH = 4096
 DEFAULT_CHUNK_PIXEL_HEIGHT = 4096
 
+# chunk activation -- chunks past the simulation distance (but inside the render
+# distance) only update every `DEFAULT_CHUNK_OUTER_TICK_INTERVAL` frames
+DEFAULT_CHUNK_RENDER_DISTANCE = 4
+DEFAULT_CHUNK_SIMULATION_DISTANCE = 2
+DEFAULT_CHUNK_OUTER_TICK_INTERVAL = 4
+
+# chunk storage -- "dict" or "grid" (dense, bounded: min x, min y, max x, max y)
+DEFAULT_CHUNK_STORAGE = "dict"
+DEFAULT_CHUNK_GRID_BOUNDS = (-64, -64, 64, 64)
+
+# chunk streaming -- stored chunks are loaded ahead of the camera inside the
+# load distance, chunks past the evict distance are paged out to disk
+DEFAULT_CHUNK_LOAD_DISTANCE = 5
+DEFAULT_CHUNK_EVICT_DISTANCE = 7
+DEFAULT_CHUNK_STORE_FOLDER = "assets/.cache/chunks"
+
+# chunk generation -- one noise sample per tile, results cached by (seed, chunk)
+DEFAULT_WORLD_SEED = 0
+DEFAULT_CHUNK_TILE_SIZE = 64
+DEFAULT_CHUNK_GEN_CACHE_SIZE = 256
+DEFAULT_CHUNK_GEN_FOLDER = "assets/.cache/terrain"
+
 DEFAULT_PHYSICS_GRAVITY = pygame.Vector2(0, -9.8)
 DEFAULT_PHYSICS_POS_STEPS = 2
 DEFAULT_PHYSICS_VEL_STEPS = 4
 
+DEFAULT_BROADPHASE_CELL_SIZE = 128
+DEFAULT_AABB_TREE_MARGIN = 8
+
 
 # ======================================================================== #
 # constants
@@ -7,13 +7,18 @@ import moderngl as mgl
 
 import pywavefront
 
+from engine.system import jobs
 from engine.system import signal
 from engine.system import gamestate
 
 from engine.graphics import buffer
 from engine.graphics import camera
 from engine.graphics import shader
+from engine.graphics import atlas
 from engine.graphics import texture
+from engine.graphics import particle
+from engine.graphics import spritebatch
+from engine.graphics import renderqueue
 
 from engine.physics import entity
 
@@ -26,7 +31,6 @@ from OpenGL.GLUT import *
 import engine.constants as consts
 import engine.graphics.constants as gfx_consts
 
-
 # ======================================================================== #
 # init
 # ======================================================================== #
@@ -59,6 +63,7 @@ def init():
         consts.WINDOW_BIT_DEPTH,
     )
     consts.MGL_CONTEXT = mgl.create_context()
+    consts.MGL_STATE = renderqueue.GLStateCache()
     consts.W_CLOCK = pygame.time.Clock()
     consts.W_FRAMEBUFFER = pygame.Surface(
         (consts.FRAMEBUFFER_WIDTH, consts.FRAMEBUFFER_HEIGHT),
@@ -74,6 +79,7 @@ def init():
     consts.CTX_INPUT_HANDLER = inputhandler.InputHandler()
     consts.CTX_SIGNAL_HANDLER = signal.SignalHandler()
     consts.CTX_RESOURCE_MANAGER = resourcemanager.ResourceManager()
+    consts.CTX_JOB_SYSTEM = jobs.JobSystem()
 
     consts.CTX_GAMESTATE_MANAGER = gamestate.GameStateManager()
     # update ecs handler
@@ -117,6 +123,17 @@ def init():
         ),
     )
 
+    consts.MGL_CAMERA_UBO = buffer.UniformBufferObject(
+        gfx_consts.CAMERA_UNIFORM_BLOCK,
+        gfx_consts.CAMERA_UNIFORM_SIZE,
+        gfx_consts.CAMERA_UNIFORM_BINDING,
+    )
+    consts.CTX_RENDER_QUEUE = renderqueue.RenderQueue()
+    consts.CTX_PARTICLE_BATCH = particle.ParticleBatch()
+    consts.CTX_SPRITE_BATCH = spritebatch.SpriteBatch(
+        texture_atlas=atlas.TextureAtlas()
+    )
+
     # ------------------------------------------------------------------------ #
 
 
@@ -174,6 +191,7 @@ def run():
         # reset + clearing
         # ------------------------------------------------------------------------ #
 
+        consts.MGL_STATE.reset()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         consts.MGL_FRAMEBUFFER().clear(*consts.BACKGROUND_COLOR, depth=1.0)
         consts.W_FRAMEBUFFER.fill(consts.BACKGROUND_COLOR)
@@ -192,18 +210,24 @@ def run():
             # update game state
             consts.CTX_GAMESTATE_MANAGER.update()
             consts.CTX_SIGNAL_HANDLER.handle()
+            consts.CTX_RENDER_QUEUE.flush()
+            consts.CTX_PARTICLE_BATCH.flush()
+            consts.CTX_SPRITE_BATCH.flush()
 
             # stage 2: render pass #2
-            consts.MGL_CONTEXT.screen.use()
+            consts.MGL_STATE.use_framebuffer(consts.MGL_CONTEXT.screen)
             consts.MGL_FRAMEBUFFER.get_color_attachments()[0].use(location=1)
             consts.MGL_FRAMEBUFFER.get_depth_attachment().use(location=2)
             consts.MGL_FRAMEBUFFER_RENDERING_MANIFOLD.handle()
         else:
             # render to screen directly
-            consts.MGL_CONTEXT.screen.use()
+            consts.MGL_STATE.use_framebuffer(consts.MGL_CONTEXT.screen)
 
             consts.CTX_GAMESTATE_MANAGER.update()
             consts.CTX_SIGNAL_HANDLER.handle()
+            consts.CTX_RENDER_QUEUE.flush()
+            consts.CTX_PARTICLE_BATCH.flush()
+            consts.CTX_SPRITE_BATCH.flush()
 
         # update window
         pygame.display.flip()
@@ -218,6 +242,8 @@ def run():
 
     # clear up all game states
     consts.CTX_GAMESTATE_MANAGER.__on_clean__()
+    consts.CTX_JOB_SYSTEM.__on_clean__()
+    consts.CTX_SPRITE_BATCH.__on_clean__()
     # clean up textures + shaders + buffers + vaos
     texture.Texture.__on_clean__()
     shader.ShaderProgram.__on_clean__()
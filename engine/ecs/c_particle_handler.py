@@ -1,9 +1,35 @@
+import math
 import pygame
-import random
+import numpy as np
 
 import engine.constants as consts
 
 from engine.system import ecs
+from engine.system import scheduler
+
+from engine.graphics import particle
+
+"""
+Particles are stored as a struct of arrays.
+- one numpy column per particle property
+- columns double in size when full, up to `max_particles`
+- the first `_particle_count` rows are alive
+- dead particles are swap-removed with live particles from the tail
+
+Stepping
+- ParticleSystem steps every emitter in an inner (every frame) chunk on the
+  job system, the component only renders them
+- emitters in outer chunks -- or without the system -- step in `update()`
+- create/update/death functions may run off the main thread, keep pygame
+  surfaces and gl objects in the render function
+
+Rendering
+- gpu_render_func -- uploads the emitter + queues one instanced draw call on
+  `CTX_PARTICLE_BATCH` (see graphics.particle), the default when a gl context
+  exists
+- default_render_func -- draws into `W_FRAMEBUFFER` with pygame, one line loop
+  per particle (headless / no gl context)
+"""
 
 # ======================================================================== #
 # Particle Handler
@@ -12,117 +38,278 @@ from engine.system import ecs
 
 class ParticleHandlerComponent(ecs.Component):
 
-    def __init__(self, updates_per_second: float = 30):
+    def __init__(
+        self,
+        updates_per_second: float = 30,
+        max_particles: int = consts.DEFAULT_PARTICLE_CAPACITY,
+        emit_count: int = 1,
+        lifetime: float = 2,
+    ):
         super().__init__()
 
-        self._particles = {}
-        self._dead_particles = []
         self._particle_count = 0
-        self._particle_id_counter = 0
-        self._max_particles = 1000
+        self._max_particles = max_particles
+        self._capacity = min(consts.DEFAULT_PARTICLE_START_CAPACITY, max_particles)
+
+        # particle columns
+        self._positions = np.zeros((self._capacity, 2), dtype="float32")
+        self._velocities = np.zeros((self._capacity, 2), dtype="float32")
+        self._rotations = np.zeros(self._capacity, dtype="float32")
+        self._rotation_speeds = np.zeros(self._capacity, dtype="float32")
+        self._sizes = np.zeros(self._capacity, dtype="float32")
+        self._ages = np.zeros(self._capacity, dtype="float32")
+        self._colors = np.zeros((self._capacity, 3), dtype="uint8")
+        self._columns = [
+            self._positions,
+            self._velocities,
+            self._rotations,
+            self._rotation_speeds,
+            self._sizes,
+            self._ages,
+            self._colors,
+        ]
 
         # particle logic
         self._updates_per_second = updates_per_second
         self._update_time = 1 / self._updates_per_second
         self._timer = 0
+        # time stepped by the current step -- see `step`
+        self._delta_time = 0
+        self._emit_count = emit_count
+        self._lifetime = lifetime
+        self._rng = np.random.default_rng()
 
         # default functions
         self._create_func = default_create_func
         self._update_func = default_update_func
         self._death_func = default_death_func
+        self._render_func = (
+            gpu_render_func if consts.MGL_CONTEXT is not None else default_render_func
+        )
+
+        # set by ParticleSystem when it stepped the emitter this frame
+        self._stepped = False
+
+        # gpu renderer -- created on first use by gpu_render_func
+        self._renderer = None
+
+    def __on_remove__(self):
+        # the renderer belongs to this emitter only
+        self.__on_clean__()
+
+    def __on_clean__(self):
+        if self._renderer is not None:
+            if consts.CTX_PARTICLE_BATCH is not None:
+                consts.CTX_PARTICLE_BATCH.remove(self._renderer)
+            self._renderer.clean()
+            self._renderer = None
 
     # ------------------------------------------------------------------------ #
     # particle logic
     # ------------------------------------------------------------------------ #
 
     def update(self):
+        if not self._stepped:
+            self.step(self._entity._delta_time)
+        self._stepped = False
+        self._render_func(self)
+
+    def step(self, delta_time: float = None):
+        self._delta_time = consts.DELTA_TIME if delta_time is None else delta_time
         self._create_func(self)
         self._update_func(self)
         self._death_func(self)
 
-    def update_functions(self, create_func=None, update_func=None, death_func=None):
+    def update_functions(
+        self, create_func=None, update_func=None, death_func=None, render_func=None
+    ):
         if create_func:
             self._create_func = create_func
         if update_func:
             self._update_func = update_func
         if death_func:
             self._death_func = death_func
+        if render_func:
+            self._render_func = render_func
+
+    def allocate(self, count: int) -> slice:
+        # reserve rows at the end of the pool -- returns the new rows
+        start = self._particle_count
+        end = min(start + count, self._max_particles)
+        if end > self._capacity:
+            self._grow(end)
+        self._particle_count = end
+        return slice(start, end)
+
+    def _grow(self, required: int):
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        capacity = min(capacity, self._max_particles)
+
+        columns = []
+        for column in self._columns:
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[: self._particle_count] = column[: self._particle_count]
+            columns.append(grown)
+        (
+            self._positions,
+            self._velocities,
+            self._rotations,
+            self._rotation_speeds,
+            self._sizes,
+            self._ages,
+            self._colors,
+        ) = columns
+        self._columns = columns
+        self._capacity = capacity
+
+    def kill(self, dead: np.ndarray):
+        # vectorised swap-remove -- `dead` is a bool mask over the live rows
+        n = self._particle_count
+        dead_count = int(np.count_nonzero(dead))
+        if not dead_count:
+            return
+        new_count = n - dead_count
+
+        # holes inside the kept range are filled by live particles from the tail
+        holes = np.flatnonzero(dead[:new_count])
+        movers = new_count + np.flatnonzero(~dead[new_count:n])
+        for column in self._columns:
+            column[holes] = column[movers]
+        self._particle_count = new_count
+
+    def get_alive(self, column: np.ndarray) -> np.ndarray:
+        return column[: self._particle_count]
+
+
+# ======================================================================== #
+# Particle System
+# ======================================================================== #
 
-    def generate_particle_id(self):
-        self._particle_id_counter += 1
-        return self._particle_id_counter
+
+class ParticleSystem(scheduler.System):
+    """
+    Steps particle emitters on the job system -- rendering stays in
+    `ParticleHandlerComponent.update` on the main thread.
+    """
+
+    def __init__(self, name: str = "ParticleHandlerComponent.step", **kwargs):
+        super().__init__(
+            name,
+            step_emitters,
+            writes=(ParticleHandlerComponent,),
+            parallel=True,
+            **kwargs,
+        )
+
+    def get_args(self) -> tuple:
+        # inner chunks only -- outer chunks step with their scaled delta time
+        emitters = list(self._ecs_handler.iterate_components(ParticleHandlerComponent))
+        gamestate = self._ecs_handler._gamestate
+        world = gamestate._world if gamestate is not None else None
+        if world is None:
+            # no chunks to ask -- every emitter ticks each frame
+            return (emitters, consts.DELTA_TIME)
+        return (
+            [x for x in emitters if get_entity_tick(world, x._entity) == 1],
+            consts.DELTA_TIME,
+        )
+
+
+def get_entity_tick(world: "World2D", entity: "Entity"):
+    # tick interval of the chunk holding the entity -- None if it is not active
+    chunk_pos = entity._chunk_pos
+    if entity._layer is not None:
+        # grid layers keep entities outside of the grid in the nearest edge chunk
+        chunk = entity._layer.find_chunk(chunk_pos)
+        if chunk is not None:
+            chunk_pos = chunk._chunk_position
+    tick = world.get_chunk_tick(chunk_pos)
+    return tick[0] if tick is not None else None
+
+
+def step_emitters(emitters: list, delta_time: float):
+    for emitter in emitters:
+        emitter.step(delta_time)
+        emitter._stepped = True
 
 
 # default particle handler logic
 
 
 def default_create_func(self):
-    self._timer += consts.DELTA_TIME
+    self._timer += self._delta_time
     if self._timer < self._update_time:
         return
     self._timer = 0
 
-    # create a default square particle with rotation
-    # 0 - id
-    # 1 - position
-    # 2 - velocity
-    # 3 - rotation
-    # 4 - rotation_speed
-    # 5 - size
-    # 6 - alive time
-    if self._particle_count >= self._max_particles:
+    # create default square particles with rotation
+    rows = self.allocate(self._emit_count)
+    count = rows.stop - rows.start
+    if count <= 0:
         return
 
-    self._particles[self.generate_particle_id()] = [
-        self.generate_particle_id(),
-        self._entity._position.copy(),
-        pygame.Vector2(random.random() - 0.5, random.random() - 0.5).normalize() * 30,
-        random.randint(0, 360),
-        random.randint(30, 80) * random.choice([-1, 1]),
-        random.randint(10, 30),
-        0,
-        (231 + random.randint(-10, 10), 168 + random.randint(-10, 10), 0),
-    ]
-    self._particle_count += 1
+    rng = self._rng
+    angles = rng.random(count) * math.tau
+
+    self._positions[rows] = self._entity._position
+    self._velocities[rows, 0] = np.cos(angles) * 30
+    self._velocities[rows, 1] = np.sin(angles) * 30
+    self._rotations[rows] = rng.integers(0, 361, count)
+    self._rotation_speeds[rows] = rng.integers(30, 81, count) * rng.choice(
+        (-1, 1), count
+    )
+    self._sizes[rows] = rng.integers(10, 31, count)
+    self._ages[rows] = 0
+    self._colors[rows, 0] = 231 + rng.integers(-10, 11, count)
+    self._colors[rows, 1] = 168 + rng.integers(-10, 11, count)
+    self._colors[rows, 2] = 0
 
 
 def default_update_func(self):
+    n = self._particle_count
+    if not n:
+        return
 
-    for p in self._particles:
-        particle = self._particles[p]
-
-        # check alive
-        if particle[6] > 2:
-            self._dead_particles.append(p)
-            continue
-
-        # update position
-        particle[1] += particle[2] * consts.DELTA_TIME
-        particle[2] *= 0.99
-        # update rotation
-        particle[3] += particle[4] * consts.DELTA_TIME
-        particle[4] *= 0.99
-        # update time
-        particle[6] += consts.DELTA_TIME
-
-        # render
-        corners = [
-            pygame.Vector2(consts.Constants.UP * particle[5]).rotate(particle[3]),
-            pygame.Vector2(consts.Constants.RIGHT * particle[5]).rotate(particle[3]),
-            pygame.Vector2(consts.Constants.DOWN * particle[5]).rotate(particle[3]),
-            pygame.Vector2(consts.Constants.LEFT * particle[5]).rotate(particle[3]),
-        ]
-        pygame.draw.lines(
-            consts.W_FRAMEBUFFER,
-            particle[7],
-            True,
-            [particle[1] + corner for corner in corners],
-            1,
-        )
+    # integrate + damp + age
+    self._positions[:n] += self._velocities[:n] * self._delta_time
+    self._velocities[:n] *= 0.99
+    self._rotations[:n] += self._rotation_speeds[:n] * self._delta_time
+    self._rotation_speeds[:n] *= 0.99
+    self._ages[:n] += self._delta_time
 
 
 def default_death_func(self):
-    for p in self._dead_particles:
-        del self._particles[p]
-        self._particle_count -= 1
-    self._dead_particles = []
+    self.kill(self._ages[: self._particle_count] > self._lifetime)
+
+
+def default_render_func(self):
+    n = self._particle_count
+    if not n:
+        return
+
+    # corners = up, right, down, left rotated by the particle rotation
+    radians = np.radians(self._rotations[:n])
+    cos = np.cos(radians) * self._sizes[:n]
+    sin = np.sin(radians) * self._sizes[:n]
+
+    corners = np.empty((n, 4, 2), dtype="float32")
+    corners[:, 0, 0] = sin
+    corners[:, 0, 1] = -cos
+    corners[:, 1, 0] = cos
+    corners[:, 1, 1] = sin
+    corners[:, 2] = -corners[:, 0]
+    corners[:, 3] = -corners[:, 1]
+    corners += self._positions[:n, None, :]
+
+    colors = self._colors[:n].tolist()
+    for points, color in zip(corners.tolist(), colors):
+        pygame.draw.lines(consts.W_FRAMEBUFFER, color, True, points, 1)
+
+
+def gpu_render_func(self):
+    if self._renderer is None:
+        self._renderer = particle.ParticleRenderer(self._capacity)
+    # drawn when the particle batch is flushed
+    consts.CTX_PARTICLE_BATCH.submit(self._renderer, self._renderer.upload(self))
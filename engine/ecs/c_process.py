@@ -1,12 +1,10 @@
 from engine.system import ecs
+from engine.system import jobs
 
 from typing import Callable
 from abc import ABC, abstractmethod
 
-import threading
-import multiprocessing
-import asyncio
-
+import engine.constants as consts
 
 """
 
@@ -15,11 +13,16 @@ Start of with simple process handling
 - coroutines
 - multiprocessing
 
+Processes run their function as a job on `consts.CTX_JOB_SYSTEM`.
+- update() polls the job + hands the result to the callback
+- wait() blocks the frame until the job is finished
+- repeat=True restarts the job as soon as it finishes
+
 """
 
-TYPE_THREAD = "thread"
-TYPE_COROUTINE = "coroutine"
-TYPE_MULTIPROCESSING = "multiprocessing"
+TYPE_THREAD = jobs.TYPE_THREAD
+TYPE_COROUTINE = jobs.TYPE_COROUTINE
+TYPE_MULTIPROCESSING = jobs.TYPE_MULTIPROCESSING
 
 
 # ======================================================================== #
@@ -28,7 +31,15 @@ TYPE_MULTIPROCESSING = "multiprocessing"
 
 
 class ProcessComponent(ecs.Component):
-    def __init__(self, name: str, func: Callable, *args, run_type: str = TYPE_THREAD):
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        *args,
+        run_type: str = TYPE_THREAD,
+        callback: Callable = None,
+        repeat: bool = False,
+    ):
         super().__init__()
         self.name = name
 
@@ -36,43 +47,75 @@ class ProcessComponent(ecs.Component):
         self._args = args
 
         self._run_type = run_type
+        self._callback = callback
+        self._repeat = repeat
+
+        # job state
+        self._job = None
+        self._result = None
+        self._started = False
+
+    def __on_clean__(self):
+        if self._job is not None:
+            self._job.cancel()
+
+    def __on_remove__(self):
+        self.__on_clean__()
 
     # -------------------------------------------------------------------- #
     # process logic
     # -------------------------------------------------------------------- #
 
-    @abstractmethod
+    def update(self):
+        if self._job is None:
+            if not self._started or self._repeat:
+                self.run()
+            return
+        if self._job.done():
+            self._finish()
+
     def run(self):
-        pass
+        if self._job is not None:
+            return self._job
+        self._started = True
+        self._job = consts.CTX_JOB_SYSTEM.submit(
+            self._func, *self._args, run_type=self._run_type, name=self.name
+        )
+        return self._job
+
+    def wait(self, timeout: float = None):
+        if self._job is None:
+            return self._result
+        self._job.wait(timeout)
+        self._finish()
+        return self._result
+
+    def is_running(self) -> bool:
+        return self._job is not None
+
+    def get_result(self):
+        return self._result
+
+    def _finish(self):
+        self._result = self._job.result()
+        self._job = None
+        if self._callback is not None:
+            self._callback(self._result)
 
 
 # subclasses
 
 
 class ThreadProcessComponent(ProcessComponent):
-    def __init__(self, name: str, func: Callable, *args):
-        super().__init__(name, func, *args, run_type=TYPE_THREAD)
-
-    def run(self):
-        pass
+    def __init__(self, name: str, func: Callable, *args, **kwargs):
+        super().__init__(name, func, *args, run_type=TYPE_THREAD, **kwargs)
 
 
 class CoroutineProcessComponent(ProcessComponent):
-    def __init__(self, name: str, func: Callable, *args):
-        super().__init__(name, func, *args, run_type=TYPE_COROUTINE)
-
-    def run(self):
-        pass
+    def __init__(self, name: str, func: Callable, *args, **kwargs):
+        super().__init__(name, func, *args, run_type=TYPE_COROUTINE, **kwargs)
 
 
 class MultiProcessingProcessComponent(ProcessComponent):
-    def __init__(self, name: str, func: Callable, *args):
-        super().__init__(name, func, *args, run_type=TYPE_MULTIPROCESSING)
-
-    def run(self):
-        pass
-
-
-# TODO - add threading
-# TODO - add coroutines
-# TODO - add multiprocessing
+    def __init__(self, name: str, func: Callable, *args, **kwargs):
+        super().__init__(name, func, *args, run_type=TYPE_MULTIPROCESSING, **kwargs)
@@ -6,7 +6,6 @@ import engine.constants as consts
 from engine.io import resourcemanager
 from engine.system import ecs
 
-
 # ======================================================================== #
 # Sprite
 # ======================================================================== #
@@ -74,6 +73,50 @@ class SpriteComponent(ecs.Component):
     def get_rect(self):
         return self._rect
 
+    # ------------------------------------------------------------------------ #
+    # streaming (see chunkstore)
+    # ------------------------------------------------------------------------ #
+
+    def __serialize__(self) -> dict:
+        # images loaded from a file are reloaded from it -- anything else is copied
+        if (
+            self._filepath
+            and consts.CTX_RESOURCE_MANAGER is not None
+            and consts.CTX_RESOURCE_MANAGER._cached.get(self._filepath) is self._image
+        ):
+            image = None
+        else:
+            image = (
+                pygame.image.tobytes(self._image, "RGBA"),
+                self._image.get_size(),
+            )
+        return {
+            "image": image,
+            "filepath": self._filepath,
+            "rm_uuid": self._rm_uuid,
+            "flipped": self._flipped,
+            "extra": dict(self._extra),
+        }
+
+    @classmethod
+    def __deserialize__(cls, data: dict):
+        if data["image"] is not None:
+            pixels, size = data["image"]
+            # empty sprites have no pixels to read back
+            image = (
+                pygame.image.frombytes(pixels, size, "RGBA")
+                if pixels
+                else pygame.Surface(size)
+            )
+            result = cls(image=image)
+            result._filepath = data["filepath"]
+            result._rm_uuid = data["rm_uuid"]
+        else:
+            result = cls(filepath=data["filepath"], rm_uuid=data["rm_uuid"])
+        result._flipped = data["flipped"]
+        result._extra.update(data["extra"])
+        return result
+
     # ------------------------------------------------------------------------ #
     # special methods
     # ------------------------------------------------------------------------ #
@@ -88,28 +131,51 @@ class SpriteComponent(ecs.Component):
 
 
 class SpriteRendererComponent(ecs.Component):
-    def __init__(self, target: SpriteComponent = None):
+    def __init__(self, target: SpriteComponent = None, batched: bool = False):
+        """
+        Sprite Renderer Component
+
+        target: SpriteComponent -- the sprite to draw (defaults to the first one)
+        batched: bool -- draw with `consts.CTX_SPRITE_BATCH` instead of blitting
+        """
         super().__init__()
         self._target = target
         self._target_comp = None
+        # index into the entity's sprites when no target is given
+        self._target_index = 0
+        self._batched = batched
 
     def __post_init__(self):
         if self._target is not None:
             self._target_comp = self._entity.get_component_by_id(self._target._uuid)
         else:
-            self._target_comp = self._entity.get_components(SpriteComponent)
-            if len(self._target_comp) == 0:
+            sprites = self._entity.get_components(SpriteComponent)
+            if len(sprites) <= self._target_index:
                 print("No SpriteComponent found in entity. Cannot render sprite.")
                 self._target_comp = None
             else:
-                self._target_comp = self._target_comp[0]
+                self._target_comp = sprites[self._target_index]
 
     # ------------------------------------------------------------------------ #
     # component logic
     # ------------------------------------------------------------------------ #
 
     def update(self):
-        consts.W_FRAMEBUFFER.blit(
+        # static layers draw their sprites into a cache (see world.Layer)
+        if self._entity._layer is not None and self._entity._layer._static:
+            return
+        if self._batched:
+            consts.CTX_SPRITE_BATCH.submit(
+                self._target_comp._image,
+                self._target_comp._rect.topleft,
+                self._entity._zlayer,
+                self._target_comp._flipped,
+            )
+            return
+        self.render(consts.W_FRAMEBUFFER)
+
+    def render(self, surface: pygame.Surface):
+        surface.blit(
             pygame.transform.flip(
                 self._target_comp._image, self._target_comp._flipped, False
             ),
@@ -118,3 +184,24 @@ class SpriteRendererComponent(ecs.Component):
 
     def debug(self):
         pygame.draw.rect(consts.W_FRAMEBUFFER, (200, 0, 0), self._target_comp._rect, 1)
+
+    # ------------------------------------------------------------------------ #
+    # streaming (see chunkstore)
+    # ------------------------------------------------------------------------ #
+
+    def __serialize__(self) -> dict:
+        sprites = self._entity.get_components(SpriteComponent)
+        return {
+            "batched": self._batched,
+            "target": (
+                sprites.index(self._target_comp)
+                if self._target_comp in sprites
+                else self._target_index
+            ),
+        }
+
+    @classmethod
+    def __deserialize__(cls, data: dict):
+        result = cls(batched=data["batched"])
+        result._target_index = data["target"]
+        return result
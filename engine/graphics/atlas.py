@@ -0,0 +1,276 @@
+import pygame
+import moderngl as mgl
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.graphics import texture
+
+"""
+Texture atlas
+
+Packs many small sprite surfaces into a few large power of two pages.
+- skyline bottom-left packer per page
+- a new page is opened when nothing fits
+- images are added one at a time, so assets loaded mid-game can still be packed
+- only newly packed areas are re-uploaded to the gpu
+
+Each packed image gets an `AtlasRegion` -- its page + uv sub-rect.
+"""
+
+
+# ======================================================================== #
+# Skyline Packer
+# ======================================================================== #
+
+
+class SkylinePacker:
+    def __init__(self, width: int, height: int):
+        self._width = width
+        self._height = height
+
+        # [x, y, width] segments -- left to right, covering the whole page width
+        self._skyline = [[0, 0, width]]
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def insert(self, width: int, height: int):
+        # returns the top left (x, y) of the packed area or None if it does not fit
+        best = None
+        best_index = -1
+        for i in range(len(self._skyline)):
+            y = self._fit(i, width, height)
+            if y is None:
+                continue
+            # lowest top edge first, then the narrowest segment
+            score = (y + height, self._skyline[i][2])
+            if best is None or score < best:
+                best = score
+                best_index = i
+                best_y = y
+
+        if best is None:
+            return None
+
+        x = self._skyline[best_index][0]
+        self._add_level(best_index, x, best_y + height, width)
+        return (x, best_y)
+
+    def _fit(self, index: int, width: int, height: int):
+        x = self._skyline[index][0]
+        if x + width > self._width:
+            return None
+
+        y = 0
+        remaining = width
+        while remaining > 0:
+            segment = self._skyline[index]
+            y = max(y, segment[1])
+            if y + height > self._height:
+                return None
+            remaining -= segment[2]
+            index += 1
+        return y
+
+    def _add_level(self, index: int, x: int, y: int, width: int):
+        self._skyline.insert(index, [x, y, width])
+
+        # cut the segments that are now covered by the new one
+        right = x + width
+        i = index + 1
+        while i < len(self._skyline):
+            segment = self._skyline[i]
+            if segment[0] >= right:
+                break
+            shrink = right - segment[0]
+            segment[0] += shrink
+            segment[2] -= shrink
+            if segment[2] > 0:
+                break
+            self._skyline.pop(i)
+
+        # merge neighbours at the same height
+        i = 0
+        while i < len(self._skyline) - 1:
+            if self._skyline[i][1] == self._skyline[i + 1][1]:
+                self._skyline[i][2] += self._skyline.pop(i + 1)[2]
+            else:
+                i += 1
+
+
+# ======================================================================== #
+# Atlas Page + Region
+# ======================================================================== #
+
+
+class AtlasRegion:
+    def __init__(self, page: "AtlasPage", rect: pygame.Rect):
+        self._page = page
+        self._rect = rect
+
+        # u0, v0, u1, v1 -- v runs top to bottom (textures are not flipped)
+        self._uv = (
+            rect.left / page._size,
+            rect.top / page._size,
+            rect.right / page._size,
+            rect.bottom / page._size,
+        )
+
+    def get_texture(self) -> texture.Texture:
+        return self._page.get_texture()
+
+    def get_uv(self) -> tuple:
+        return self._uv
+
+    def get_rect(self) -> pygame.Rect:
+        return self._rect
+
+
+class AtlasPage:
+    def __init__(self, size: int, padding: int):
+        self._size = size
+        self._padding = padding
+
+        self._surface = pygame.Surface((size, size), pygame.SRCALPHA, 32)
+        self._packer = SkylinePacker(size, size)
+
+        # gpu texture is created on first upload
+        self._texture = None
+        self._pending = []
+
+    def clean(self):
+        if self._texture is not None:
+            self._texture.clean()
+            self._texture = None
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def add(self, image: pygame.Surface):
+        width, height = image.get_size()
+        position = self._packer.insert(
+            width + self._padding * 2, height + self._padding * 2
+        )
+        if position is None:
+            return None
+
+        rect = pygame.Rect(
+            position[0] + self._padding, position[1] + self._padding, width, height
+        )
+        # copy, not blend -- an alpha blit onto the clear page darkens soft edges
+        if image.get_colorkey() is not None:
+            # the max blend ignores colorkeys -- turn them into alpha first
+            keyed = pygame.Surface((width, height), pygame.SRCALPHA)
+            keyed.blit(image, (0, 0))
+            image = keyed
+        self._surface.fill((0, 0, 0, 0), rect)
+        self._surface.blit(image, rect.topleft, special_flags=pygame.BLEND_RGBA_MAX)
+        self._pending.append(rect)
+        return AtlasRegion(self, rect)
+
+    def upload(self):
+        if self._texture is None:
+            self._texture = texture.Texture(raw_image=self._surface, mipmap=False)
+            self._texture._texture.filter = (mgl.NEAREST, mgl.NEAREST)
+            self._pending.clear()
+            return
+
+        # only write the newly packed areas
+        for rect in self._pending:
+            self._texture._texture.write(
+                pygame.image.tostring(self._surface.subsurface(rect), "RGBA"),
+                viewport=(rect.left, rect.top, rect.width, rect.height),
+            )
+        self._pending.clear()
+
+    def get_texture(self) -> texture.Texture:
+        if self._texture is None or self._pending:
+            self.upload()
+        return self._texture
+
+    def get_surface(self) -> pygame.Surface:
+        return self._surface
+
+
+# ======================================================================== #
+# Texture Atlas
+# ======================================================================== #
+
+
+class TextureAtlas:
+    def __init__(
+        self,
+        page_size: int = consts.DEFAULT_ATLAS_PAGE_SIZE,
+        padding: int = consts.DEFAULT_ATLAS_PADDING,
+    ):
+        self._page_size = page_size
+        self._padding = padding
+
+        self._pages = []
+        self._regions = {}
+
+    def __on_clean__(self):
+        print(f"{consts.RUN_TIME:.5f} | ---- CLEANING TEXTURE ATLAS ----")
+        for page in self._pages:
+            page.clean()
+        self._pages.clear()
+        self._regions.clear()
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def add(self, image: pygame.Surface) -> AtlasRegion:
+        # surfaces are packed once -- the same surface always maps to the same region
+        if image in self._regions:
+            return self._regions[image]
+
+        region = None
+        for page in self._pages:
+            region = page.add(image)
+            if region:
+                break
+
+        if region is None:
+            # images bigger than a page get a page of their own
+            size = self._page_size
+            largest = max(image.get_size()) + self._padding * 2
+            while size < largest:
+                size *= 2
+            page = AtlasPage(size, self._padding)
+            self._pages.append(page)
+            region = page.add(image)
+
+        self._regions[image] = region
+        return region
+
+    def add_sprites(self, sprites: list):
+        return [self.add(sprite.get_image()) for sprite in sprites]
+
+    def add_spritesheet(self, spritesheet: "SpriteSheet"):
+        return self.add_sprites(spritesheet._sprites)
+
+    def add_animation(self, animation: "Animation"):
+        return self.add_sprites(animation._sprites)
+
+    def add_resources(self, resource_manager: "ResourceManager"):
+        # only image resources are packed
+        return [
+            self.add(resource)
+            for resource in resource_manager._cached.values()
+            if isinstance(resource, pygame.Surface)
+        ]
+
+    def upload(self):
+        for page in self._pages:
+            if page._texture is None or page._pending:
+                page.upload()
+
+    def get_region(self, image: pygame.Surface) -> AtlasRegion:
+        return self._regions.get(image)
+
+    def get_pages(self) -> list:
+        return self._pages
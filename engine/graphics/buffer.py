@@ -3,9 +3,9 @@ import numpy as np
 import engine.context as ctx
 import engine.constants as consts
 
+from engine.graphics import shader
 from engine.graphics import texture
 
-
 # ============================================================================= #
 # Framebuffer
 # ============================================================================= #
@@ -78,7 +78,7 @@ class FramebufferObject:
     # ------------------------------------------------------------------------ #
 
     def use_framebuffer(self):
-        self._fbo.use()
+        consts.MGL_STATE.use_framebuffer(self._fbo)
 
     def clean(self, clean_func: bool = False):
         self._fbo.release()
@@ -120,6 +120,10 @@ class RenderingManifold:
         self._tex_count = tex_count
         self._tex_uniform_name = tex_uniform_name
 
+        # uniform name -> (raw write, value) -- applied right before every draw,
+        # so manifolds sharing a shader program never see each other's values
+        self._uniforms = {}
+
         if not self._vao:
             return
         # set default variables into shader program
@@ -149,21 +153,39 @@ class RenderingManifold:
     def handle(self):
         if not self._vao:
             return
-        # stage 1: should have written required variables to shader
+        # stage 1: write this manifold's uniforms
+        self.apply_uniforms()
         # stage 2: use texture
+        self.use_textures()
+
+        # stage 3: render
+        self._vao().render()
+
+    def use_textures(self):
         for i, tex in self._textures:
             if not tex:
                 continue
             tex.use(location=i)
 
-        # stage 3: render
-        self._vao().render()
+    def apply_uniforms(self):
+        program = self._vao._shader_program
+        for name, (raw, data) in self._uniforms.items():
+            if raw:
+                program.write_uniform(name, data)
+            else:
+                program[name] = data
 
     def write_uniform(self, uniform_name: str, data):
-        self._vao._shader_program[uniform_name].write(data)
+        self._uniforms[uniform_name] = (True, data)
 
     def set_uniform(self, uniform_name: str, data):
-        self._vao._shader_program[uniform_name] = data
+        self._uniforms[uniform_name] = (False, data)
+
+    def get_uniform(self, uniform_name: str):
+        # the value last written or set -- None if it was never given
+        if uniform_name not in self._uniforms:
+            return None
+        return self._uniforms[uniform_name][1]
 
     def set_texture(self, key: int, texture: "TextureObject"):
         self._textures[key][1] = texture
@@ -179,6 +201,113 @@ class RenderingManifold:
         return f"texture{index}"
 
 
+# ============================================================================= #
+# Instanced Rendering Manifold
+# ============================================================================= #
+
+
+class InstancedRenderingManifold(RenderingManifold):
+    """
+    Renders every instance that shares a vao + shader with one draw call.
+
+    Each instance owns one row of a per-instance model matrix buffer.
+    - owners are any object with an `_instance_index` (see InstancedMeshComponent)
+    - removed rows are swap-removed with the last row
+    - rows are only re-uploaded when a model matrix changed
+    """
+
+    def __init__(
+        self,
+        shader_program: "ShaderProgram",
+        attributes: "List[Tuple]",
+        capacity: int = consts.DEFAULT_INSTANCE_CAPACITY,
+        model_attribute: str = "in_model",
+        index_buffer: "GLBufferObject" = None,
+        tex_count: int = 10,
+        tex_uniform_name: str = "u_textures",
+    ):
+        self._capacity = capacity
+        self._models = np.zeros((capacity, 4, 4), dtype="float32")
+        self._owners = []
+        self._dirty = False
+
+        self._instance_buffer = GLBufferObject(
+            None, reserve_size=self._models.nbytes, dynamic=True
+        )
+        super().__init__(
+            vao=VAOObject(
+                shader_program,
+                list(attributes)
+                + [(self._instance_buffer(), "16f/i", model_attribute)],
+                index_buffer=index_buffer,
+            ),
+            tex_count=tex_count,
+            tex_uniform_name=tex_uniform_name,
+        )
+
+    def __on_clean__(self):
+        super().__on_clean__()
+        self._instance_buffer.clean()
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def handle(self):
+        count = len(self._owners)
+        if not count:
+            return
+        if self._dirty:
+            self.upload()
+
+        self.apply_uniforms()
+        self.use_textures()
+        self._vao().render(instances=count)
+
+    def upload(self):
+        # orphan the old storage so the driver never waits on last frame's draw
+        self._instance_buffer().orphan()
+        self._instance_buffer().write(self._models[: len(self._owners)])
+        self._dirty = False
+
+    def add_instance(self, owner, model) -> int:
+        index = len(self._owners)
+        if index == self._capacity:
+            self._grow()
+
+        self._owners.append(owner)
+        # glm matrices convert row major -- gl expects columns
+        self._models[index] = np.asarray(model).T
+        owner._instance_index = index
+        self._dirty = True
+        return index
+
+    def remove_instance(self, owner):
+        index = owner._instance_index
+        last = self._owners.pop()
+        if last is not owner:
+            # fill the hole with the last row
+            self._owners[index] = last
+            self._models[index] = self._models[len(self._owners)]
+            last._instance_index = index
+        owner._instance_index = -1
+        self._dirty = True
+
+    def set_model(self, index: int, model):
+        self._models[index] = np.asarray(model).T
+        self._dirty = True
+
+    def get_instance_count(self) -> int:
+        return len(self._owners)
+
+    def _grow(self):
+        self._capacity *= 2
+        models = np.zeros((self._capacity, 4, 4), dtype="float32")
+        models[: len(self._owners)] = self._models[: len(self._owners)]
+        self._models = models
+        self._instance_buffer().orphan(self._models.nbytes)
+
+
 # ============================================================================= #
 # VAO
 # ============================================================================= #
@@ -213,16 +342,26 @@ class VAOObject:
 
     # ------------------------------------------------------------------------ #
 
-    def __init__(self, shader_program: "ShaderProgram", attributes: "List[Tuple]"):
+    def __init__(
+        self,
+        shader_program: "ShaderProgram",
+        attributes: "List[Tuple]",
+        index_buffer: "GLBufferObject" = None,
+        index_element_size: int = 4,
+    ):
         self._uuid = self.generate_vao_uuid()
         self.cache(self)
 
         self._shader_program = shader_program
         self._attributes = attributes
+        self._index_buffer = index_buffer
 
-        # create vao
+        # create vao -- indexed when an index buffer is given
         self._vao = consts.MGL_CONTEXT.vertex_array(
-            self._shader_program(), self._attributes
+            self._shader_program(),
+            self._attributes,
+            index_buffer=self._index_buffer() if self._index_buffer else None,
+            index_element_size=index_element_size,
         )
 
     # ------------------------------------------------------------------------ #
@@ -303,3 +442,50 @@ class GLBufferObject:
 
     def __call__(self):
         return self._glbuffer
+
+
+# ============================================================================= #
+# Uniform Buffer Object
+# ============================================================================= #
+
+
+class UniformBufferObject:
+    """
+    A std140 uniform block shared by every shader program that declares it.
+
+    The buffer is bound to `binding` once -- programs are pointed at the same
+    binding point when they are created (see ShaderProgram.register_uniform_block).
+    """
+
+    def __init__(self, name: str, size: int, binding: int):
+        self._name = name
+        self._size = size
+        self._binding = binding
+
+        # whatever fills the block (e.g. the active camera)
+        self._owner = None
+
+        self._buffer = GLBufferObject(None, reserve_size=size, dynamic=True)
+        self._buffer().bind_to_uniform_block(binding)
+        shader.ShaderProgram.register_uniform_block(name, binding)
+
+    def clean(self):
+        self._buffer.clean()
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def write(self, data, offset: int = 0):
+        self._buffer().write(data, offset=offset)
+
+    def use(self):
+        # rebind -- only needed if something else took the binding point
+        self._buffer().bind_to_uniform_block(self._binding)
+
+    # ------------------------------------------------------------------------ #
+    # special functions
+    # ------------------------------------------------------------------------ #
+
+    def __call__(self):
+        return self._buffer()
@@ -1,5 +1,6 @@
 import glm
 import pygame
+import numpy as np
 
 
 import engine.context as ctx
@@ -25,9 +26,13 @@ class BaseCamera(entity.Entity):
 
 
 class Camera2D(BaseCamera):
-    def __init__(self, render_distance: int):
+    def __init__(self, render_distance: int, simulation_distance: int = None):
         super().__init__(render_distance)
 
+        # chunks closer than this run at the full tick rate
+        self._simulation_distance = (
+            simulation_distance if simulation_distance is not None else render_distance
+        )
         self._chunk_pos = (0, 0)
 
     # ------------------------------------------------------------------------ #
@@ -44,6 +49,21 @@ class Camera2D(BaseCamera):
             for y in range(-self._render_distance, self._render_distance):
                 yield (x + self._chunk_pos[0], y + self._chunk_pos[1])
 
+    def generate_active_chunks(self):
+        # (chunk position, True if the chunk is inside the simulation distance)
+        for position in self.generate_visible_chunks():
+            ring = max(
+                abs(position[0] - self._chunk_pos[0]),
+                abs(position[1] - self._chunk_pos[1]),
+            )
+            yield position, ring < self._simulation_distance
+
+    def get_chunk_position(self) -> tuple:
+        return (
+            int(self._position.x // consts.DEFAULT_CHUNK_PIXEL_WIDTH),
+            int(self._position.y // consts.DEFAULT_CHUNK_PIXEL_HEIGHT),
+        )
+
 
 # ======================================================================== #
 # 3D Camera
@@ -89,14 +109,55 @@ class Camera3D(BaseCamera):
         self._lock_orientation = orientation_lock
         self._lock_vec = glm.normalize(orientation_lock_vec)
 
+        # world space frustum planes -- rebuilt whenever view or projection change
+        self._frustum = None
+
         # Prepare projection
         self._projection = None
+        self._view = glm.mat4(1.0)
         self._recalculate_projection()
 
         # Calculate the initial view matrix
-        self._view = glm.mat4(1.0)
         self._recalculate_view()
 
+    # ------------------------------------------------------------------------ #
+    # Uniform Block
+    # ------------------------------------------------------------------------ #
+    def update(self):
+        # time changes every frame -- matrices are written when they change
+        if self.is_active():
+            consts.MGL_CAMERA_UBO.write(
+                glm.vec4(self._position, consts.RUN_TIME).to_bytes(), offset=128
+            )
+
+    def set_active(self):
+        """
+        Make this camera the one that fills the shared `Camera` uniform block.
+        """
+        consts.MGL_CAMERA_UBO._owner = self
+        self.write_uniform_block()
+
+    def is_active(self) -> bool:
+        return (
+            consts.MGL_CAMERA_UBO is not None and consts.MGL_CAMERA_UBO._owner is self
+        )
+
+    def write_uniform_block(self):
+        if not self.is_active():
+            return
+        consts.MGL_CAMERA_UBO.write(
+            self._projection.to_bytes()
+            + self._view.to_bytes()
+            + glm.vec4(self._position, consts.RUN_TIME).to_bytes()
+        )
+
+    def get_frustum(self) -> np.ndarray:
+        """
+        (6, 4) world space planes -- left, right, bottom, top, near, far.
+        Points inside the frustum have a positive distance to every plane.
+        """
+        return self._frustum
+
     # ------------------------------------------------------------------------ #
     # Internal Utility
     # ------------------------------------------------------------------------ #
@@ -145,6 +206,8 @@ class Camera3D(BaseCamera):
         # Finally, build the view matrix
         target = self._position + self._forward
         self._view = glm.lookAt(self._position, target, self._up)
+        self._frustum = extract_frustum_planes(self._projection * self._view)
+        self.write_uniform_block()
 
     def _recalculate_projection(self):
         """
@@ -166,6 +229,8 @@ class Camera3D(BaseCamera):
             self._projection = glm.perspective(
                 glm.radians(self._fov), aspect_ratio, self._near, self._far
             )
+        self._frustum = extract_frustum_planes(self._projection * self._view)
+        self.write_uniform_block()
 
     # ------------------------------------------------------------------------ #
     # Properties
@@ -178,6 +243,7 @@ class Camera3D(BaseCamera):
     def position(self, value: glm.vec3):
         self._position = value
         self._recalculate_view()
+        self.mark_moved()
 
     @property
     def forward(self):
@@ -290,3 +356,28 @@ class Camera3D(BaseCamera):
 
 def calculate_forward_from_target(position: glm.vec3, target: glm.vec3):
     return target - position
+
+
+def extract_frustum_planes(view_projection: glm.mat4) -> np.ndarray:
+    # gribb / hartmann -- planes are combinations of the matrix rows
+    m = np.array(view_projection, dtype="float32")
+    planes = np.stack(
+        (
+            m[3] + m[0],
+            m[3] - m[0],
+            m[3] + m[1],
+            m[3] - m[1],
+            m[3] + m[2],
+            m[3] - m[2],
+        )
+    )
+    # normalised so plane distances are in world units
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+
+def test_spheres_in_frustum(
+    planes: np.ndarray, centers: np.ndarray, radii: np.ndarray
+) -> np.ndarray:
+    # (n,) bool -- True if the sphere touches the frustum
+    distances = centers @ planes[:, :3].T + planes[:, 3]
+    return (distances >= -radii[:, None]).all(axis=1)
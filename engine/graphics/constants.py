@@ -1,5 +1,15 @@
 import numpy as np
 
+# ======================================================================== #
+# uniform block constants
+# ======================================================================== #
+
+# layout (std140) uniform Camera { mat4 m_proj; mat4 m_view; vec4 u_camera; };
+# u_camera = (camera position, run time)
+CAMERA_UNIFORM_BLOCK = "Camera"
+CAMERA_UNIFORM_BINDING = 0
+CAMERA_UNIFORM_SIZE = 64 + 64 + 16
+
 # ======================================================================== #
 # vertex constants
 # ======================================================================== #
@@ -9,6 +19,153 @@ def generate_vertex_data(vertices, indices):
     return np.array([vertices[i] for tri in indices for i in tri], dtype="float32")
 
 
+# ======================================================================== #
+# indexed geometry
+# ======================================================================== #
+
+# post transform vertex cache size assumed by the triangle reordering
+DEFAULT_VERTEX_CACHE_SIZE = 16
+
+
+def generate_indexed_data(
+    vertex_data: np.ndarray,
+    optimize: bool = True,
+    cache_size: int = DEFAULT_VERTEX_CACHE_SIZE,
+):
+    """
+    Turn flat (de-indexed) vertex data into an indexed mesh.
+
+    vertex_data: (n, floats per vertex) -- every 3 rows are one triangle
+    returns (vertices float32, indices uint32)
+    """
+    vertices, indices = weld_vertices(vertex_data)
+    if optimize:
+        indices = optimize_vertex_cache(indices, len(vertices), cache_size)
+        vertices, indices = optimize_vertex_fetch(vertices, indices)
+    return vertices, indices
+
+
+def weld_vertices(vertex_data: np.ndarray):
+    # identical attribute tuples become one vertex
+    vertex_data = np.ascontiguousarray(vertex_data, dtype="float32")
+    vertices, indices = np.unique(vertex_data, axis=0, return_inverse=True)
+    return vertices, indices.reshape(-1).astype("uint32")
+
+
+def optimize_vertex_cache(
+    indices: np.ndarray,
+    vertex_count: int,
+    cache_size: int = DEFAULT_VERTEX_CACHE_SIZE,
+) -> np.ndarray:
+    """
+    Reorder triangles for the post transform vertex cache (tipsify).
+
+    Triangles are emitted as fans around a focus vertex -- the next focus is a
+    vertex that is still in the cache + still has triangles left.
+    """
+    tris = indices.reshape(-1, 3).tolist()
+    if not tris:
+        return indices.astype("uint32")
+
+    # vertex -> triangles that use it
+    flat = indices.astype("int64")
+    live = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate(([0], np.cumsum(live))).tolist()
+    adjacency = (np.argsort(flat, kind="stable") // 3).tolist()
+    live = live.tolist()
+
+    cache_time = [0] * vertex_count
+    emitted = bytearray(len(tris))
+    dead_end = []
+    output = []
+    time = cache_size + 1
+    cursor = 0
+    focus = 0
+
+    while focus >= 0:
+        candidates = []
+        for t in adjacency[offsets[focus] : offsets[focus + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = 1
+            for v in tris[t]:
+                output.append(v)
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time - cache_time[v] > cache_size:
+                    cache_time[v] = time
+                    time += 1
+
+        # next focus -- the oldest cached vertex that will not fall out of the cache
+        focus = -1
+        best = -1
+        for v in candidates:
+            if not live[v]:
+                continue
+            priority = 0
+            if time - cache_time[v] + 2 * live[v] <= cache_size:
+                priority = time - cache_time[v]
+            if priority > best:
+                best = priority
+                focus = v
+        if focus >= 0:
+            continue
+
+        # dead end -- recently used vertices first, then scan forwards
+        while dead_end:
+            v = dead_end.pop()
+            if live[v]:
+                focus = v
+                break
+        if focus >= 0:
+            continue
+        while cursor < vertex_count and not live[cursor]:
+            cursor += 1
+        if cursor < vertex_count:
+            focus = cursor
+
+    return np.array(output, dtype="uint32")
+
+
+def optimize_vertex_fetch(vertices: np.ndarray, indices: np.ndarray):
+    # order vertices by first use so the index stream reads memory forwards
+    used, first = np.unique(indices, return_index=True)
+    order = used[np.argsort(first)]
+    remap = np.zeros(len(vertices), dtype="uint32")
+    remap[order] = np.arange(len(order), dtype="uint32")
+    return vertices[order], remap[indices]
+
+
+def get_acmr(indices: np.ndarray, cache_size: int = DEFAULT_VERTEX_CACHE_SIZE):
+    # average cache miss ratio -- transformed vertices per triangle (fifo cache)
+    cache = []
+    misses = 0
+    for v in indices.tolist():
+        if v in cache:
+            continue
+        misses += 1
+        cache.append(v)
+        if len(cache) > cache_size:
+            cache.pop(0)
+    return misses / max(1, len(indices) // 3)
+
+
+def calculate_bounding_sphere(positions: np.ndarray) -> tuple:
+    """
+    Bounding sphere around the aabb center of a set of positions.
+
+    positions: (n, 3)
+    returns (x, y, z, radius)
+    """
+    positions = np.asarray(positions, dtype="float32")[:, :3]
+    if not len(positions):
+        return (0.0, 0.0, 0.0, 0.0)
+    center = (positions.min(axis=0) + positions.max(axis=0)) / 2
+    radius = np.sqrt(((positions - center) ** 2).sum(axis=1).max())
+    return (*center.tolist(), float(radius))
+
+
 class Cube:
 
     VERTICES = [
@@ -27,6 +27,7 @@ class CameraController3D(ecs.Component):
 
     def change_position(self, direction: glm.vec3):
         self._camera._position += direction
+        self._camera.mark_moved()
 
     def change_rotation(self, rotation: glm.vec3):
         self._camera.up = rotation
@@ -1,3 +1,7 @@
+import glm
+
+import engine.constants as consts
+
 from engine.system import ecs
 
 from engine.graphics import buffer
@@ -8,10 +12,22 @@ from engine.graphics import buffer
 
 
 class MeshComponent(ecs.Component):
-    def __init__(self, manifold: buffer.RenderingManifold):
+    def __init__(
+        self,
+        manifold: buffer.RenderingManifold,
+        bounds: tuple = None,
+        model_uniform: str = "m_model",
+    ):
+        """
+        bounds: local space bounding sphere (x, y, z, radius) -- meshes outside
+        the active camera's frustum are not drawn. None = never culled.
+        model_uniform: the manifold uniform holding the model matrix
+        """
         super().__init__()
 
         self._manifold = manifold
+        self._bounds = bounds
+        self._model_uniform = model_uniform
 
     def __on_clean__(self):
         # clear up manifold data
@@ -22,8 +38,67 @@ class MeshComponent(ecs.Component):
     # ------------------------------------------------------------------------ #
 
     def update(self):
-        # update framebuffer lol
-        self._manifold.handle()
+        # drawn when the render queue is flushed -- sorted by gl state
+        consts.CTX_RENDER_QUEUE.submit(self._manifold, self._bounds, self.get_model())
+
+    def set_bounds(self, bounds: tuple):
+        self._bounds = bounds
+
+    def get_bounds(self):
+        return self._bounds
+
+    def get_model(self):
+        return self._manifold.get_uniform(self._model_uniform)
+
+    # ------------------------------------------------------------------------ #
+    # special functions
+    # ------------------------------------------------------------------------ #
+
+    def __call__(self):
+        return self._manifold
+
+
+# ============================================================================= #
+# Instanced Mesh Component
+# ============================================================================= #
+
+
+class InstancedMeshComponent(ecs.Component):
+    def __init__(
+        self, manifold: buffer.InstancedRenderingManifold, model: glm.mat4 = None
+    ):
+        super().__init__()
+
+        self._manifold = manifold
+        self._model = model if model is not None else glm.mat4()
+        self._instance_index = -1
+
+    def __post_init__(self):
+        super().__post_init__()
+        # post init runs every time a component is added to the entity
+        if self._instance_index < 0:
+            self._manifold.add_instance(self, self._model)
+
+    def __on_remove__(self):
+        # the shared manifold stays alive for the other instances
+        if self._instance_index >= 0:
+            self._manifold.remove_instance(self)
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def update(self):
+        # the shared manifold draws every instance at once -- see MeshComponent
+        pass
+
+    def set_model(self, model: glm.mat4):
+        self._model = model
+        if self._instance_index >= 0:
+            self._manifold.set_model(self._instance_index, model)
+
+    def get_model(self):
+        return self._model
 
     # ------------------------------------------------------------------------ #
     # special functions
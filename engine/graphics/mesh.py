@@ -0,0 +1,306 @@
+import os
+import struct
+import hashlib
+
+import numpy as np
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.graphics import buffer
+from engine.graphics import constants as gfx_consts
+
+"""
+Mesh asset cache
+
+Parsing an obj with pywavefront is slow, so every parsed model is written once
+to a compact binary file + memory-mapped on later loads.
+- interleaved vertices (float32 or float16) + uint32 indices
+- the moderngl layout string + attribute names
+- the mesh bounds (min xyz, max xyz)
+
+A cached file is valid while the source mtime matches. If the mtime changed,
+the source hash decides -- a touched but unchanged file is not re-parsed.
+
+File layout (little endian)
+- header -- see HEADER_FORMAT
+- layout string, attribute names (space separated), padded to 16 bytes
+- vertex data, padded to 16 bytes
+- index data
+"""
+
+MESH_CACHE_MAGIC = b"SORAMESH"
+MESH_CACHE_VERSION = 1
+MESH_CACHE_SUFFIX = ".mesh"
+
+# magic, version, half floats, source mtime, source sha1,
+# vertex count, floats per vertex, index count, layout bytes, attribute bytes,
+# bounds min xyz, bounds max xyz
+HEADER_FORMAT = "<8s I I d 20s I I I I I 3f 3f"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MTIME_OFFSET = struct.calcsize("<8s I I")
+
+# pywavefront vertex format element -> (floats, attribute name)
+OBJ_ATTRIBUTES = {
+    "T2F": (2, "in_texcoords"),
+    "C3F": (3, "in_color"),
+    "N3F": (3, "in_normal"),
+    "V3F": (3, "in_position"),
+}
+
+
+# ======================================================================== #
+# Mesh Data
+# ======================================================================== #
+
+
+class MeshData:
+    # (path, half) -> MeshData
+    CACHE = {}
+
+    @classmethod
+    def load_obj(
+        cls,
+        path: str,
+        half: bool = False,
+        optimize: bool = True,
+        cache_folder: str = consts.DEFAULT_MESH_CACHE_FOLDER,
+    ):
+        key = (path, half)
+        if key in cls.CACHE:
+            return cls.CACHE[key]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Mesh `{path}` not found")
+
+        # one cache file per precision -- callers asking for both never overwrite
+        cache_path = get_cache_path(path, cache_folder, half=half)
+        mesh = cls.read_cache(cache_path, path)
+        if mesh is None or mesh._half != half:
+            print(f"{consts.RUN_TIME:.5f} | Parsing mesh `{path}`")
+            mesh = cls.parse_obj(path, half=half, optimize=optimize)
+            mesh.write_cache(cache_path, path)
+        cls.CACHE[key] = mesh
+        return mesh
+
+    @classmethod
+    def parse_obj(cls, path: str, half: bool = False, optimize: bool = True):
+        import pywavefront
+
+        # only the first material is used -- same as loading it by hand
+        name, material = pywavefront.Wavefront(path, parse=True).materials.popitem()
+
+        floats, attributes = [], []
+        for element in material.vertex_format.split("_"):
+            count, attribute = OBJ_ATTRIBUTES[element]
+            floats.append(f"{count}f")
+            attributes.append(attribute)
+
+        vertices, indices = gfx_consts.generate_indexed_data(
+            np.array(material.vertices, dtype="float32").reshape(
+                -1, material.vertex_size
+            ),
+            optimize=optimize,
+        )
+        return cls(vertices, indices, " ".join(floats), attributes, half=half)
+
+    @classmethod
+    def read_cache(cls, cache_path: str, source_path: str):
+        # returns None if the cache is missing or stale
+        if not os.path.exists(cache_path):
+            return None
+
+        with open(cache_path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+            if len(raw) < HEADER_SIZE:
+                return None
+            header = struct.unpack(HEADER_FORMAT, raw)
+            (
+                magic,
+                version,
+                half,
+                mtime,
+                source_hash,
+                vertex_count,
+                vertex_floats,
+                index_count,
+                layout_size,
+                attribute_size,
+            ) = header[:10]
+            if magic != MESH_CACHE_MAGIC or version != MESH_CACHE_VERSION:
+                return None
+            layout = f.read(layout_size).decode()
+            attributes = f.read(attribute_size).decode().split()
+
+        source_mtime = os.path.getmtime(source_path)
+        if mtime != source_mtime:
+            if source_hash != get_file_hash(source_path):
+                return None
+            # touched but unchanged -- store the new mtime so the hash is skipped next time
+            with open(cache_path, "r+b") as f:
+                f.seek(MTIME_OFFSET)
+                f.write(struct.pack("<d", source_mtime))
+
+        # map the data straight from the file -- nothing is copied until upload
+        dtype = np.dtype("<f2" if half else "<f4")
+        offset = align(HEADER_SIZE + layout_size + attribute_size)
+        vertices = np.memmap(
+            cache_path,
+            dtype=dtype,
+            mode="r",
+            offset=offset,
+            shape=(vertex_count, vertex_floats),
+        )
+        offset = align(offset + vertices.nbytes)
+        indices = np.memmap(
+            cache_path, dtype="<u4", mode="r", offset=offset, shape=(index_count,)
+        )
+        return cls(
+            vertices,
+            indices,
+            layout,
+            attributes,
+            half=bool(half),
+            bounds=(header[10:13], header[13:16]),
+        )
+
+    # ------------------------------------------------------------------------ #
+
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        indices: np.ndarray,
+        layout: str,
+        attributes: list,
+        half: bool = False,
+        bounds: tuple = None,
+    ):
+        self._half = half
+        self._vertices = vertices
+        if half and vertices.dtype != np.float16:
+            self._vertices = vertices.astype("float16")
+        self._indices = indices
+        self._attributes = list(attributes)
+
+        # half floats need the 2 byte float format -- "3f" -> "3f2"
+        self._layout = layout
+        if half and not layout.endswith("f2"):
+            self._layout = " ".join(f"{x}2" for x in layout.split())
+
+        if bounds is None:
+            bounds = get_bounds(vertices, layout, attributes)
+        self._bounds = bounds
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def write_cache(self, cache_path: str, source_path: str):
+        folder = os.path.dirname(cache_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        layout = self._layout.encode()
+        attributes = " ".join(self._attributes).encode()
+        header = struct.pack(
+            HEADER_FORMAT,
+            MESH_CACHE_MAGIC,
+            MESH_CACHE_VERSION,
+            int(self._half),
+            os.path.getmtime(source_path),
+            get_file_hash(source_path),
+            self._vertices.shape[0],
+            self._vertices.shape[1],
+            len(self._indices),
+            len(layout),
+            len(attributes),
+            *self._bounds[0],
+            *self._bounds[1],
+        )
+
+        # write to a temp file first so a crash never leaves a broken cache
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(header + layout + attributes)
+            pad(f)
+            f.write(np.ascontiguousarray(self._vertices).tobytes())
+            pad(f)
+            f.write(np.ascontiguousarray(self._indices, dtype="<u4").tobytes())
+        os.replace(temp_path, cache_path)
+
+    def create_vertex_buffer(self) -> buffer.GLBufferObject:
+        return buffer.GLBufferObject(self._vertices)
+
+    def create_index_buffer(self) -> buffer.GLBufferObject:
+        return buffer.GLBufferObject(self._indices)
+
+    def get_attribute_format(self, vertex_buffer: buffer.GLBufferObject) -> tuple:
+        # the (buffer, layout, *attributes) tuple VAOObject expects
+        return (vertex_buffer(), self._layout, *self._attributes)
+
+    def get_layout(self) -> str:
+        return self._layout
+
+    def get_attributes(self) -> list:
+        return self._attributes
+
+    def get_bounds(self) -> tuple:
+        return self._bounds
+
+    def get_bounding_sphere(self) -> tuple:
+        # sphere around the bounds -- (x, y, z, radius), see MeshComponent
+        return gfx_consts.calculate_bounding_sphere(self._bounds)
+
+    def get_vertex_count(self) -> int:
+        return len(self._vertices)
+
+    def get_index_count(self) -> int:
+        return len(self._indices)
+
+
+# ======================================================================== #
+# utils
+# ======================================================================== #
+
+
+def get_cache_path(path: str, cache_folder: str, half: bool = False) -> str:
+    # the path hash keeps models with the same file name apart
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    precision = "f16" if half else "f32"
+    return os.path.join(
+        cache_folder,
+        f"{os.path.basename(path)}-{key}-{precision}{MESH_CACHE_SUFFIX}",
+    )
+
+
+def get_file_hash(path: str) -> bytes:
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.digest()
+
+
+def get_bounds(vertices: np.ndarray, layout: str, attributes: list) -> tuple:
+    # bounds of the `in_position` attribute -- zero bounds if there is none
+    if "in_position" not in attributes or not len(vertices):
+        return ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+
+    start = 0
+    for element, attribute in zip(layout.split(), attributes):
+        count = int(element.split("f")[0])
+        if attribute == "in_position":
+            break
+        start += count
+    positions = np.asarray(vertices[:, start : start + 3], dtype="float32")
+    return (
+        tuple(positions.min(axis=0).tolist()),
+        tuple(positions.max(axis=0).tolist()),
+    )
+
+
+def align(offset: int, alignment: int = 16) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def pad(f, alignment: int = 16):
+    f.write(b"\0" * (align(f.tell(), alignment) - f.tell()))
@@ -0,0 +1,167 @@
+import numpy as np
+import moderngl as mgl
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.graphics import buffer
+from engine.graphics import shader
+
+"""
+Instanced particle renderer
+
+Draws every particle of an emitter with a single instanced draw call.
+- one shared unit diamond (4 corners, drawn as a line loop)
+- one dynamic instance buffer per emitter: position, rotation, size, color,
+  doubled in size when the emitter outgrows it
+- rotation + size are expanded in the vertex shader
+
+Emitters upload their particles during the update and are drawn in
+`ParticleBatch.flush()` -- after the render queue, so the scene never paints
+over them.
+
+Particle positions are in `W_FRAMEBUFFER` pixel space, so the particles line
+up with everything else drawn into the pygame framebuffer.
+"""
+
+PARTICLE_VERTEX_SHADER = "assets/shaders/particle-vertex.glsl"
+PARTICLE_FRAGMENT_SHADER = "assets/shaders/particle-fragment.glsl"
+
+# up, right, down, left -- same corners as the cpu renderer
+PARTICLE_CORNERS = np.array(
+    [(0.0, -1.0), (1.0, 0.0), (0.0, 1.0), (-1.0, 0.0)], dtype="float32"
+)
+
+# x, y, rotation, size, r, g, b
+INSTANCE_FORMAT = "2f 1f 1f 3f/i"
+INSTANCE_ATTRIBUTES = ("in_position", "in_rotation", "in_size", "in_color")
+INSTANCE_FLOATS = 7
+
+
+# ======================================================================== #
+# Particle Renderer
+# ======================================================================== #
+
+
+class ParticleRenderer:
+    # shared between all emitters
+    SHADER_PROGRAM = None
+    CORNER_BUFFER = None
+
+    @classmethod
+    def get_shader_program(cls):
+        if cls.SHADER_PROGRAM is None:
+            cls.SHADER_PROGRAM = shader.ShaderProgram(
+                vertex_shader=shader.Shader(PARTICLE_VERTEX_SHADER),
+                fragment_shader=shader.Shader(PARTICLE_FRAGMENT_SHADER),
+            )
+        return cls.SHADER_PROGRAM
+
+    @classmethod
+    def get_corner_buffer(cls):
+        if cls.CORNER_BUFFER is None:
+            cls.CORNER_BUFFER = buffer.GLBufferObject(PARTICLE_CORNERS)
+        return cls.CORNER_BUFFER
+
+    # ------------------------------------------------------------------------ #
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+
+        # cpu staging rows -- interleaved so the upload is a single write
+        self._staging = np.zeros((capacity, INSTANCE_FLOATS), dtype="float32")
+
+        self._instance_buffer = buffer.GLBufferObject(
+            None, reserve_size=self._staging.nbytes, dynamic=True
+        )
+        self._vao = buffer.VAOObject(
+            self.get_shader_program(),
+            [
+                (self.get_corner_buffer()(), "2f", "in_corner"),
+                (self._instance_buffer(), INSTANCE_FORMAT, *INSTANCE_ATTRIBUTES),
+            ],
+        )
+
+    def clean(self):
+        self._vao.clean()
+        self._instance_buffer.clean()
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def upload(self, particles: "ParticleHandlerComponent") -> int:
+        n = particles._particle_count
+        if not n:
+            return 0
+        if n > self._capacity:
+            self._grow(n)
+
+        staging = self._staging
+        staging[:n, 0:2] = particles._positions[:n]
+        staging[:n, 2] = particles._rotations[:n]
+        staging[:n, 3] = particles._sizes[:n]
+        staging[:n, 4:7] = particles._colors[:n]
+
+        # orphan the old storage so the driver never waits on last frame's draw
+        self._instance_buffer().orphan()
+        self._instance_buffer().write(staging[:n])
+        return n
+
+    def _grow(self, required: int):
+        while self._capacity < required:
+            self._capacity *= 2
+        self._staging = np.zeros((self._capacity, INSTANCE_FLOATS), dtype="float32")
+        self._instance_buffer().orphan(self._staging.nbytes)
+
+    def render(self, count: int):
+        # draws the first `count` uploaded particles
+        self._vao._shader_program["u_resolution"] = (
+            consts.FRAMEBUFFER_WIDTH,
+            consts.FRAMEBUFFER_HEIGHT,
+        )
+        self._vao().render(mode=mgl.LINE_LOOP, vertices=4, instances=count)
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+
+# ======================================================================== #
+# Particle Batch
+# ======================================================================== #
+
+
+class ParticleBatch:
+    def __init__(self):
+        # (renderer, particle count) uploaded this frame
+        self._draws = []
+
+        # stats -- from the last flush
+        self._draw_calls = 0
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def submit(self, renderer: ParticleRenderer, count: int):
+        if count:
+            self._draws.append((renderer, count))
+
+    def remove(self, renderer: ParticleRenderer):
+        # the renderer is about to be released -- drop its pending draw
+        self._draws = [x for x in self._draws if x[0] is not renderer]
+
+    def flush(self):
+        self._draw_calls = len(self._draws)
+        if not self._draws:
+            return
+
+        # particles are a flat overlay -- never write into the 3d depth buffer
+        consts.MGL_CONTEXT.disable(mgl.DEPTH_TEST)
+        for renderer, count in self._draws:
+            renderer.render(count)
+        consts.MGL_CONTEXT.enable(mgl.DEPTH_TEST)
+        self._draws.clear()
+
+    def get_draw_calls(self) -> int:
+        return self._draw_calls
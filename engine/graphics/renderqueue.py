@@ -0,0 +1,182 @@
+import glm
+import numpy as np
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.graphics import camera
+
+"""
+GL state cache + render queue
+
+GLStateCache remembers what is bound, so repeated binds are never sent to gl.
+- textures per unit (Texture.use goes through the cache)
+- the bound framebuffer (FramebufferObject.use_framebuffer goes through the cache)
+- program + vao are tracked for stats only -- moderngl binds both inside render()
+
+Anything that binds gl state behind the cache's back must call `reset()`.
+
+RenderQueue collects MeshComponent draws and issues them sorted by
+program -> texture set -> vao, so consecutive draws share as much state as
+possible. Manifolds keep their own uniform values (see RenderingManifold), so
+the order of the draws does not change what they render.
+
+Draws submitted with a bounding sphere are frustum culled against the active
+camera before sorting -- every sphere is tested at once with numpy.
+"""
+
+
+# ======================================================================== #
+# GL State Cache
+# ======================================================================== #
+
+
+class GLStateCache:
+    def __init__(self):
+        self._textures = {}
+        self._framebuffer = None
+        self._program = None
+        self._vao = None
+
+        # stats -- since the last reset
+        self._binds = 0
+        self._skipped = 0
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def use_texture(self, texture, location: int = 0):
+        if self._textures.get(location) is texture:
+            self._skipped += 1
+            return
+        texture.use(location=location)
+        self._textures[location] = texture
+        self._binds += 1
+
+    def use_framebuffer(self, framebuffer):
+        if self._framebuffer is framebuffer:
+            self._skipped += 1
+            return
+        framebuffer.use()
+        self._framebuffer = framebuffer
+        self._binds += 1
+
+    def use_program(self, program) -> bool:
+        # returns True if the program changed
+        if self._program is program:
+            return False
+        self._program = program
+        return True
+
+    def use_vao(self, vao) -> bool:
+        # returns True if the vao changed
+        if self._vao is vao:
+            return False
+        self._vao = vao
+        return True
+
+    def reset(self):
+        self._textures.clear()
+        self._framebuffer = None
+        self._program = None
+        self._vao = None
+        self._binds = 0
+        self._skipped = 0
+
+    def get_stats(self) -> tuple:
+        # (binds sent to gl, binds skipped)
+        return (self._binds, self._skipped)
+
+
+# ======================================================================== #
+# Render Queue
+# ======================================================================== #
+
+IDENTITY = glm.mat4()
+
+
+class RenderQueue:
+    def __init__(self):
+        self._manifolds = []
+
+        # draws that can be culled -- queue index, local sphere, model matrix
+        self._cull_indices = []
+        self._cull_spheres = []
+        self._cull_models = []
+
+        # stats -- from the last flush
+        self._draw_calls = 0
+        self._program_changes = 0
+        self._culled = 0
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def submit(self, manifold: "RenderingManifold", bounds: tuple = None, model=None):
+        # bounds -- local space (x, y, z, radius), moved into the world by `model`
+        if not manifold._vao:
+            return
+        if bounds is not None:
+            self._cull_indices.append(len(self._manifolds))
+            self._cull_spheres.append(bounds)
+            self._cull_models.append(model if model is not None else IDENTITY)
+        self._manifolds.append(manifold)
+
+    def flush(self):
+        self._draw_calls = 0
+        self._program_changes = 0
+        self._culled = 0
+        if not self._manifolds:
+            return
+
+        manifolds = self._manifolds
+        if self._cull_indices:
+            manifolds = self.cull()
+
+        manifolds.sort(key=get_sort_key)
+        for manifold in manifolds:
+            if consts.MGL_STATE.use_program(manifold._vao._shader_program._program):
+                self._program_changes += 1
+            consts.MGL_STATE.use_vao(manifold._vao._vao)
+            manifold.handle()
+            self._draw_calls += 1
+        self._manifolds.clear()
+        self._cull_indices.clear()
+        self._cull_spheres.clear()
+        self._cull_models.clear()
+
+    def cull(self) -> list:
+        # returns the submitted manifolds that are inside the camera frustum
+        ubo = consts.MGL_CAMERA_UBO
+        active = ubo._owner if ubo is not None else None
+        if active is None or active.get_frustum() is None:
+            return list(self._manifolds)
+
+        spheres = np.array(self._cull_spheres, dtype="float32")
+        models = np.array(self._cull_models, dtype="float32")
+
+        # sphere centers into world space + radii scaled by the largest axis scale
+        basis = models[:, :3, :3]
+        centers = np.einsum("nij,nj->ni", basis, spheres[:, :3]) + models[:, :3, 3]
+        radii = spheres[:, 3] * np.linalg.norm(basis, axis=1).max(axis=1)
+
+        visible = np.ones(len(self._manifolds), dtype=bool)
+        visible[self._cull_indices] = camera.test_spheres_in_frustum(
+            active.get_frustum(), centers, radii
+        )
+        self._culled = len(visible) - int(np.count_nonzero(visible))
+        return [m for m, v in zip(self._manifolds, visible.tolist()) if v]
+
+    def get_stats(self) -> tuple:
+        # (draw calls, program changes, culled draws)
+        return (self._draw_calls, self._program_changes, self._culled)
+
+
+def get_sort_key(manifold: "RenderingManifold") -> tuple:
+    return (
+        manifold._vao._shader_program._program.glo,
+        tuple(id(tex) for _, tex in manifold._textures if tex),
+        manifold._vao._vao.glo,
+    )
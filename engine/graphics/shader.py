@@ -1,3 +1,6 @@
+import os
+import hashlib
+
 import engine.context as ctx
 import engine.constants as consts
 
@@ -7,6 +10,9 @@ import engine.constants as consts
 
 
 class Shader:
+    # path -> (modified time, source)
+    SOURCE_CACHE = {}
+
     def __init__(self, file_path: str):
         self._file_path = file_path
         self._shader = None
@@ -16,7 +22,15 @@ class Shader:
     # ------------------------------------------------------------------------ #
 
     def get_shader_code(self) -> str:
-        return open(self._file_path, "r").read()
+        # files are only re-read when they change on disk
+        mtime = os.path.getmtime(self._file_path)
+        cached = self.SOURCE_CACHE.get(self._file_path)
+        if cached is None or cached[0] != mtime:
+            with open(self._file_path, "r") as f:
+                cached = (mtime, f.read())
+            self.SOURCE_CACHE[self._file_path] = cached
+        self._shader = cached[1]
+        return self._shader
 
 
 # ======================================================================== #
@@ -28,6 +42,12 @@ class ShaderProgram:
     CACHE = {}
     SHADER_PROGRAM_COUNTER = 0
 
+    # source hash -> [compiled program, reference count]
+    PROGRAM_CACHE = {}
+
+    # uniform block name -> binding point (see buffer.UniformBufferObject)
+    UNIFORM_BLOCKS = {}
+
     @classmethod
     def generate_shader_program_uuid(cls):
         cls.SHADER_PROGRAM_COUNTER += 1
@@ -53,6 +73,23 @@ class ShaderProgram:
     def get_shader(cls, shader_uuid: int):
         return cls.CACHE[shader_uuid]
 
+    @classmethod
+    def register_uniform_block(cls, name: str, binding: int):
+        # every program -- existing + future -- that declares the block binds it
+        cls.UNIFORM_BLOCKS[name] = binding
+        for shader_program in cls.CACHE.values():
+            shader_program.bind_uniform_block(name, binding)
+
+    @classmethod
+    def get_source_hash(cls, sources: dict) -> str:
+        digest = hashlib.sha1()
+        for stage, code in sources.items():
+            digest.update(stage.encode())
+            digest.update(b"\0")
+            digest.update(code.encode() if code is not None else b"")
+            digest.update(b"\0")
+        return digest.hexdigest()
+
     # ------------------------------------------------------------------------ #
 
     def __init__(
@@ -75,35 +112,64 @@ class ShaderProgram:
         }
 
         self._program = None
+        self._source_hash = None
         self.__create()
 
+        # name -> moderngl uniform -- avoids a lookup on every write
+        self._uniforms = {}
+        for name, binding in self.UNIFORM_BLOCKS.items():
+            self.bind_uniform_block(name, binding)
+
     # ------------------------------------------------------------------------ #
     # logic
     # ------------------------------------------------------------------------ #
 
     def __create(self):
+        sources = {
+            stage: shader.get_shader_code() if shader is not None else None
+            for stage, shader in self._shaders.items()
+        }
+
+        # identical stage sources share one compiled program
+        self._source_hash = self.get_source_hash(sources)
+        if self._source_hash in self.PROGRAM_CACHE:
+            entry = self.PROGRAM_CACHE[self._source_hash]
+            entry[1] += 1
+            self._program = entry[0]
+            return
+
         self._program = consts.MGL_CONTEXT.program(
-            vertex_shader=self._shaders["vertex"].get_shader_code(),
-            fragment_shader=self._shaders["fragment"].get_shader_code(),
-            geometry_shader=(
-                self._shaders["geometry"].get_shader_code()
-                if self._shaders["geometry"] is not None
-                else None
-            ),
-            tess_control_shader=(
-                self._shaders["tess_control"].get_shader_code()
-                if self._shaders["tess_control"] is not None
-                else None
-            ),
-            tess_evaluation_shader=(
-                self._shaders["tess_evaluation"].get_shader_code()
-                if self._shaders["tess_evaluation"] is not None
-                else None
-            ),
+            vertex_shader=sources["vertex"],
+            fragment_shader=sources["fragment"],
+            geometry_shader=sources["geometry"],
+            tess_control_shader=sources["tess_control"],
+            tess_evaluation_shader=sources["tess_evaluation"],
         )
+        self.PROGRAM_CACHE[self._source_hash] = [self._program, 1]
+
+    def get_uniform(self, name: str):
+        if name not in self._uniforms:
+            self._uniforms[name] = self._program[name]
+        return self._uniforms[name]
+
+    def write_uniform(self, name: str, data):
+        self.get_uniform(name).write(data)
+
+    def has_uniform(self, name: str) -> bool:
+        return name in self._uniforms or self._program.get(name, None) is not None
+
+    def bind_uniform_block(self, name: str, binding: int):
+        if self.has_uniform(name):
+            self.get_uniform(name).binding = binding
 
     def clean(self, clean_func: bool = False):
-        self._program.release()
+        # only release the compiled program once nothing else shares it
+        entry = self.PROGRAM_CACHE.get(self._source_hash)
+        if entry is not None and entry[0] is self._program:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                self.PROGRAM_CACHE.pop(self._source_hash)
+                self._program.release()
         if not clean_func:
             self.remove_from_cache(self)
 
@@ -115,7 +181,7 @@ class ShaderProgram:
         return self._program
 
     def __getitem__(self, key):
-        return self._program[key]
+        return self.get_uniform(key)
 
     def __setitem__(self, key, value):
-        self._program[key] = value
+        self.get_uniform(key).value = value
@@ -0,0 +1,214 @@
+import pygame
+import numpy as np
+import moderngl as mgl
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.graphics import atlas
+from engine.graphics import buffer
+from engine.graphics import shader
+from engine.graphics import texture
+
+"""
+Sprite batcher
+
+Collects every submitted sprite during the frame and draws them in `flush()`.
+- one dynamic vertex buffer (x, y, u, v) holding 6 vertices per sprite
+- sprites are sorted by z-layer, then by texture
+  (overlapping sprites on the same z-layer have no guaranteed order)
+- one draw call per run of sprites that share a texture
+- horizontal flips are done by swapping uvs (no pygame.transform.flip)
+- with a `TextureAtlas`, sprites are packed into shared pages + drawn with
+  their uv sub-rect, so distinct sprites no longer force a texture switch
+
+Sprite positions are in `W_FRAMEBUFFER` pixel space.
+"""
+
+SPRITE_VERTEX_SHADER = "assets/shaders/sprite-vertex.glsl"
+SPRITE_FRAGMENT_SHADER = "assets/shaders/sprite-fragment.glsl"
+
+# floats per vertex -- x, y, u, v
+VERTEX_FLOATS = 4
+SPRITE_VERTICES = 6
+
+
+# ======================================================================== #
+# Sprite Batch
+# ======================================================================== #
+
+
+class SpriteBatch:
+    def __init__(
+        self,
+        capacity: int = consts.DEFAULT_SPRITE_BATCH_CAPACITY,
+        texture_atlas: atlas.TextureAtlas = None,
+    ):
+        self._capacity = capacity
+
+        # gpu textures for each submitted surface -- unused with an atlas
+        self._textures = {}
+        self._atlas = texture_atlas
+
+        # sprites submitted this frame
+        self._sprite_textures = []
+        self._sprite_rects = []
+        self._sprite_uvs = []
+        self._sprite_zlayers = []
+        self._sprite_flips = []
+
+        self._shader_program = shader.ShaderProgram(
+            vertex_shader=shader.Shader(SPRITE_VERTEX_SHADER),
+            fragment_shader=shader.Shader(SPRITE_FRAGMENT_SHADER),
+        )
+        self._vertex_buffer = buffer.GLBufferObject(
+            None,
+            reserve_size=capacity * SPRITE_VERTICES * VERTEX_FLOATS * 4,
+            dynamic=True,
+        )
+        self._vao = buffer.VAOObject(
+            self._shader_program,
+            [(self._vertex_buffer(), "2f 2f", "in_position", "in_texcoords")],
+        )
+        self._shader_program["u_texture"] = 0
+
+        # stats -- from the last flush
+        self._draw_calls = 0
+
+    def __on_clean__(self):
+        print(f"{consts.RUN_TIME:.5f} | ---- CLEANING SPRITE BATCH ----")
+        for tex in self._textures.values():
+            tex.clean()
+        self._textures.clear()
+        if self._atlas is not None:
+            self._atlas.__on_clean__()
+        self._vao.clean()
+        self._vertex_buffer.clean()
+        self._shader_program.clean()
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def submit(
+        self,
+        image: pygame.Surface,
+        position: tuple,
+        zlayer: int = 0,
+        flip: bool = False,
+    ):
+        width, height = image.get_size()
+        if not width or not height:
+            return
+
+        if self._atlas is not None:
+            region = self._atlas.add(image)
+            self._sprite_textures.append(region._page)
+            self._sprite_uvs.append(region._uv)
+        else:
+            self._sprite_textures.append(self.get_texture(image))
+            self._sprite_uvs.append((0.0, 0.0, 1.0, 1.0))
+        self._sprite_rects.append((position[0], position[1], width, height))
+        self._sprite_zlayers.append(zlayer)
+        self._sprite_flips.append(flip)
+
+    def flush(self):
+        count = len(self._sprite_rects)
+        self._draw_calls = 0
+        if not count:
+            return
+
+        # sort by zlayer, then texture (or atlas page)
+        tex_ids = np.fromiter(
+            (id(tex) for tex in self._sprite_textures), dtype="int64", count=count
+        )
+        order = np.lexsort((tex_ids, np.array(self._sprite_zlayers)))
+        tex_ids = tex_ids[order]
+
+        # build quads
+        rects = np.array(self._sprite_rects, dtype="float32")[order]
+        uvs = np.array(self._sprite_uvs, dtype="float32")[order]
+        flips = np.array(self._sprite_flips, dtype=bool)[order]
+        x0 = rects[:, 0]
+        y0 = rects[:, 1]
+        x1 = x0 + rects[:, 2]
+        y1 = y0 + rects[:, 3]
+        u0 = np.where(flips, uvs[:, 2], uvs[:, 0])
+        u1 = np.where(flips, uvs[:, 0], uvs[:, 2])
+        v0 = uvs[:, 1]
+        v1 = uvs[:, 3]
+
+        if count > self._capacity:
+            self._grow(count)
+
+        vertices = np.empty((count, SPRITE_VERTICES, VERTEX_FLOATS), dtype="float32")
+        # tri 1 -- top left, top right, bottom right
+        vertices[:, 0] = np.stack((x0, y0, u0, v0), axis=1)
+        vertices[:, 1] = np.stack((x1, y0, u1, v0), axis=1)
+        vertices[:, 2] = np.stack((x1, y1, u1, v1), axis=1)
+        # tri 2 -- top left, bottom right, bottom left
+        vertices[:, 3] = vertices[:, 0]
+        vertices[:, 4] = vertices[:, 2]
+        vertices[:, 5] = np.stack((x0, y1, u0, v1), axis=1)
+
+        # orphan the old storage so the driver never waits on last frame's draw
+        self._vertex_buffer().orphan()
+        self._vertex_buffer().write(vertices)
+
+        self._shader_program["u_resolution"] = (
+            consts.FRAMEBUFFER_WIDTH,
+            consts.FRAMEBUFFER_HEIGHT,
+        )
+
+        # sprites are a flat overlay with alpha
+        consts.MGL_CONTEXT.disable(mgl.DEPTH_TEST)
+        consts.MGL_CONTEXT.enable(mgl.BLEND)
+        consts.MGL_CONTEXT.blend_func = mgl.SRC_ALPHA, mgl.ONE_MINUS_SRC_ALPHA
+
+        # one draw call per texture run
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(tex_ids)) + 1, [count]))
+        for start, end in zip(starts[:-1].tolist(), starts[1:].tolist()):
+            tex = self._sprite_textures[order[start]]
+            if self._atlas is not None:
+                tex = tex.get_texture()
+            tex.use(location=0)
+            self._vao().render(
+                vertices=(end - start) * SPRITE_VERTICES,
+                first=start * SPRITE_VERTICES,
+            )
+            self._draw_calls += 1
+
+        consts.MGL_CONTEXT.disable(mgl.BLEND)
+        consts.MGL_CONTEXT.enable(mgl.DEPTH_TEST)
+
+        self._sprite_textures.clear()
+        self._sprite_rects.clear()
+        self._sprite_uvs.clear()
+        self._sprite_zlayers.clear()
+        self._sprite_flips.clear()
+
+    def get_texture(self, image: pygame.Surface) -> texture.Texture:
+        # surfaces are uploaded once + reused every frame after
+        if image not in self._textures:
+            tex = texture.Texture(raw_image=image, mipmap=False)
+            tex._texture.filter = (mgl.NEAREST, mgl.NEAREST)
+            self._textures[image] = tex
+        return self._textures[image]
+
+    def release_texture(self, image: pygame.Surface):
+        if image in self._textures:
+            self._textures.pop(image).clean()
+
+    def get_atlas(self) -> atlas.TextureAtlas:
+        return self._atlas
+
+    def get_draw_calls(self) -> int:
+        return self._draw_calls
+
+    def _grow(self, count: int):
+        while self._capacity < count:
+            self._capacity *= 2
+        self._vertex_buffer().orphan(
+            self._capacity * SPRITE_VERTICES * VERTEX_FLOATS * 4
+        )
+        self._vertex_buffer._reserver_size = self._vertex_buffer().size
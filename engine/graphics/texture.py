@@ -1,3 +1,5 @@
+import sys
+
 import pygame
 import moderngl as mgl
 
@@ -219,7 +221,107 @@ class Texture:
         self._texture.release()
 
     def use(self, location: int = 0):
-        self._texture.use(location=location)
+        consts.MGL_STATE.use_texture(self._texture, location)
+
+    # ------------------------------------------------------------------------ #
+    # special functions
+    # ------------------------------------------------------------------------ #
+
+    def __call__(self):
+        return self._texture
+
+
+# ============================================================================= #
+# Streaming Texture
+# ============================================================================= #
+
+
+class StreamingTexture:
+    """
+    Reusable gl textures for a pygame surface that changes every frame.
+
+    - `count` textures of a fixed size are created once + written in place
+    - `update()` writes into the next texture (round robin), so the upload never
+      waits on a draw call that still samples last frame's texture
+    - the surface pixels are written straight from its buffer -- channel order
+      is fixed with a texture swizzle instead of a `tostring` copy
+    - mipmaps are only built when requested
+    """
+
+    def __init__(self, surface: pygame.Surface, count: int = 2, mipmap: bool = False):
+        self._uuid = Texture.generate_texture_uuid()
+        self._path = None
+        self._surface = surface
+        self._has_mipmaps = mipmap
+
+        self._width, self._height = surface.get_size()
+        self._components = 4
+
+        # byte order of the surface pixels -> rgba
+        self._raw_upload = surface.get_bytesize() == 4
+        self._swizzle = self.get_swizzle(surface) if self._raw_upload else "RGBA"
+
+        self._textures = []
+        for _ in range(count):
+            tex = consts.MGL_CONTEXT.texture(
+                size=(self._width, self._height), components=self._components
+            )
+            tex.swizzle = self._swizzle
+            if self._has_mipmaps:
+                tex.filter = (mgl.LINEAR_MIPMAP_LINEAR, mgl.LINEAR)
+            self._textures.append(tex)
+        self._index = 0
+        self._texture = self._textures[0]
+
+        Texture.cache_non_file(self)
+        self.update()
+
+    @staticmethod
+    def get_swizzle(surface: pygame.Surface) -> str:
+        # for each output channel: the pixel byte that holds it
+        # a channel with shift s sits in byte s // 8 on little endian machines
+        result = ""
+        for name, shift, mask in zip("RGBA", surface.get_shifts(), surface.get_masks()):
+            if not mask:
+                # no alpha -> opaque, no colour -> black
+                result += "1" if name == "A" else "0"
+                continue
+            index = shift // 8 if sys.byteorder == "little" else 3 - shift // 8
+            result += "RGBA"[index]
+        return result
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def update(self):
+        self._index = (self._index + 1) % len(self._textures)
+        self._texture = self._textures[self._index]
+
+        if self._raw_upload:
+            try:
+                self._texture.write(self._surface.get_view("0"))
+            except ValueError:
+                # padded rows -- fall back to a packed copy
+                self._raw_upload = False
+                self._swizzle = "RGBA"
+                for tex in self._textures:
+                    tex.swizzle = self._swizzle
+        if not self._raw_upload:
+            self._texture.write(pygame.image.tostring(self._surface, "RGBA", False))
+
+        if self._has_mipmaps:
+            self._texture.build_mipmaps()
+
+    def clean(self, clean_func: bool = False):
+        for tex in self._textures:
+            tex.release()
+        self._textures.clear()
+        if not clean_func:
+            Texture.NONE_FILE_CACHE.pop(self._uuid, None)
+
+    def use(self, location: int = 0):
+        consts.MGL_STATE.use_texture(self._texture, location)
 
     # ------------------------------------------------------------------------ #
     # special functions
@@ -0,0 +1,442 @@
+import math
+import heapq
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.physics import broadphase
+
+"""
+Dynamic AABB Tree
+
+A bounding volume hierarchy over the `ShapeComponent._rect` of every collider.
+- leaves store a "fat" aabb (rect + margin)
+- a leaf is only re-inserted when the rect leaves its fat aabb
+- the tree is kept balanced with AVL style rotations
+
+All aabbs are stored as (left, top, right, bottom) tuples.
+"""
+
+# ======================================================================== #
+# Tree Node
+# ======================================================================== #
+
+
+class AABBTreeNode:
+    __slots__ = ("aabb", "parent", "left", "right", "height", "interact")
+
+    def __init__(self, aabb: tuple, interact: "InteractionFieldComponent" = None):
+        self.aabb = aabb
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.height = 0
+
+        # only leaves have an interact component
+        self.interact = interact
+
+    def is_leaf(self):
+        return self.left is None
+
+
+# ======================================================================== #
+# AABB Tree
+# ======================================================================== #
+
+
+class AABBTree(broadphase.Broadphase):
+    def __init__(self, margin: float = consts.DEFAULT_AABB_TREE_MARGIN):
+        super().__init__()
+        self._margin = margin
+
+        self._root = None
+        # uuid -> leaf node
+        self._leaves = {}
+
+    # ------------------------------------------------------------------------ #
+    # broadphase logic
+    # ------------------------------------------------------------------------ #
+
+    def _insert(self, interact):
+        leaf = AABBTreeNode(self.get_fat_aabb(interact._shape._rect), interact)
+        self._leaves[interact._uuid] = leaf
+        self._insert_leaf(leaf)
+
+    def _remove(self, interact):
+        self._remove_leaf(self._leaves.pop(interact._uuid))
+
+    def _move(self, interact):
+        rect = interact._shape._rect
+        rect.center = interact._entity._position
+
+        # still inside of the fat aabb -- nothing to do
+        leaf = self._leaves[interact._uuid]
+        left, top, right, bottom = leaf.aabb
+        if (
+            left <= rect.left
+            and top <= rect.top
+            and rect.right <= right
+            and rect.bottom <= bottom
+        ):
+            return
+
+        self._remove_leaf(leaf)
+        leaf.aabb = self.get_fat_aabb(rect)
+        self._insert_leaf(leaf)
+
+    def get_pairs(self):
+        pairs = []
+        for uuid, i1 in self._dynamic.items():
+            for i2 in self.query_rect(i1._shape._rect):
+                if i2 is i1:
+                    continue
+                # dynamic vs dynamic pairs are found from both sides
+                if i2._uuid < uuid and not i2._static:
+                    continue
+                pairs.append((i1, i2))
+        return pairs
+
+    # ------------------------------------------------------------------------ #
+    # queries
+    # ------------------------------------------------------------------------ #
+
+    def query_rect(self, rect, mask: int = None) -> list:
+        result = []
+        if self._root is None:
+            return result
+
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            aabb = node.aabb
+            if aabb[2] < left or right < aabb[0] or aabb[3] < top or bottom < aabb[1]:
+                continue
+            if node.left is not None:
+                stack.append(node.left)
+                stack.append(node.right)
+                continue
+
+            interact = node.interact
+            if mask is not None and not interact._collision_mask & mask:
+                continue
+            if interact._shape._rect.colliderect(rect):
+                result.append(interact)
+        return result
+
+    def query_point(self, point, mask: int = None) -> list:
+        result = []
+        if self._root is None:
+            return result
+
+        x, y = point[0], point[1]
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            aabb = node.aabb
+            if x < aabb[0] or aabb[2] < x or y < aabb[1] or aabb[3] < y:
+                continue
+            if node.left is not None:
+                stack.append(node.left)
+                stack.append(node.right)
+                continue
+
+            interact = node.interact
+            if mask is not None and not interact._collision_mask & mask:
+                continue
+            if interact._shape._rect.collidepoint(x, y):
+                result.append(interact)
+        return result
+
+    def raycast_all(self, start, end, mask: int = None) -> list:
+        """
+        Returns every collider along the segment start -> end
+        as a list of (fraction, interact) sorted by fraction [0, 1].
+        """
+        hits = self._raycast(start, end, mask, closest=False)
+        hits.sort(key=lambda x: x[0])
+        return hits
+
+    def raycast(self, start, end, mask: int = None):
+        """
+        Returns the closest (fraction, interact) along start -> end or None.
+        """
+        hits = self._raycast(start, end, mask, closest=True)
+        return hits[-1] if hits else None
+
+    def query_nearest(
+        self, point, mask: int = None, max_distance: float = math.inf, count: int = 1
+    ) -> list:
+        """
+        Returns up to `count` (distance, interact) tuples closest to the point.
+        Distance is measured to the collider rect -- 0 if the point is inside.
+        """
+        result = []
+        if self._root is None:
+            return result
+
+        x, y = point[0], point[1]
+        # (distance, tiebreak, node, interact) -- leaves are pushed again with
+        # their exact rect distance + no node
+        heap = [(_point_aabb_distance(x, y, self._root.aabb), 0, self._root, None)]
+        counter = 1
+        while heap and len(result) < count:
+            distance, _, node, interact = heapq.heappop(heap)
+            if distance > max_distance:
+                break
+
+            if node is None:
+                result.append((distance, interact))
+                continue
+
+            if node.left is not None:
+                for child in (node.left, node.right):
+                    heapq.heappush(
+                        heap,
+                        (_point_aabb_distance(x, y, child.aabb), counter, child, None),
+                    )
+                    counter += 1
+                continue
+
+            interact = node.interact
+            if mask is not None and not interact._collision_mask & mask:
+                continue
+            rect = interact._shape._rect
+            distance = _point_aabb_distance(
+                x, y, (rect.left, rect.top, rect.right, rect.bottom)
+            )
+            heapq.heappush(heap, (distance, counter, None, interact))
+            counter += 1
+        return result
+
+    # ------------------------------------------------------------------------ #
+    # tree logic
+    # ------------------------------------------------------------------------ #
+
+    def get_fat_aabb(self, rect) -> tuple:
+        return (
+            rect.left - self._margin,
+            rect.top - self._margin,
+            rect.right + self._margin,
+            rect.bottom + self._margin,
+        )
+
+    def get_height(self) -> int:
+        return self._root.height if self._root is not None else 0
+
+    def _insert_leaf(self, leaf: AABBTreeNode):
+        if self._root is None:
+            self._root = leaf
+            leaf.parent = None
+            return
+
+        # stage 1: find the best sibling -- cheapest increase in perimeter
+        aabb = leaf.aabb
+        node = self._root
+        while node.left is not None:
+            combined = _perimeter(_union(node.aabb, aabb))
+            cost = 2 * combined
+            inherit = 2 * (combined - _perimeter(node.aabb))
+
+            cost_left = _descend_cost(node.left, aabb) + inherit
+            cost_right = _descend_cost(node.right, aabb) + inherit
+
+            if cost < cost_left and cost < cost_right:
+                break
+            node = node.left if cost_left < cost_right else node.right
+
+        # stage 2: create a new parent for the sibling + leaf
+        sibling = node
+        old_parent = sibling.parent
+        new_parent = AABBTreeNode(_union(aabb, sibling.aabb))
+        new_parent.parent = old_parent
+        new_parent.height = sibling.height + 1
+        new_parent.left = sibling
+        new_parent.right = leaf
+        sibling.parent = new_parent
+        leaf.parent = new_parent
+
+        if old_parent is None:
+            self._root = new_parent
+        elif old_parent.left is sibling:
+            old_parent.left = new_parent
+        else:
+            old_parent.right = new_parent
+
+        # stage 3: walk back up + refit
+        self._refit(leaf.parent)
+
+    def _remove_leaf(self, leaf: AABBTreeNode):
+        if leaf is self._root:
+            self._root = None
+            return
+
+        parent = leaf.parent
+        grand_parent = parent.parent
+        sibling = parent.left if parent.right is leaf else parent.right
+
+        if grand_parent is None:
+            self._root = sibling
+            sibling.parent = None
+        else:
+            if grand_parent.left is parent:
+                grand_parent.left = sibling
+            else:
+                grand_parent.right = sibling
+            sibling.parent = grand_parent
+            self._refit(grand_parent)
+        leaf.parent = None
+
+    def _refit(self, node: AABBTreeNode):
+        while node is not None:
+            node = self._balance(node)
+            node.height = 1 + max(node.left.height, node.right.height)
+            node.aabb = _union(node.left.aabb, node.right.aabb)
+            node = node.parent
+
+    def _balance(self, a: AABBTreeNode) -> AABBTreeNode:
+        # avl style rotation -- returns the new root of the subtree
+        if a.left is None or a.height < 2:
+            return a
+
+        b = a.left
+        c = a.right
+        balance = c.height - b.height
+
+        if balance > 1:
+            return self._rotate(a, c, b)
+        if balance < -1:
+            return self._rotate(a, b, c)
+        return a
+
+    def _rotate(self, a: AABBTreeNode, up: AABBTreeNode, other: AABBTreeNode):
+        # promote `up` (a child of `a`) to replace `a`
+        f = up.left
+        g = up.right
+
+        up.left = a
+        up.parent = a.parent
+        a.parent = up
+
+        if up.parent is None:
+            self._root = up
+        elif up.parent.left is a:
+            up.parent.left = up
+        else:
+            up.parent.right = up
+
+        # keep the taller grandchild under `up`
+        if f.height > g.height:
+            up.right = f
+            keep, give = f, g
+        else:
+            up.right = g
+            keep, give = g, f
+
+        if a.left is up:
+            a.left = give
+        else:
+            a.right = give
+        give.parent = a
+
+        a.aabb = _union(other.aabb, give.aabb)
+        a.height = 1 + max(other.height, give.height)
+        up.aabb = _union(a.aabb, keep.aabb)
+        up.height = 1 + max(a.height, keep.height)
+        return up
+
+    def _raycast(self, start, end, mask: int, closest: bool) -> list:
+        hits = []
+        if self._root is None:
+            return hits
+
+        sx, sy = start[0], start[1]
+        dx, dy = end[0] - sx, end[1] - sy
+        max_fraction = 1.0
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            fraction = _segment_aabb_fraction(sx, sy, dx, dy, node.aabb, max_fraction)
+            if fraction is None:
+                continue
+            if node.left is not None:
+                stack.append(node.left)
+                stack.append(node.right)
+                continue
+
+            interact = node.interact
+            if mask is not None and not interact._collision_mask & mask:
+                continue
+            rect = interact._shape._rect
+            fraction = _segment_aabb_fraction(
+                sx,
+                sy,
+                dx,
+                dy,
+                (rect.left, rect.top, rect.right, rect.bottom),
+                max_fraction,
+            )
+            if fraction is None:
+                continue
+
+            hits.append((fraction, interact))
+            # clip the ray -- everything further away can be skipped
+            if closest:
+                max_fraction = fraction
+        return hits
+
+
+# ======================================================================== #
+# utils
+# ======================================================================== #
+
+
+def _union(a: tuple, b: tuple) -> tuple:
+    return (
+        a[0] if a[0] < b[0] else b[0],
+        a[1] if a[1] < b[1] else b[1],
+        a[2] if a[2] > b[2] else b[2],
+        a[3] if a[3] > b[3] else b[3],
+    )
+
+
+def _perimeter(a: tuple) -> float:
+    return 2 * ((a[2] - a[0]) + (a[3] - a[1]))
+
+
+def _descend_cost(node: AABBTreeNode, aabb: tuple) -> float:
+    if node.left is None:
+        return _perimeter(_union(aabb, node.aabb))
+    return _perimeter(_union(aabb, node.aabb)) - _perimeter(node.aabb)
+
+
+def _point_aabb_distance(x: float, y: float, aabb: tuple) -> float:
+    dx = max(aabb[0] - x, 0, x - aabb[2])
+    dy = max(aabb[1] - y, 0, y - aabb[3])
+    return math.hypot(dx, dy)
+
+
+def _segment_aabb_fraction(
+    sx: float, sy: float, dx: float, dy: float, aabb: tuple, max_fraction: float
+):
+    # slab test -- returns the entry fraction or None if no hit
+    tmin = 0.0
+    tmax = max_fraction
+
+    for s, d, lo, hi in ((sx, dx, aabb[0], aabb[2]), (sy, dy, aabb[1], aabb[3])):
+        if d == 0:
+            if s < lo or s > hi:
+                return None
+            continue
+        t1 = (lo - s) / d
+        t2 = (hi - s) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tmin:
+            tmin = t1
+        if t2 < tmax:
+            tmax = t2
+        if tmin > tmax:
+            return None
+    return tmin
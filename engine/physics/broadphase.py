@@ -0,0 +1,272 @@
+import engine.context as ctx
+import engine.constants as consts
+
+"""
+Broadphase
+
+Cheap spatial filtering that runs before collision detection.
+- only hands (possibly) overlapping pairs to `InteractionField.detect_collision`
+- incremental -- static colliders are inserted once and never rebuilt
+- pluggable -- `InteractionField(world, broadphase_method=...)`
+
+Every broadphase works on the `ShapeComponent._rect` of each interaction component.
+"""
+
+# ======================================================================== #
+# Broadphase
+# ======================================================================== #
+
+
+class Broadphase:
+    def __init__(self):
+        # uuid -> interaction component
+        self._entries = {}
+        self._dynamic = {}
+        self._static = {}
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def update(self, interacts: dict):
+        self.sync(interacts)
+        for interact in self._dynamic.values():
+            self._move(interact)
+
+    def sync(self, interacts: dict):
+        # membership only -- nothing that is already indexed is moved
+        # stage 1: remove components that are no longer in the ecs
+        for uuid in self._entries.keys() - interacts.keys():
+            self.remove(uuid)
+
+        # stage 2: insert new components
+        for uuid in interacts.keys() - self._entries.keys():
+            interact = interacts[uuid]
+            if interact._shape is not None:
+                self.insert(interact)
+
+    def move(self, interact: "InteractionFieldComponent"):
+        # re-index one collider after its entity moved -- static ones included
+        if interact._uuid in self._entries:
+            self._move(interact)
+
+    def insert(self, interact: "InteractionFieldComponent"):
+        # make sure the rect is at the entity position before indexing
+        interact._shape._rect.center = interact._entity._position
+
+        self._entries[interact._uuid] = interact
+        if interact._static:
+            self._static[interact._uuid] = interact
+        else:
+            self._dynamic[interact._uuid] = interact
+        self._insert(interact)
+
+    def remove(self, uuid: int):
+        interact = self._entries.pop(uuid, None)
+        if interact is None:
+            return
+        self._static.pop(uuid, None)
+        self._dynamic.pop(uuid, None)
+        self._remove(interact)
+
+    def refresh(self, interact: "InteractionFieldComponent"):
+        # re-index a static collider that was teleported
+        self.remove(interact._uuid)
+        self.insert(interact)
+
+    def clear(self):
+        for uuid in list(self._entries.keys()):
+            self.remove(uuid)
+
+    # ------------------------------------------------------------------------ #
+    # override in subclasses
+    # ------------------------------------------------------------------------ #
+
+    def _insert(self, interact: "InteractionFieldComponent"):
+        pass
+
+    def _remove(self, interact: "InteractionFieldComponent"):
+        pass
+
+    def _move(self, interact: "InteractionFieldComponent"):
+        pass
+
+    def get_pairs(self) -> "list[tuple]":
+        return []
+
+
+# ======================================================================== #
+# Brute Force
+# ======================================================================== #
+
+
+class BruteForceBroadphase(Broadphase):
+    """
+    The old O(n^2) behaviour -- useful as a reference when debugging the others.
+    """
+
+    def get_pairs(self):
+        pairs = []
+        interacts = list(self._entries.values())
+        for i in range(len(interacts)):
+            i1 = interacts[i]
+            for j in range(i + 1, len(interacts)):
+                i2 = interacts[j]
+                if i1._static and i2._static:
+                    continue
+                pairs.append((i1, i2))
+        return pairs
+
+
+# ======================================================================== #
+# Spatial Hash
+# ======================================================================== #
+
+
+class SpatialHashBroadphase(Broadphase):
+    """
+    Uniform grid keyed by (cell x, cell y).
+
+    Each collider is stored in every cell that its rect touches.
+    Dynamic colliders are only re-bucketed when their cell range changes.
+    """
+
+    def __init__(self, cell_size: int = consts.DEFAULT_BROADPHASE_CELL_SIZE):
+        super().__init__()
+        self._cell_size = cell_size
+
+        # (cx, cy) -> set of uuids
+        self._cells = {}
+        # uuid -> (x0, y0, x1, y1) inclusive cell range
+        self._ranges = {}
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def get_cell_range(self, rect) -> tuple:
+        return (
+            int(rect.left // self._cell_size),
+            int(rect.top // self._cell_size),
+            int(rect.right // self._cell_size),
+            int(rect.bottom // self._cell_size),
+        )
+
+    def _insert(self, interact):
+        cell_range = self.get_cell_range(interact._shape._rect)
+        self._ranges[interact._uuid] = cell_range
+        self._add_to_cells(interact._uuid, cell_range)
+
+    def _remove(self, interact):
+        self._remove_from_cells(interact._uuid, self._ranges.pop(interact._uuid))
+
+    def _move(self, interact):
+        cell_range = self.get_cell_range(interact._shape._rect)
+        old_range = self._ranges[interact._uuid]
+        if cell_range == old_range:
+            return
+        self._remove_from_cells(interact._uuid, old_range)
+        self._add_to_cells(interact._uuid, cell_range)
+        self._ranges[interact._uuid] = cell_range
+
+    def get_pairs(self):
+        pairs = []
+        seen = set()
+
+        for uuid, i1 in self._dynamic.items():
+            rect1 = i1._shape._rect
+            x0, y0, x1, y1 = self._ranges[uuid]
+
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    for other in self._cells[(cx, cy)]:
+                        if other == uuid:
+                            continue
+                        # dynamic vs dynamic pairs are found from both sides
+                        if other < uuid and other in self._dynamic:
+                            continue
+                        key = (uuid, other)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+
+                        i2 = self._entries[other]
+                        if rect1.colliderect(i2._shape._rect):
+                            pairs.append((i1, i2))
+        return pairs
+
+    # ------------------------------------------------------------------------ #
+    # utils
+    # ------------------------------------------------------------------------ #
+
+    def _add_to_cells(self, uuid: int, cell_range: tuple):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is None:
+                    cell = self._cells[(cx, cy)] = set()
+                cell.add(uuid)
+
+    def _remove_from_cells(self, uuid: int, cell_range: tuple):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells[(cx, cy)]
+                cell.discard(uuid)
+                if not cell:
+                    del self._cells[(cx, cy)]
+
+
+# ======================================================================== #
+# Sweep and Prune
+# ======================================================================== #
+
+
+def _rect_left(interact: "InteractionFieldComponent"):
+    return interact._shape._rect.left
+
+
+class SweepAndPruneBroadphase(Broadphase):
+    """
+    Sort colliders along the x axis + sweep.
+
+    The axis list barely changes between frames, so the sort is close to linear.
+    Works well for scenes that are spread along one axis (side scrollers).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._axis_list = []
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def _insert(self, interact):
+        self._axis_list.append(interact)
+
+    def _remove(self, interact):
+        self._axis_list.remove(interact)
+
+    def get_pairs(self):
+        pairs = []
+        active = []
+
+        # nearly sorted from last frame
+        self._axis_list.sort(key=_rect_left)
+
+        for i1 in self._axis_list:
+            rect1 = i1._shape._rect
+
+            # prune everything that ends before this collider starts
+            left = rect1.left
+            active = [i2 for i2 in active if i2._shape._rect.right > left]
+
+            for i2 in active:
+                if i1._static and i2._static:
+                    continue
+                if rect1.colliderect(i2._shape._rect):
+                    pairs.append((i2, i1))
+            active.append(i1)
+        return pairs
@@ -79,6 +79,7 @@ def _resolve_aabb_sorabox2d(manifold: interact.CollisionManifold):
 
     # stage 2: update entity position
     d_entity._position.xy = d_rect.center
+    d_entity.mark_moved()
 
 
 interact.InteractionField.cache_resolution_function(
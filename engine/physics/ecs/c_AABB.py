@@ -36,3 +36,14 @@ class AABBColliderComponent(interact.ShapeComponent):
 
     def debug(self):
         pygame.draw.rect(consts.W_FRAMEBUFFER, (255, 0, 255), self._rect, 1)
+
+    # ------------------------------------------------------------------------ #
+    # streaming (see chunkstore)
+    # ------------------------------------------------------------------------ #
+
+    def __serialize__(self) -> dict:
+        return {"width": self._rect.width, "height": self._rect.height}
+
+    @classmethod
+    def __deserialize__(cls, data: dict):
+        return cls(data["width"], data["height"])
@@ -41,3 +41,22 @@ class SoraBox2DColliderComponent(interact.ShapeComponent):
 
     def debug(self):
         pygame.draw.rect(consts.W_FRAMEBUFFER, (255, 0, 255), self._rect, 1)
+
+    # ------------------------------------------------------------------------ #
+    # streaming (see chunkstore)
+    # ------------------------------------------------------------------------ #
+
+    def __serialize__(self) -> dict:
+        return {
+            "width": self._width,
+            "height": self._height,
+            "collision_conserve_coef": self._collision_conserve_coef,
+        }
+
+    @classmethod
+    def __deserialize__(cls, data: dict):
+        return cls(
+            data["width"],
+            data["height"],
+            collision_conserve_coef=data["collision_conserve_coef"],
+        )
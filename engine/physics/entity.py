@@ -30,6 +30,7 @@ class Entity:
 
         # component handler
         self._components: dict[int, ecs.Component] = {}
+        self._component_cache = {}
 
         # basic information
         self._prev_position = pygame.Vector2()
@@ -40,6 +41,9 @@ class Entity:
         self._zlayer = zlayer
         self._alive = True
 
+        # time since the last update -- set by the chunk, outer chunks tick less often
+        self._delta_time = 0
+
         self._rect = pygame.FRect()
 
     def __post_init__(self):
@@ -60,6 +64,7 @@ class Entity:
 
     def remove_component(self, component, _reload=True):
         self._components.pop(component._uuid)
+        self._component_cache.clear()
         if not _reload:
             return
         # run post init again to update all components
@@ -67,11 +72,14 @@ class Entity:
             i.__post_init__()
 
     def get_components(self, component_class: type):
-        return [
-            component
-            for component in self._components.values()
-            if isinstance(component, component_class)
-        ]
+        # cached until the component set changes -- a tuple, so it can be shared
+        if component_class not in self._component_cache:
+            self._component_cache[component_class] = tuple(
+                component
+                for component in self._components.values()
+                if isinstance(component, component_class)
+            )
+        return self._component_cache[component_class]
 
     def get_component_by_id(self, component_id: int):
         return (
@@ -93,18 +101,61 @@ class Entity:
 
     def handle_components(self):
         for component in self._components.values():
+            # updated by a scheduler.ComponentSystem
+            if component.__class__ in component._ecs_handler._managed_classes:
+                continue
             component.update()
 
     def debug(self):
         for component in self._components.values():
             component.debug()
 
+    def mark_moved(self):
+        # call after writing `_position` directly -- chunk membership is only
+        # recalculated for entities that were marked
+        if self._world is not None:
+            self._world.mark_entity_moved(self)
+
     def clean(self):
         # kill all components
         for component in list(self._components.values()):
             self._world._gamestate._ecs.remove_component(component)
             # print(f"{consts.RUN_TIME:.5f} | REMAINING COMPS:", self._components)
 
+    # ------------------------------------------------------------------------ #
+    # streaming (see chunkstore)
+    # ------------------------------------------------------------------------ #
+
+    def can_serialize(self) -> bool:
+        # subclasses with their own state opt in by overriding the hooks
+        if type(self) is not Entity:
+            return False
+        return all(x.can_serialize() for x in self._components.values())
+
+    def __serialize__(self) -> dict:
+        return {
+            "name": self._name,
+            "position": tuple(self._position),
+            "zlayer": self._zlayer,
+            "components": [
+                (type(x), x._priority, x.__serialize__())
+                for x in self._components.values()
+            ],
+        }
+
+    @classmethod
+    def __deserialize__(cls, data: dict):
+        # components are restored once the entity is in a world
+        result = cls(name=data["name"], zlayer=data["zlayer"])
+        result._position = pygame.Vector2(data["position"])
+        return result
+
+    def restore_components(self, data: dict):
+        for component_class, priority, component_data in data.get("components", ()):
+            self.add_component(
+                component_class.__deserialize__(component_data), priority
+            )
+
     # ------------------------------------------------------------------------ #
     # special properties
     # ------------------------------------------------------------------------ #
@@ -118,6 +169,15 @@ class Entity:
     def __str__(self):
         return f"{self._name}, {self._entity_id}"
 
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = value
+        self.mark_moved()
+
     @property
     def zlayer(self):
         return self._zlayer
@@ -126,6 +186,7 @@ class Entity:
     def zlayer(self, value):
         self._prev_zlayer = self._zlayer
         self._zlayer = value
+        self.mark_moved()
 
     @property
     def alive(self):
@@ -2,13 +2,14 @@ from typing import Callable
 
 import math
 import pygame
-import itertools
 
 import engine.context as ctx
 import engine.constants as consts
 
 from engine.system import ecs
 
+from engine.physics import broadphase
+
 # ======================================================================== #
 # Interaction Field
 # ======================================================================== #
@@ -66,8 +67,15 @@ class InteractionField:
 
     """
 
-    def __init__(self, world: "World"):
+    def __init__(
+        self, world: "World", broadphase_method: "broadphase.Broadphase" = None
+    ):
         self._world = world
+        self._broadphase = (
+            broadphase_method
+            if broadphase_method is not None
+            else broadphase.SpatialHashBroadphase()
+        )
 
         print(__file__, "Physics only supports AABB objects for now")
 
@@ -85,13 +93,17 @@ class InteractionField:
             if interact._static:
                 continue
             interact._entity._position += interact._velocity * consts.DELTA_TIME
+            if interact._velocity.x or interact._velocity.y:
+                interact._entity.mark_moved()
+            if interact._shape is not None:
+                interact._shape._rect.center = interact._entity._position
 
-        # stage 1: detect
-        collisions = []
-        # TODO - optimize this later
-        # TODO - use a quadtree or something or BVL
+        # stage 1: broadphase -- static colliders are only indexed once
+        self._broadphase.update(interacts)
 
-        for i1, i2 in itertools.combinations(interacts, 2):
+        # stage 2: detect
+        collisions = []
+        for i1, i2 in self._broadphase.get_pairs():
 
             # TODO -- for SAT
             # iterate through each "line" of polygon
@@ -101,15 +113,22 @@ class InteractionField:
             # if no collision -> continue
             # all axis must "collide" for a collision to occur
 
-            # print(interacts[i1]._shape, interacts[i2]._shape)
-            manifold = self.detect_collision(interacts[i1], interacts[i2])
-            if manifold is not None:
+            manifold = self.detect_collision(i1, i2)
+            if manifold:
                 collisions.append(manifold)
 
-        # stage 2: resolve
+        # stage 3: resolve
         for manifold in collisions:
             self.resolve_collision(manifold)
 
+    def set_broadphase(self, broadphase_method: "broadphase.Broadphase"):
+        self._broadphase.clear()
+        self._broadphase = broadphase_method
+
+    def refresh_static(self, interact: "InteractionFieldComponent"):
+        # call after teleporting a static collider
+        self._broadphase.refresh(interact)
+
     def detect_collision(
         self,
         interact1: "InteractionFieldComponent",
@@ -250,6 +269,8 @@ class InteractionFieldComponent(ecs.Component):
     ):
         super().__init__()
         self._shape = shape
+        # index into the entity's shapes when no shape is given
+        self._shape_index = 0
 
         # information about interaction component
         self._collision_mask = collision_mask
@@ -266,8 +287,10 @@ class InteractionFieldComponent(ecs.Component):
         self._mass = mass if not self._static else 1e9  # default mass = 1kg
 
     def __post_init__(self):
-        if not self._shape:
-            self._shape = self._entity.get_components(ShapeComponent)[0]
+        if not self._shape and self._shape_index is not None:
+            shapes = self._entity.get_components(ShapeComponent)
+            if len(shapes) > self._shape_index:
+                self._shape = shapes[self._shape_index]
 
         # might still be None
         if self._shape is not None:
@@ -286,6 +309,42 @@ class InteractionFieldComponent(ecs.Component):
         else:
             self._collision_mask &= ~(1 << bitnumber)
 
+    # ------------------------------------------------------------------------ #
+    # streaming (see chunkstore)
+    # ------------------------------------------------------------------------ #
+
+    def __serialize__(self) -> dict:
+        # the shape is found again in __post_init__ -- by its index in the entity
+        shapes = self._entity.get_components(ShapeComponent)
+        return {
+            "shape": shapes.index(self._shape) if self._shape in shapes else None,
+            "collision_mask": self._collision_mask,
+            "restitution": self._restitution,
+            "static_friction": self._static_friction,
+            "dynamic_friction": self._dynamic_friction,
+            "mass": self._mass,
+            "static": self._static,
+            "velocity": tuple(self._velocity),
+            "rotation": self._rotation,
+            "rotation_velocity": self._rotation_velocity,
+        }
+
+    @classmethod
+    def __deserialize__(cls, data: dict):
+        result = cls(
+            collision_mask=data["collision_mask"],
+            restitution=data["restitution"],
+            static_friction=data["static_friction"],
+            dynamic_friction=data["dynamic_friction"],
+            mass=data["mass"],
+            static=data["static"],
+        )
+        result._shape_index = data["shape"]
+        result._velocity.xy = data["velocity"]
+        result._rotation = data["rotation"]
+        result._rotation_velocity = data["rotation_velocity"]
+        return result
+
 
 # ======================================================================== #
 # Shape Component
@@ -148,8 +148,8 @@ class AnimationRegister:
     # logic
     # ------------------------------------------------------------------------ #
 
-    def update(self):
-        self._delta_time += consts.DELTA_TIME
+    def update(self, delta_time: float = None):
+        self._delta_time += consts.DELTA_TIME if delta_time is None else delta_time
         if self._delta_time > self.get_current_sprite_duration():
             self._current_frame += 1
             if self._current_frame >= len(self._animation._sprites):
@@ -178,25 +178,55 @@ class AnimatedSpriteComponent(ecs.Component):
         self._animation = animation
         self._register = animation.get_register()
         self._target_comp = target
+        # index into the entity's sprites when no target is given
+        self._target_index = 0
 
     def __post_init__(self):
         if self._target_comp is not None:
             self._target_comp._image = self._register.get_current_sprite().get_image()
         else:
             # try to find a sprite component in the entity
-            for comp in self._entity._components.values():
-                if isinstance(comp, c_sprite.SpriteComponent):
-                    self._target_comp = comp
-                    break
+            sprites = self._entity.get_components(c_sprite.SpriteComponent)
+            if len(sprites) > self._target_index:
+                self._target_comp = sprites[self._target_index]
 
     # ------------------------------------------------------------------------ #
     # logic
     # ------------------------------------------------------------------------ #
 
     def update(self):
-        self._register.update()
+        self._register.update(self._entity._delta_time)
         if self._target_comp is not None:
             self._target_comp._image = self._register.get_current_sprite().get_image()
             self._target_comp._rect.size = (
                 self._target_comp._image.get_size()
             )  # update rect size.
+
+    # ------------------------------------------------------------------------ #
+    # streaming (see chunkstore)
+    # ------------------------------------------------------------------------ #
+
+    def can_serialize(self) -> bool:
+        # only animations loaded from a json file can be loaded again
+        return self._animation._filepath.endswith(".json")
+
+    def __serialize__(self) -> dict:
+        sprites = self._entity.get_components(c_sprite.SpriteComponent)
+        return {
+            "animation": self._animation._filepath,
+            "frame": self._register._current_frame,
+            "time": self._register._delta_time,
+            "target": (
+                sprites.index(self._target_comp)
+                if self._target_comp in sprites
+                else self._target_index
+            ),
+        }
+
+    @classmethod
+    def __deserialize__(cls, data: dict):
+        result = cls(Animation.from_json(data["animation"]))
+        result._register._current_frame = data["frame"]
+        result._register._delta_time = data["time"]
+        result._target_index = data["target"]
+        return result
@@ -0,0 +1,237 @@
+import os
+import hashlib
+import collections
+
+import numpy as np
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.system import jobs
+
+"""
+Procedural chunk generation
+
+Fills chunks with tile + height data built from fractal opensimplex noise.
+- the whole chunk area is sampled at once (one sample per tile) with
+  `noise2array` -- numba accelerates it when installed
+- generation runs on the job system's worker pool, the main thread only
+  picks up finished results in `poll()`
+- results are memoised by (seed, chunk position) -- an in memory lru in
+  front of a disk cache, so revisited + previously generated chunks are free
+
+Chunks are sampled in world tile coordinates, so neighbouring chunks line up
+without seams.
+"""
+
+TILE_WATER = 0
+TILE_SAND = 1
+TILE_GRASS = 2
+TILE_ROCK = 3
+
+# height thresholds between the tile types -- heights are in [-1, 1]
+TILE_THRESHOLDS = (-0.1, 0.0, 0.45)
+
+CHUNK_DATA_SUFFIX = ".npz"
+
+
+# ======================================================================== #
+# Chunk Data
+# ======================================================================== #
+
+
+class ChunkData:
+    def __init__(self, chunk_position: tuple, tiles: np.ndarray, heights: np.ndarray):
+        self._chunk_position = chunk_position
+        # (tile rows, tile columns)
+        self._tiles = tiles
+        self._heights = heights
+
+    def get_tiles(self) -> np.ndarray:
+        return self._tiles
+
+    def get_heights(self) -> np.ndarray:
+        return self._heights
+
+
+# ======================================================================== #
+# Chunk Generator
+# ======================================================================== #
+
+
+class ChunkGenerator:
+    def __init__(
+        self,
+        seed: int = consts.DEFAULT_WORLD_SEED,
+        tile_size: int = consts.DEFAULT_CHUNK_TILE_SIZE,
+        scale: float = 32.0,
+        octaves: int = 4,
+        persistence: float = 0.5,
+        lacunarity: float = 2.0,
+        cache_size: int = consts.DEFAULT_CHUNK_GEN_CACHE_SIZE,
+        cache_folder: str = consts.DEFAULT_CHUNK_GEN_FOLDER,
+        run_type: str = jobs.TYPE_MULTIPROCESSING,
+    ):
+        """
+        scale: tiles per noise unit -- larger = smoother terrain
+        run_type: job system run type used for generation
+        """
+        self._seed = seed
+        self._run_type = run_type
+        self._params = (
+            seed,
+            consts.DEFAULT_CHUNK_PIXEL_WIDTH // tile_size,
+            consts.DEFAULT_CHUNK_PIXEL_HEIGHT // tile_size,
+            scale,
+            octaves,
+            persistence,
+            lacunarity,
+        )
+
+        # disk cache -- one folder per parameter set, so changed settings never
+        # read stale terrain
+        signature = hashlib.sha1(repr(self._params).encode()).hexdigest()[:8]
+        self._cache_folder = (
+            os.path.join(cache_folder, f"{seed}-{signature}") if cache_folder else None
+        )
+
+        # chunk position -> ChunkData
+        self._cache = collections.OrderedDict()
+        self._cache_size = cache_size
+
+        # chunk position -> Job
+        self._pending = {}
+        # chunk position -> chunks waiting for the data
+        self._waiting = {}
+
+        # called with (chunk, data) when a chunk receives its data
+        self._on_generate = None
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def request(self, chunk: "Chunk"):
+        # gives the chunk its data now if cached, otherwise once `poll` sees it
+        position = get_position_key(chunk._chunk_position)
+        data = self.get_cached(position)
+        if data is not None:
+            self.apply(chunk, data)
+            return
+        self._waiting.setdefault(position, []).append(chunk)
+        self.prefetch(position)
+
+    def prefetch(self, chunk_position: tuple):
+        # warm the cache without a chunk
+        position = get_position_key(chunk_position)
+        if position in self._cache or position in self._pending:
+            return
+        self._pending[position] = consts.CTX_JOB_SYSTEM.submit(
+            load_or_generate,
+            self._cache_folder,
+            position,
+            self._params,
+            run_type=self._run_type,
+            name=f"chunkgen-{position}",
+        )
+
+    def poll(self):
+        # hand out every finished result -- never blocks
+        if not self._pending:
+            return
+        finished = [key for key, job in self._pending.items() if job.done()]
+        for position in finished:
+            tiles, heights = self._pending.pop(position).result()
+            data = ChunkData(position, tiles, heights)
+            self.cache(position, data)
+            for chunk in self._waiting.pop(position, ()):
+                self.apply(chunk, data)
+
+    def apply(self, chunk: "Chunk", data: ChunkData):
+        chunk._terrain = data
+        if self._on_generate:
+            self._on_generate(chunk, data)
+
+    def cache(self, position: tuple, data: ChunkData):
+        self._cache[position] = data
+        self._cache.move_to_end(position)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def get_cached(self, position: tuple):
+        data = self._cache.get(position)
+        if data is not None:
+            self._cache.move_to_end(position)
+        return data
+
+    def set_on_generate(self, func):
+        self._on_generate = func
+
+    def get_pending_count(self) -> int:
+        return len(self._pending)
+
+
+# ======================================================================== #
+# worker functions -- module level so process pools can pickle them
+# ======================================================================== #
+
+
+def load_or_generate(cache_folder: str, chunk_position: tuple, params: tuple):
+    path = None
+    if cache_folder:
+        path = os.path.join(
+            cache_folder,
+            f"{chunk_position[0]}_{chunk_position[1]}{CHUNK_DATA_SUFFIX}",
+        )
+        if os.path.exists(path):
+            with np.load(path) as f:
+                return f["tiles"], f["heights"]
+
+    tiles, heights = generate_chunk(chunk_position, *params)
+
+    if path:
+        os.makedirs(cache_folder, exist_ok=True)
+        # written under a temp name -- a reader never sees a half written file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, tiles=tiles, heights=heights)
+        os.replace(temp_path, path)
+    return tiles, heights
+
+
+def generate_chunk(
+    chunk_position: tuple,
+    seed: int,
+    columns: int,
+    rows: int,
+    scale: float,
+    octaves: int,
+    persistence: float,
+    lacunarity: float,
+):
+    import opensimplex
+
+    noise = opensimplex.OpenSimplex(seed)
+
+    # world tile coordinates of every tile in the chunk
+    xs = (chunk_position[0] * columns + np.arange(columns, dtype="float64")) / scale
+    ys = (chunk_position[1] * rows + np.arange(rows, dtype="float64")) / scale
+
+    # fractal noise -- every octave is one vectorised call over the whole chunk
+    heights = np.zeros((rows, columns), dtype="float64")
+    amplitude = 1.0
+    frequency = 1.0
+    total = 0.0
+    for _ in range(octaves):
+        heights += noise.noise2array(xs * frequency, ys * frequency) * amplitude
+        total += amplitude
+        amplitude *= persistence
+        frequency *= lacunarity
+    heights = (heights / total).astype("float32")
+
+    tiles = np.digitize(heights, TILE_THRESHOLDS).astype("uint8")
+    return tiles, heights
+
+
+def get_position_key(chunk_position: tuple) -> tuple:
+    return (int(chunk_position[0]), int(chunk_position[1]))
@@ -0,0 +1,140 @@
+import os
+import pickle
+import concurrent.futures
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.system import jobs
+
+"""
+Chunk store
+
+Pages chunks that are far away from the camera out to disk + back in.
+- one file per chunk -- <folder>/<world name>/<zlayer>_<x>_<y>.chunk
+- all file io runs on a single background io thread, so a load queued after
+  a write of the same chunk always reads the written data
+- the main thread only snapshots entities (evict) + rebuilds them (load),
+  finished loads are picked up with `poll()` -- it never waits on a file
+
+Only entities that can be serialized are paged out (`Entity.can_serialize`):
+    def __serialize__(self) -> dict
+    @classmethod
+    def __deserialize__(cls, data: dict) -> Entity
+Plain entities serialize their components with the same pair of hooks. A
+chunk holding any other entity stays in memory.
+
+The store is a cache for the running session -- the world calls `clear()`
+when it is cleaned, files are never read back across runs.
+"""
+
+CHUNK_FILE_SUFFIX = ".chunk"
+
+
+# ======================================================================== #
+# Chunk Store
+# ======================================================================== #
+
+
+class ChunkStore:
+    def __init__(self, name: str, folder: str = consts.DEFAULT_CHUNK_STORE_FOLDER):
+        self._folder = os.path.join(folder, name)
+
+        # created on first use -- worlds that never page pay nothing
+        self._executor = None
+
+        # keys with data on disk (or queued to be written)
+        self._stored = set()
+        # key -> Job
+        self._pending_loads = {}
+
+    def __on_clean__(self):
+        # finish outstanding writes so nothing is left half written
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending_loads.clear()
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def save(self, key: tuple, data: list):
+        self._stored.add(key)
+        self.submit(self._write, key, data)
+
+    def load(self, key: tuple) -> jobs.Job:
+        # the chunk file is removed once it has been read
+        if key in self._pending_loads:
+            return self._pending_loads[key]
+        job = self.submit(self._read, key)
+        self._pending_loads[key] = job
+        return job
+
+    def poll(self) -> list:
+        # [(key, data)] for every load that finished -- never blocks
+        if not self._pending_loads:
+            return []
+        finished = [key for key, job in self._pending_loads.items() if job.done()]
+        result = []
+        for key in finished:
+            job = self._pending_loads.pop(key)
+            self._stored.discard(key)
+            result.append((key, job.result()))
+        return result
+
+    def clear(self):
+        # removes every chunk file of this world -- call after `__on_clean__`
+        self._stored.clear()
+        if not os.path.isdir(self._folder):
+            return
+        for file in os.listdir(self._folder):
+            if file.endswith(CHUNK_FILE_SUFFIX):
+                os.remove(os.path.join(self._folder, file))
+
+    def submit(self, func, *args) -> jobs.Job:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"{consts.ENGINE_NAME}-chunk-io"
+            )
+        return jobs.Job(func.__name__, self._executor.submit(func, *args))
+
+    # ------------------------------------------------------------------------ #
+    # io thread
+    # ------------------------------------------------------------------------ #
+
+    def _write(self, key: tuple, data: list):
+        os.makedirs(self._folder, exist_ok=True)
+        path = self.get_path(key)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    def _read(self, key: tuple) -> list:
+        path = self.get_path(key)
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        os.remove(path)
+        return data
+
+    # ------------------------------------------------------------------------ #
+    # getters
+    # ------------------------------------------------------------------------ #
+
+    def get_path(self, key: tuple) -> str:
+        return os.path.join(
+            self._folder, f"{key[0]}_{key[1]}_{key[2]}{CHUNK_FILE_SUFFIX}"
+        )
+
+    def has_chunk(self, key: tuple) -> bool:
+        return key in self._stored
+
+    def is_loading(self, key: tuple) -> bool:
+        return key in self._pending_loads
+
+    def get_stored_count(self) -> int:
+        return len(self._stored)
+
+
+def get_key(zlayer: int, chunk_position: tuple) -> tuple:
+    return (zlayer, int(chunk_position[0]), int(chunk_position[1]))
@@ -3,6 +3,8 @@ from abc import ABC, abstractmethod
 import engine.context as ctx
 import engine.constants as consts
 
+from engine.system import scheduler
+
 # ======================================================================== #
 # aspect component handler
 # ======================================================================== #
@@ -15,6 +17,15 @@ class ECSHandler:
         # ecs management
         self._components = {}
 
+        # cached queries -- (include, exclude) -> query
+        self._queries = {}
+        self._query_index = {}
+
+        # systems -- run once per frame by the world
+        self._scheduler = scheduler.SystemScheduler(self)
+        # component classes updated by a ComponentSystem instead of their entity
+        self._managed_classes = set()
+
         # gamestate parent
         self._gamestate = None
 
@@ -22,6 +33,7 @@ class ECSHandler:
         pass
 
     def __on_clean__(self):
+        self._scheduler.__on_clean__()
         for component_class in self._components:
             for component in self._components[component_class].values():
                 component.__on_clean__()
@@ -45,7 +57,9 @@ class ECSHandler:
         component._uuid = self.generate_component_uuid()
         component._ecs_handler = self
         component._entity = entity
+        last = next(reversed(entity._components.values()), None)
         entity._components[component._uuid] = component
+        entity._component_cache.clear()
         component.__post_init__()
 
         # create section for component if not exists
@@ -54,13 +68,18 @@ class ECSHandler:
         self._components[component.__class__][component._uuid] = component
 
         # sort entity components by priority
-        entity._components = dict(
-            sorted(
-                entity._components.items(),
-                key=lambda x: x[1]._priority,
-                reverse=True,
+        # only required if the new component doesn't belong at the end
+        if last is not None and component._priority > last._priority:
+            entity._components = dict(
+                sorted(
+                    entity._components.items(),
+                    key=lambda x: x[1]._priority,
+                    reverse=True,
+                )
             )
-        )
+            entity._component_cache.clear()
+
+        self._update_queries(component, entity)
 
         return component
 
@@ -76,19 +95,145 @@ class ECSHandler:
         )
         # remove from entity as well
         component._entity.remove_component(component, _reload=False)
+        component.__on_remove__()
 
         # remove component from the cache
         del self._components[component.__class__][component._uuid]
 
+        self._update_queries(component, component._entity)
+
     def iterate_components(self, component_class: type):
-        for component in self._components[component_class].values():
+        for component in self._components.get(component_class, {}).values():
             yield component
 
     def get_component(self, component_class: type, uuid):
         return self._components[component_class][uuid]
 
     def get_components(self, component_class: type) -> dict:
-        return self._components[component_class]
+        # empty if no component of the class was ever added
+        return self._components.get(component_class, {})
+
+    # -------------------------------------------------------------------- #
+    # system logic
+    # -------------------------------------------------------------------- #
+
+    def add_system(self, system: "scheduler.System"):
+        return self._scheduler.add_system(system)
+
+    def remove_system(self, name: str):
+        self._scheduler.remove_system(name)
+
+    def run_systems(self):
+        self._scheduler.update()
+
+    # -------------------------------------------------------------------- #
+    # query logic
+    # -------------------------------------------------------------------- #
+
+    def query(self, *component_classes: type, without: tuple = ()) -> list:
+        """
+        Returns a list of (entity, component_a, component_b, ...) tuples
+        for every entity that has all `component_classes` and none of `without`.
+
+        ecs.query(SpriteComponent, SpriteRendererComponent, without=MeshComponent)
+
+        Results are cached + kept up to date by add_component / remove_component.
+        """
+        return self.get_query(*component_classes, without=without).get_results()
+
+    def get_query(self, *component_classes: type, without: tuple = ()) -> "Query":
+        if not component_classes:
+            raise ValueError("A query needs at least one component class")
+        if isinstance(without, type):
+            without = (without,)
+        for component_class in component_classes + tuple(without):
+            if not isinstance(component_class, type):
+                raise TypeError(f"Query entry {component_class!r} is not a class")
+        key = (component_classes, tuple(without))
+        if key in self._queries:
+            return self._queries[key]
+
+        # create + index the query
+        query = Query(component_classes, tuple(without))
+        self._queries[key] = query
+        for component_class in component_classes + query._exclude:
+            self._query_index.setdefault(component_class, []).append(query)
+
+        # stage 1: fill with existing entities
+        entities = {}
+        for component_class, components in self._components.items():
+            if not issubclass(component_class, component_classes[0]):
+                continue
+            for component in components.values():
+                entities[component._entity._entity_id] = component._entity
+        for entity in entities.values():
+            query.refresh(entity)
+
+        return query
+
+    def _update_queries(self, component, entity):
+        if not self._query_index:
+            return
+        for component_class in component.__class__.__mro__:
+            for query in self._query_index.get(component_class, ()):
+                query.refresh(entity)
+
+
+# ======================================================================== #
+# query
+# ======================================================================== #
+
+
+class Query:
+    def __init__(self, include: tuple, exclude: tuple = ()):
+        self._include = include
+        self._exclude = exclude
+
+        # entity id -> (entity, *components)
+        self._results = {}
+        self._result_list = []
+        self._dirty = False
+
+    # -------------------------------------------------------------------- #
+    # logic
+    # -------------------------------------------------------------------- #
+
+    def refresh(self, entity):
+        result = self.match(entity)
+        if result is None:
+            if self._results.pop(entity._entity_id, None) is not None:
+                self._dirty = True
+            return
+        if self._results.get(entity._entity_id) != result:
+            self._results[entity._entity_id] = result
+            self._dirty = True
+
+    def match(self, entity):
+        # first component of each class (in priority order) -- or None
+        found = [None] * len(self._include)
+        for component in entity._components.values():
+            for component_class in self._exclude:
+                if isinstance(component, component_class):
+                    return None
+            for i, component_class in enumerate(self._include):
+                if found[i] is None and isinstance(component, component_class):
+                    found[i] = component
+        if None in found:
+            return None
+        return (entity, *found)
+
+    def get_results(self) -> list:
+        # only rebuilt when the result set changed
+        if self._dirty:
+            self._result_list = list(self._results.values())
+            self._dirty = False
+        return self._result_list
+
+    def __len__(self):
+        return len(self._results)
+
+    def __iter__(self):
+        return iter(self.get_results())
 
 
 # ======================================================================== #
@@ -114,6 +259,11 @@ class Component:
     def __on_clean__(self):
         pass
 
+    def __on_remove__(self):
+        # removed from a live entity -- only release what this component owns,
+        # shared resources are released by their owner in `__on_clean__`
+        pass
+
     # -------------------------------------------------------------------- #
     # logic
     # -------------------------------------------------------------------- #
@@ -125,3 +275,11 @@ class Component:
     @abstractmethod
     def debug(self):
         pass
+
+    # -------------------------------------------------------------------- #
+    # streaming (see chunkstore)
+    # -------------------------------------------------------------------- #
+
+    def can_serialize(self) -> bool:
+        # components opt in with `__serialize__` + a `__deserialize__` classmethod
+        return hasattr(self, "__serialize__")
@@ -3,7 +3,6 @@ import engine.constants as consts
 
 from engine.system import world, ecs
 
-
 # ======================================================================== #
 # Game State
 # ======================================================================== #
@@ -0,0 +1,151 @@
+import os
+import asyncio
+import threading
+import concurrent.futures
+
+from typing import Callable
+
+import engine.context as ctx
+import engine.constants as consts
+
+"""
+Job system
+
+Runs work off of the main thread + hands back a `Job` that frame code can wait on.
+- threads -- numpy heavy work (numpy releases the gil)
+- coroutines -- a single asyncio loop running on a background thread
+- multiprocessing -- pure data jobs, func + args must be picklable
+
+Pools are created lazily, so unused run types cost nothing.
+"""
+
+TYPE_THREAD = "thread"
+TYPE_COROUTINE = "coroutine"
+TYPE_MULTIPROCESSING = "multiprocessing"
+
+
+# ======================================================================== #
+# Job
+# ======================================================================== #
+
+
+class Job:
+    def __init__(self, name: str, future: concurrent.futures.Future):
+        self._name = name
+        self._future = future
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def wait(self, timeout: float = None):
+        # blocks + re-raises any exception from the job
+        return self._future.result(timeout=timeout)
+
+    def result(self):
+        return self._future.result()
+
+    def cancel(self) -> bool:
+        return self._future.cancel()
+
+    def __str__(self):
+        return f"Job({self._name}, done={self.done()})"
+
+
+# ======================================================================== #
+# Job System
+# ======================================================================== #
+
+
+class JobSystem:
+    def __init__(
+        self,
+        thread_workers: int = consts.DEFAULT_JOB_THREAD_WORKERS,
+        process_workers: int = consts.DEFAULT_JOB_PROCESS_WORKERS,
+    ):
+        self._thread_workers = thread_workers or min(8, (os.cpu_count() or 1) + 4)
+        self._process_workers = process_workers or max(1, (os.cpu_count() or 2) - 1)
+
+        self._thread_pool = None
+        self._process_pool = None
+
+        # coroutine loop
+        self._loop = None
+        self._loop_thread = None
+
+    def __on_clean__(self):
+        print(f"{consts.RUN_TIME:.5f} | ---- CLEANING JOB SYSTEM ----")
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=True, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def submit(
+        self, func: Callable, *args, run_type: str = TYPE_THREAD, name: str = None
+    ) -> Job:
+        name = name if name else getattr(func, "__name__", "job")
+
+        if run_type == TYPE_THREAD:
+            future = self.get_thread_pool().submit(func, *args)
+        elif run_type == TYPE_MULTIPROCESSING:
+            future = self.get_process_pool().submit(func, *args)
+        elif run_type == TYPE_COROUTINE:
+            future = asyncio.run_coroutine_threadsafe(func(*args), self.get_loop())
+        else:
+            raise ValueError(f"Unknown job run type: {run_type}")
+
+        return Job(name, future)
+
+    def map(self, func: Callable, iterable, run_type: str = TYPE_THREAD) -> list:
+        return [self.submit(func, *args, run_type=run_type) for args in iterable]
+
+    def wait_all(self, jobs: list) -> list:
+        return [job.wait() for job in jobs]
+
+    # ------------------------------------------------------------------------ #
+    # pools
+    # ------------------------------------------------------------------------ #
+
+    def get_thread_pool(self):
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._thread_workers,
+                thread_name_prefix=f"{consts.ENGINE_NAME}-job",
+            )
+        return self._thread_pool
+
+    def get_process_pool(self):
+        # NOTE: on spawn platforms the entry script must be import safe
+        if self._process_pool is None:
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._process_workers
+            )
+        return self._process_pool
+
+    def get_loop(self):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever,
+                name=f"{consts.ENGINE_NAME}-coroutines",
+                daemon=True,
+            )
+            self._loop_thread.start()
+        return self._loop
+
+    def get_thread_worker_count(self) -> int:
+        return self._thread_workers
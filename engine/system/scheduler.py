@@ -0,0 +1,241 @@
+from typing import Callable
+
+import engine.context as ctx
+import engine.constants as consts
+
+"""
+Systems
+
+A system is a function that runs once per frame over every match of a query.
+- replaces the per-entity `component.update()` walk with one tight loop
+- declares which component types it reads + writes
+- systems are ordered by a dependency graph (explicit + read/write conflicts)
+- parallel=True systems run on the job system while the rest of their stage
+  runs on the main thread (never touch pygame surfaces or gl objects from a
+  parallel system)
+
+scheduler.System(
+    "integrate",
+    integrate_func,
+    query=(interact.InteractionFieldComponent,),
+    writes=(interact.InteractionFieldComponent,),
+)
+"""
+
+# ======================================================================== #
+# System
+# ======================================================================== #
+
+
+class System:
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        query: tuple = (),
+        without: tuple = (),
+        reads: tuple = (),
+        writes: tuple = (),
+        after: tuple = (),
+        before: tuple = (),
+        parallel: bool = False,
+    ):
+        self._name = name
+        self._func = func
+        self._parallel = parallel
+
+        # query that feeds the system -- func(results) receives (entity, *components)
+        self._query = tuple(query)
+        self._without = tuple(without)
+
+        # access sets -- queried components are always read
+        self._reads = frozenset(self._query) | frozenset(reads)
+        self._writes = frozenset(writes)
+
+        # explicit ordering by system name
+        self._after = tuple(after)
+        self._before = tuple(before)
+
+        self._ecs_handler = None
+
+    def __post_init__(self):
+        pass
+
+    def __on_clean__(self):
+        pass
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def run(self):
+        self._func(*self.get_args())
+
+    def get_args(self) -> tuple:
+        # queries are resolved on the main thread -- even for parallel systems
+        if self._query:
+            return (self._ecs_handler.query(*self._query, without=self._without),)
+        return ()
+
+    def conflicts_with(self, other: "System") -> bool:
+        return bool(
+            self._writes & (other._reads | other._writes) or other._writes & self._reads
+        )
+
+    def __str__(self):
+        return f"System({self._name})"
+
+
+class ComponentSystem(System):
+    """
+    Calls `update()` on every component of a type in one loop.
+
+    The component class is registered as managed on the system's ECSHandler, so
+    `Entity.handle_components` skips it during the per-entity walk. Entities
+    with more than one component of the class have all of them updated.
+    """
+
+    def __init__(
+        self,
+        component_class: type,
+        name: str = None,
+        reads: tuple = (),
+        writes: tuple = (),
+        after: tuple = (),
+        before: tuple = (),
+    ):
+        super().__init__(
+            name if name else f"{component_class.__name__}.update",
+            self._update_components,
+            reads=(component_class,) + tuple(reads),
+            writes=(component_class,) + tuple(writes),
+            after=after,
+            before=before,
+        )
+        self._component_class = component_class
+
+    def __post_init__(self):
+        self._ecs_handler._managed_classes.add(self._component_class)
+
+    def __on_clean__(self):
+        self._ecs_handler._managed_classes.discard(self._component_class)
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def _update_components(self):
+        # copied -- components may remove themselves (or others) in update
+        for component in list(
+            self._ecs_handler.iterate_components(self._component_class)
+        ):
+            component.update()
+
+
+# ======================================================================== #
+# System Scheduler
+# ======================================================================== #
+
+
+class SystemScheduler:
+    def __init__(self, ecs_handler: "ECSHandler"):
+        self._ecs_handler = ecs_handler
+
+        self._systems = {}
+        self._stages = None
+
+    def __on_clean__(self):
+        for system in self._systems.values():
+            system.__on_clean__()
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def update(self):
+        if self._stages is None:
+            self._stages = self.sort_stages()
+
+        for stage in self._stages:
+            parallel = [x for x in stage if x._parallel]
+            if not parallel or len(stage) < 2 or consts.CTX_JOB_SYSTEM is None:
+                for system in stage:
+                    system.run()
+                continue
+
+            # systems in a stage never conflict -- run them side by side
+            jobs = [
+                consts.CTX_JOB_SYSTEM.submit(x._func, *x.get_args(), name=x._name)
+                for x in parallel
+            ]
+            for system in stage:
+                if not system._parallel:
+                    system.run()
+            consts.CTX_JOB_SYSTEM.wait_all(jobs)
+
+    def add_system(self, system: System):
+        if system._name in self._systems:
+            raise ValueError(f"System `{system._name}` already registered")
+        system._ecs_handler = self._ecs_handler
+        self._systems[system._name] = system
+        system.__post_init__()
+        self._stages = None
+        return system
+
+    def remove_system(self, name: str):
+        system = self._systems.pop(name)
+        system.__on_clean__()
+        self._stages = None
+
+    def get_system(self, name: str):
+        return self._systems.get(name)
+
+    # ------------------------------------------------------------------------ #
+    # dependency graph
+    # ------------------------------------------------------------------------ #
+
+    def get_dependencies(self) -> dict:
+        # name -> set of system names that must run first
+        systems = list(self._systems.values())
+        deps = {system._name: set() for system in systems}
+
+        for system in systems:
+            for name in system._after:
+                if name in deps:
+                    deps[system._name].add(name)
+            for name in system._before:
+                if name in deps:
+                    deps[name].add(system._name)
+
+        # conflicting access -- keep registration order unless told otherwise
+        for i, s1 in enumerate(systems):
+            for s2 in systems[i + 1 :]:
+                if not s1.conflicts_with(s2):
+                    continue
+                if s2._name in deps[s1._name]:
+                    continue
+                deps[s2._name].add(s1._name)
+        return deps
+
+    def sort_stages(self) -> list:
+        # list of stages -- systems in one stage have no dependencies on each other
+        deps = self.get_dependencies()
+        stages = []
+        remaining = {name: set(d) for name, d in deps.items()}
+
+        # kahn -- registration order breaks ties
+        while remaining:
+            ready = [name for name, d in remaining.items() if not d]
+            if not ready:
+                raise Exception(
+                    f"Cyclic system dependencies: {', '.join(remaining.keys())}"
+                )
+            stages.append([self._systems[name] for name in ready])
+            for name in ready:
+                remaining.pop(name)
+            for d in remaining.values():
+                d.difference_update(ready)
+        return stages
+
+    def sort_systems(self) -> list:
+        return [system for stage in self.sort_stages() for system in stage]
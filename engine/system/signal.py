@@ -3,21 +3,66 @@ import uuid
 import engine.context as ctx
 import engine.constants as consts
 
+"""
+Signal handler
+
+Emitted signals are queued + dispatched once per frame in `handle()`.
+- packets are (signal, args) tuples stored in a preallocated ring that
+  doubles when full -- emitting never allocates a packet object
+- the signal is looked up once at emit time, signals that are not registered
+  are dropped
+- receivers are called directly from a tuple of functions that is rebuilt
+  only when a receiver is added or removed
+
+Argument types are checked against the signal's template once per emit
+(VALIDATE_EMIT), not once per receiver. Signals that carry a lot of events
+can skip the check entirely with VALIDATE_NONE.
+"""
+
+VALIDATE_NONE = "none"
+VALIDATE_EMIT = "emit"
+
+
 # ======================================================================== #
 # The Signal handler system
 # ======================================================================== #
 
 
 class SignalHandler:
-    def __init__(self):
+    def __init__(
+        self,
+        capacity: int = consts.DEFAULT_SIGNAL_QUEUE_CAPACITY,
+        validation: str = consts.DEFAULT_SIGNAL_VALIDATION,
+    ):
         self._signals = {}
-        self._signal_packet_queue = []
+        self._validation = validation
+
+        # ring of (signal, args) -- capacity is always a power of two
+        capacity = 1 << max(capacity - 1, 0).bit_length()
+        self._queue = [None] * capacity
+        self._mask = capacity - 1
+        self._head = 0
+        self._size = 0
 
     # ------------------------------------------------------------------------ #
     # logic
 
-    def register_signal(self, signal_name: str, args_template: list[type]):
-        self._signals[signal_name] = Signal(signal_name, args_template)
+    def register_signal(
+        self, signal_name: str, args_template: list[type], validation: str = None
+    ):
+        """
+        validation: VALIDATE_EMIT or VALIDATE_NONE -- the handler default if None
+        """
+        for arg_type in args_template:
+            if not isinstance(arg_type, type):
+                raise TypeError(
+                    f"Signal `{signal_name}` template entry {arg_type!r} is not a type"
+                )
+        self._signals[signal_name] = Signal(
+            signal_name,
+            args_template,
+            validation=validation if validation is not None else self._validation,
+        )
         self._signals[signal_name]._handler = self
         return self._signals[signal_name]
 
@@ -25,22 +70,48 @@ class SignalHandler:
         return self._signals[signal_name].register_receiver(function)
 
     def emit_signal(self, signal_name: str, *args):
-        self._signal_packet_queue.append(SignalPacket(signal_name, args))
+        signal = self._signals.get(signal_name)
+        if signal is None:
+            return
+        signal.emit(*args)
+
+    def push(self, signal: "Signal", args: tuple):
+        if self._size > self._mask:
+            self._grow()
+        self._queue[(self._head + self._size) & self._mask] = (signal, args)
+        self._size += 1
 
     def handle(self):
-        for packet in self._signal_packet_queue:
-            # check if is valid emitted signal
-            if packet._signal_name not in self._signals:
-                continue
-            # handle packet
-            self._signals[packet._signal_name].handle_packet(*packet.args)
-        self._signal_packet_queue = []
+        # signals emitted by receivers are handled in the same pass
+        queue = self._queue
+        while self._size:
+            signal, args = queue[self._head]
+            queue[self._head] = None
+            self._head = (self._head + 1) & self._mask
+            self._size -= 1
+            for function in signal._functions:
+                function(*args)
+            # the ring may have grown inside a receiver
+            queue = self._queue
+        self._head = 0
+
+    def _grow(self):
+        # unroll the ring into a list twice the size -- oldest packet first
+        capacity = len(self._queue)
+        queue = self._queue[self._head :] + self._queue[: self._head]
+        queue.extend([None] * capacity)
+        self._queue = queue
+        self._mask = capacity * 2 - 1
+        self._head = 0
 
     # ------------------------------------------------------------------------ #
     # getters
 
     def get_signal_queue(self):
-        return self._signal_queue
+        return [
+            SignalPacket(*self._queue[(self._head + i) & self._mask])
+            for i in range(self._size)
+        ]
 
     def get_signals(self):
         return self._signals
@@ -55,35 +126,56 @@ class SignalHandler:
 
 
 class Signal:
-    def __init__(self, signal_name: str, args_template: list[type]):
+    def __init__(
+        self,
+        signal_name: str,
+        args_template: list[type],
+        validation: str = consts.DEFAULT_SIGNAL_VALIDATION,
+    ):
         self._handler = None
         self._receivers = {}
+        # receiver functions in registration order -- what `handle` calls
+        self._functions = ()
 
         self._signal_name = signal_name
-        self._args_template = args_template
+        self._args_template = tuple(args_template)
+        self._validation = validation
 
     # ------------------------------------------------------------------------ #
     # logic
 
     def register_receiver(self, function: "function"):
+        if not callable(function):
+            raise TypeError(f"Signal `{self._signal_name}` receiver is not callable")
         receiver = SignalReceiver(function)
         receiver._handler = self
         self._receivers[receiver._id] = receiver
+        self._functions += (function,)
         return receiver
 
+    def remove_receiver(self, receiver: "SignalReceiver"):
+        if self._receivers.pop(receiver._id, None) is not None:
+            self._functions = tuple(r._function for r in self._receivers.values())
+
     def emit(self, *args):
         if self._handler is None:
             raise Exception("Signal handler not set")
-        self._handler.emit_signal(self._signal_name, *args)
+        if self._validation == VALIDATE_EMIT:
+            self.validate(args)
+        self._handler.push(self, args)
+
+    def validate(self, args: tuple):
+        if len(args) < len(self._args_template):
+            raise Exception(f"Invalid argument count for signal `{self._signal_name}`")
+        for arg, arg_type in zip(args, self._args_template):
+            if type(arg) != arg_type:
+                raise Exception(
+                    f"Invalid argument type for signal `{self._signal_name}`"
+                )
 
     def handle_packet(self, *args):
-        for key, receiver in self._receivers.items():
-            print(
-                f"{consts.RUN_TIME:.5f} | EMITTING",
-                self._signal_name,
-                receiver._function,
-            )
-            receiver.emit_signal(*args)
+        for function in self._functions:
+            function(*args)
 
 
 # ======================================================================== #
@@ -102,10 +194,7 @@ class SignalReceiver:
     # logic
 
     def emit_signal(self, *args):
-        # check if args are valid
-        for i in range(len(self._handler._args_template)):
-            if type(args[i]) != self._handler._args_template[i]:
-                raise Exception("Invalid argument type")
+        # direct call -- arguments are validated once when the signal is emitted
         self._function(*args)
 
 
@@ -115,8 +204,8 @@ class SignalReceiver:
 
 
 class SignalPacket:
-    def __init__(self, signal_name: str, args: list[any]):
-        self._signal_name = signal_name
+    def __init__(self, signal: "Signal", args: tuple):
+        self._signal_name = signal._signal_name
         self.args = args
 
     def __repr__(self):
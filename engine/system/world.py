@@ -1,3 +1,4 @@
+import math
 import pygame
 
 import Box2D
@@ -6,12 +7,22 @@ from Box2D import b2
 import engine.context as ctx
 import engine.constants as consts
 
-from engine.ecs import c_task
+from engine.ecs import c_sprite
+
+from engine.system import chunkstore
 
 from engine.graphics import camera
 
 from engine.physics import entity
 from engine.physics import interact
+from engine.physics import aabbtree
+
+STORAGE_DICT = "dict"
+STORAGE_GRID = "grid"
+
+# chunk ids pack both chunk coordinates into one int -- 32 bits each
+CHUNK_KEY_OFFSET = 1 << 31
+CHUNK_KEY_MASK = (1 << 32) - 1
 
 # ======================================================================== #
 # World
@@ -38,37 +49,49 @@ class World2D(entity.Entity):
 
         # rendering information
         self._render_chunk_cache = set()
-        self._camera = camera.Camera2D(render_distance=4)
+        self._camera = camera.Camera2D(
+            render_distance=consts.DEFAULT_CHUNK_RENDER_DISTANCE,
+            simulation_distance=consts.DEFAULT_CHUNK_SIMULATION_DISTANCE,
+        )
+
+        # chunk activation -- chunk id -> (tick interval, tick phase)
+        # only rebuilt when the camera moves into another chunk
+        self._active_chunks = {}
+        self._camera_chunk_pos = None
+        self._frame = 0
+
+        # chunk streaming -- far away chunks are paged out to disk
+        self._chunk_store = chunkstore.ChunkStore(name)
         self._physics_pos_steps = _physics_pos_steps
         self._physics_vel_steps = _physics_vel_steps
 
         # entity management - entities are just "container" objects
         self._entities = {}
         self._delta_entities = []
+        # entities marked with `Entity.mark_moved` since the last chunk update
+        self._moved_entities = {}
 
         # gamestate + interaction field parents
         self._interaction_field = interact.InteractionField(self)
+        self._collider_tree = aabbtree.AABBTree()
         self._gamestate = None
 
-    def __post_init__(self):
-        # default task for the aspect handler
-        self._entity_chunk_change_task = c_task.TaskComponent(
-            f"_{consts.ENGINE_NAME}_entity_chunk_change_task",
-            self._entity_chunk_change_task,
-        )
-        consts.CTX_ECS_HANDLER.add_component(self._entity_chunk_change_task, self)
-
     def __on_clean__(self):
-        pass
+        # paged out chunks only live for the session
+        self._chunk_store.__on_clean__()
+        self._chunk_store.clear()
 
     # ------------------------------------------------------------------------ #
     # logic
     # ------------------------------------------------------------------------ #
 
     def update(self):
+        self._frame += 1
+        self._update_active_chunks()
+        self._load_streamed_chunks()
 
-        # TODO - check if camera moved chunks
-        self._render_chunk_cache = set(self._camera.generate_visible_chunks())
+        # systems run once over all of their components
+        self._gamestate._ecs.run_systems()
 
         # update all layers
         for layer_index in self._layers_order:
@@ -76,6 +99,9 @@ class World2D(entity.Entity):
 
         # physics
         self._interaction_field.update()
+        self._update_collider_tree()
+        # after everything that moves entities this frame -- clears the moved set
+        self._entity_chunk_change_task()
         self._physics_world.Step(
             consts.DELTA_TIME, self._physics_vel_steps, self._physics_pos_steps
         )
@@ -92,28 +118,125 @@ class World2D(entity.Entity):
             self._entities.pop(entity._entity_id)
         self._delta_entities.clear()
 
+    def _update_collider_tree(self):
+        # only colliders of entities that moved are refitted -- see Entity.mark_moved
+        self._collider_tree.sync(
+            self.get_components(interact.InteractionFieldComponent)
+        )
+        for moved in self._moved_entities.values():
+            for collider in moved.get_components(interact.InteractionFieldComponent):
+                self._collider_tree.move(collider)
+
+    def _update_active_chunks(self):
+        chunk_pos = self._camera.get_chunk_position()
+        if chunk_pos == self._camera_chunk_pos:
+            return
+        self._camera_chunk_pos = chunk_pos
+
+        self._render_chunk_cache.clear()
+        self._active_chunks.clear()
+        interval = consts.DEFAULT_CHUNK_OUTER_TICK_INTERVAL
+        for position, inner in self._camera.generate_active_chunks():
+            self._render_chunk_cache.add(position)
+            if inner:
+                self._active_chunks[Chunk.get_id(position)] = (1, 0)
+            else:
+                # stagger the outer rings so they do not all tick on the same frame
+                phase = int(position[0] + position[1]) % interval
+                self._active_chunks[Chunk.get_id(position)] = (interval, phase)
+        self._stream_chunks(chunk_pos)
+
+    def _stream_chunks(self, center: tuple):
+        load_distance = consts.DEFAULT_CHUNK_LOAD_DISTANCE
+        load_area = [
+            (x, y)
+            for x in range(center[0] - load_distance, center[0] + load_distance + 1)
+            for y in range(center[1] - load_distance, center[1] + load_distance + 1)
+        ]
+
+        # generated layers create their chunks ahead of the camera -- the
+        # terrain is built in the background + arrives a few frames later
+        for layer in self._layers.values():
+            if layer._generator is None:
+                continue
+            for position in load_area:
+                layer.get_chunk(position)
+
+        # page out chunks past the evict distance
+        evict_distance = consts.DEFAULT_CHUNK_EVICT_DISTANCE
+        for layer in self._layers.values():
+            for chunk in list(layer._chunks.values()):
+                position = chunk._chunk_position
+                distance = max(
+                    abs(position[0] - center[0]), abs(position[1] - center[1])
+                )
+                if distance > evict_distance and chunk.can_stream():
+                    self.evict_chunk(layer, chunk)
+
+        # request stored chunks inside the load distance -- read in the background
+        store = self._chunk_store
+        if not store.get_stored_count():
+            return
+        for zlayer in self._layers:
+            for position in load_area:
+                key = chunkstore.get_key(zlayer, position)
+                if store.has_chunk(key) and not store.is_loading(key):
+                    store.load(key)
+
+    def _load_streamed_chunks(self):
+        # rebuild the entities of chunks that finished loading
+        for key, data in self._chunk_store.poll():
+            for entity_class, entity_data in data:
+                entity = self.add_entity(entity_class.__deserialize__(entity_data))
+                entity.restore_components(entity_data)
+
+    def evict_chunk(self, layer: "Layer", chunk: "Chunk"):
+        # empty chunks are dropped without touching the disk
+        data = chunk.serialize()
+        if data:
+            self._chunk_store.save(
+                chunkstore.get_key(layer._zlevel, chunk._chunk_position), data
+            )
+        for entity in list(chunk._entities.values()):
+            self._entities.pop(entity._entity_id, None)
+            self._moved_entities.pop(entity._entity_id, None)
+            entity.clean()
+        chunk.clean()
+        layer.drop_chunk(chunk)
+
     def _entity_chunk_change_task(self):
-        for entity in self._entities.values():
+        # only entities that moved since the last frame are checked
+        if not self._moved_entities:
+            return
+
+        for entity in self._moved_entities.values():
+            if not entity._alive or entity._entity_id not in self._entities:
+                continue
 
             # calculate new chunk
-            entity._chunk_pos = (
-                int(entity._position.x // consts.DEFAULT_CHUNK_PIXEL_WIDTH),
-                int(entity._position.y // consts.DEFAULT_CHUNK_PIXEL_HEIGHT),
-            )
+            entity._chunk_pos = get_chunk_position(entity._position)
 
             # check if entity moved chunks
-            if entity._chunk_pos != entity._prev_chunk_pos:
+            if (
+                entity._chunk_pos != entity._prev_chunk_pos
+                or entity._zlayer != entity._prev_zlayer
+            ):
                 # remove entity from old chunk
                 self.get_chunk(
                     entity._prev_chunk_pos, entity._prev_zlayer
                 ).remove_not_clean(entity)
                 # add entity to new chunk
+                entity._layer = self.get_layer(entity._zlayer)
                 self.get_chunk(entity._chunk_pos, entity._zlayer).add_entity(entity)
                 # update previous chunk position
                 entity._prev_chunk_pos = entity._chunk_pos
                 entity._prev_zlayer = entity._zlayer
+        self._moved_entities.clear()
 
-                print(f"{consts.RUN_TIME:.5f} | ENTITY MOVED CHUNKS", entity)
+    def mark_entity_moved(self, entity: "Entity"):
+        self._moved_entities[entity._entity_id] = entity
+        if entity._layer is not None and entity._layer._static:
+            entity._layer.mark_dirty(entity)
 
     # ------------------------------------------------------------------------ #
     # layer logic
@@ -148,6 +271,16 @@ class World2D(entity.Entity):
     def get_chunk(self, chunk_position: tuple, zlayer: int):
         return self.get_layer(zlayer).get_chunk(chunk_position)
 
+    def get_active_chunks(self) -> dict:
+        return self._active_chunks
+
+    def get_chunk_tick(self, chunk_position: tuple):
+        # (tick interval, tick phase) -- None if the chunk is not active
+        return self._active_chunks.get(Chunk.get_id(chunk_position))
+
+    def set_chunk_generator(self, zlayer: int, generator: "ChunkGenerator"):
+        self.get_layer(zlayer).set_chunk_generator(generator)
+
     # ------------------------------------------------------------------------ #
     # entity logic
     # ------------------------------------------------------------------------ #
@@ -158,8 +291,11 @@ class World2D(entity.Entity):
         entity._layer = self.get_layer(entity._zlayer)
         entity.__post_init__()
 
-        # create chunk
+        # create chunk -- the position may have been set before the entity was added
+        entity._chunk_pos = get_chunk_position(entity._position)
         self.get_chunk(entity._chunk_pos, entity._zlayer).add_entity(entity)
+        entity._prev_chunk_pos = entity._chunk_pos
+        entity._prev_zlayer = entity._zlayer
         return entity
 
     def remove_entity(self, entity: "Entity"):
@@ -168,6 +304,33 @@ class World2D(entity.Entity):
     def get_entity(self, entity_id: int):
         return self._entities.get(entity_id)
 
+    # ------------------------------------------------------------------------ #
+    # collider queries
+    # ------------------------------------------------------------------------ #
+
+    def query_point(self, point, mask: int = None):
+        return self._collider_tree.query_point(point, mask)
+
+    def query_rect(self, rect, mask: int = None):
+        return self._collider_tree.query_rect(rect, mask)
+
+    def raycast(self, start, end, mask: int = None):
+        return self._collider_tree.raycast(start, end, mask)
+
+    def raycast_all(self, start, end, mask: int = None):
+        return self._collider_tree.raycast_all(start, end, mask)
+
+    def query_nearest(
+        self,
+        point,
+        mask: int = None,
+        max_distance: float = math.inf,
+        count: int = 1,
+    ):
+        return self._collider_tree.query_nearest(
+            point, mask, max_distance=max_distance, count=count
+        )
+
     # ------------------------------------------------------------------------ #
     # component logic
     # ------------------------------------------------------------------------ #
@@ -181,6 +344,12 @@ class World2D(entity.Entity):
     def get_component(self, component_class: type, uuid: int):
         return self._gamestate._ecs.get_component(component_class, uuid)
 
+    def query(self, *component_classes: type, without: tuple = ()):
+        return self._gamestate._ecs.query(*component_classes, without=without)
+
+    def add_system(self, system: "scheduler.System"):
+        return self._gamestate._ecs.add_system(system)
+
 
 # ======================================================================== #
 # Layer
@@ -193,9 +362,16 @@ class Layer:
         zlevel: int = 0,
         buffer: bool = False,
         buffer_size: tuple = None,
+        storage: str = consts.DEFAULT_CHUNK_STORAGE,
+        grid_bounds: tuple = consts.DEFAULT_CHUNK_GRID_BOUNDS,
+        static: bool = False,
     ):
+        """
+        static: sprites are drawn once into a cached surface per chunk + only
+        the areas around entities that moved, were added or removed are redrawn.
+        Changing a sprite image in place needs `mark_dirty(entity)`.
+        """
         self._zlevel = zlevel
-        self._chunks = {}
         self._delta_chunks = []
         self._buffer = buffer
 
@@ -205,6 +381,17 @@ class Layer:
         )
         self._buffer_size = buffer_size
 
+        # chunk id -> chunk -- a dense grid for bounded worlds
+        self._storage = storage
+        self._chunks = ChunkGrid(grid_bounds) if storage == STORAGE_GRID else {}
+
+        # fills missing chunks with terrain (see chunkgen) -- optional
+        self._generator = None
+
+        # render caching -- ids of the chunks composited last frame
+        self._static = static
+        self._cached_chunks = set()
+
         # management information
         self._world = None
 
@@ -219,17 +406,78 @@ class Layer:
     # ------------------------------------------------------------------------ #
 
     def update(self):
-        # update all chunks inside of this layer
-        # TODO - add valid chunk filtering
-        #       - something like: self._world.get_visible_chunks(self)
-        for chunk in self._chunks.values():
-            chunk.update()
+        if self._generator is not None:
+            self._generator.poll()
+
+        # only chunks around the camera update -- see World2D._update_active_chunks
+        active = self._world._active_chunks
+        frame = self._world._frame
+        if len(self._chunks) < len(active):
+            chunks = [
+                (chunk, active[chunk_id])
+                for chunk_id, chunk in self._chunks.items()
+                if chunk_id in active
+            ]
+        else:
+            chunks = [
+                (self._chunks[chunk_id], tick)
+                for chunk_id, tick in active.items()
+                if chunk_id in self._chunks
+            ]
+
+        for chunk, (interval, phase) in chunks:
+            if interval == 1:
+                chunk.update(consts.DELTA_TIME)
+                continue
+            if (frame + phase) % interval:
+                continue
+            # outer chunks see the time of every frame they skipped
+            chunk.update(consts.DELTA_TIME * interval)
+
+        if self._static:
+            self.render_cached_chunks()
 
         # finish up by updating chunks
         for chunk in self._delta_chunks:
-            self.add_chunk(chunk)
+            self.drop_chunk(chunk)
         self._delta_chunks.clear()
 
+    def render_cached_chunks(self):
+        # one composite per chunk that is on screen
+        width, height = consts.W_FRAMEBUFFER.get_size()
+        left, top = get_chunk_position(pygame.Vector2(0, 0))
+        right, bottom = get_chunk_position(pygame.Vector2(width - 1, height - 1))
+        cached = set()
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                chunk = self._chunks.get(Chunk.get_id((x, y)))
+                if chunk is None:
+                    continue
+                area = chunk.render_cache()
+                if area:
+                    consts.W_FRAMEBUFFER.blit(chunk._cache, area.topleft, area)
+                    cached.add(chunk._chunk_id)
+
+        # every cache is framebuffer sized -- free the ones that left the screen
+        for chunk_id in self._cached_chunks - cached:
+            chunk = self._chunks.get(chunk_id)
+            if chunk is not None:
+                chunk.clear_cache()
+        self._cached_chunks = cached
+
+    def set_static(self, static: bool):
+        self._static = static
+        if not static:
+            for chunk in self._chunks.values():
+                chunk.clear_cache()
+            self._cached_chunks.clear()
+
+    def mark_dirty(self, entity: "Entity"):
+        # redraw the entity's area in its chunk cache before the next composite
+        chunk = self.find_chunk(entity._prev_chunk_pos)
+        if chunk is not None and entity._entity_id in chunk._entities:
+            chunk._dirty_entities[entity._entity_id] = entity
+
     # ------------------------------------------------------------------------ #
     # chunk logic
     # ------------------------------------------------------------------------ #
@@ -242,10 +490,139 @@ class Layer:
     def remove_chunk(self, chunk: "Chunk"):
         self._delta_chunks.append(chunk)
 
+    def drop_chunk(self, chunk: "Chunk"):
+        # removes the chunk right away -- remove_chunk waits for the update
+        self._chunks.pop(chunk._chunk_id, None)
+        self._cached_chunks.discard(chunk._chunk_id)
+        chunk.clear_cache()
+
     def get_chunk(self, chunk_position: tuple):
-        if not Chunk.get_id(chunk_position) in self._chunks:
-            self.add_chunk(Chunk(chunk_position))
-        return self._chunks[Chunk.get_id(chunk_position)]
+        if self._storage == STORAGE_GRID:
+            chunk = self._chunks.get_at(chunk_position)
+            if chunk is None:
+                # positions outside of the grid share the nearest edge chunk
+                chunk_position = self._chunks.clamp(chunk_position)
+                chunk = self._chunks.get_at(chunk_position)
+        else:
+            chunk = self._chunks.get(Chunk.get_id(chunk_position))
+        if chunk is None:
+            chunk = Chunk(chunk_position)
+            self.add_chunk(chunk)
+            if self._generator is not None:
+                self._generator.request(chunk)
+        return chunk
+
+    def find_chunk(self, chunk_position: tuple):
+        # like get_chunk, but None instead of creating a missing chunk
+        if self._storage == STORAGE_GRID:
+            return self._chunks.get_at(self._chunks.clamp(chunk_position))
+        return self._chunks.get(Chunk.get_id(chunk_position))
+
+    def set_chunk_generator(self, generator: "ChunkGenerator"):
+        self._generator = generator
+
+
+# ======================================================================== #
+# Chunk Grid
+# ======================================================================== #
+
+
+class ChunkGrid:
+    """
+    Dense chunk storage for worlds with known bounds.
+
+    Chunks live in a flat list indexed by their position, so a lookup is a
+    subtraction + a list index. Supports the parts of the dict interface
+    `Layer` uses (keyed by chunk id).
+
+    Lookups outside of the bounds return None. `Layer.get_chunk` clamps those
+    positions to the edge of the grid, so entities that leave the bounds live
+    in the nearest edge chunk.
+    """
+
+    def __init__(self, bounds: tuple):
+        self._min_x, self._min_y, self._max_x, self._max_y = bounds
+        self._width = self._max_x - self._min_x
+        self._height = self._max_y - self._min_y
+
+        self._cells = [None] * (self._width * self._height)
+        self._count = 0
+
+    # ------------------------------------------------------------------------ #
+    # logic
+    # ------------------------------------------------------------------------ #
+
+    def get_index(self, x: int, y: int) -> int:
+        # -1 if the position is outside of the grid
+        x = int(x) - self._min_x
+        y = int(y) - self._min_y
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return y * self._width + x
+        return -1
+
+    def clamp(self, chunk_position: tuple) -> tuple:
+        # nearest position inside of the grid
+        return (
+            min(max(int(chunk_position[0]), self._min_x), self._max_x - 1),
+            min(max(int(chunk_position[1]), self._min_y), self._max_y - 1),
+        )
+
+    def get_at(self, chunk_position: tuple):
+        # inlined get_index -- this is the hot lookup path
+        x = chunk_position[0] - self._min_x
+        y = chunk_position[1] - self._min_y
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return self._cells[int(y * self._width + x)]
+        return None
+
+    def get(self, chunk_id: int, default=None):
+        index = self.get_index(*Chunk.get_position(chunk_id))
+        if index < 0 or self._cells[index] is None:
+            return default
+        return self._cells[index]
+
+    def pop(self, chunk_id: int, default=None):
+        index = self.get_index(*Chunk.get_position(chunk_id))
+        if index < 0 or self._cells[index] is None:
+            return default
+        chunk = self._cells[index]
+        self._cells[index] = None
+        self._count -= 1
+        return chunk
+
+    def values(self):
+        return [chunk for chunk in self._cells if chunk is not None]
+
+    def items(self):
+        return [(chunk._chunk_id, chunk) for chunk in self._cells if chunk is not None]
+
+    # ------------------------------------------------------------------------ #
+    # special functions
+    # ------------------------------------------------------------------------ #
+
+    def __getitem__(self, chunk_id: int):
+        chunk = self.get(chunk_id)
+        if chunk is None:
+            raise KeyError(chunk_id)
+        return chunk
+
+    def __setitem__(self, chunk_id: int, chunk: "Chunk"):
+        position = Chunk.get_position(chunk_id)
+        index = self.get_index(*position)
+        if index < 0:
+            raise IndexError(f"Chunk {position} is outside of the chunk grid")
+        if self._cells[index] is None:
+            self._count += 1
+        self._cells[index] = chunk
+
+    def __contains__(self, chunk_id: int):
+        return self.get(chunk_id) is not None
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter([chunk._chunk_id for chunk in self.values()])
 
 
 # ======================================================================== #
@@ -256,8 +633,18 @@ class Layer:
 class Chunk:
 
     @staticmethod
-    def get_id(chunk_position: tuple):
-        return f"{int(chunk_position[0])}||{int(chunk_position[1])}"
+    def get_id(chunk_position: tuple) -> int:
+        # packed into one int -- hashes + compares faster than a string or tuple
+        return ((int(chunk_position[0]) + CHUNK_KEY_OFFSET) << 32) | (
+            int(chunk_position[1]) + CHUNK_KEY_OFFSET
+        )
+
+    @staticmethod
+    def get_position(chunk_id: int) -> tuple:
+        return (
+            (chunk_id >> 32) - CHUNK_KEY_OFFSET,
+            (chunk_id & CHUNK_KEY_MASK) - CHUNK_KEY_OFFSET,
+        )
 
     # ------------------------------------------------------------------------ #
     # init
@@ -279,6 +666,15 @@ class Chunk:
         # entity information
         self._entities = {}
 
+        # generated tile + height data (see chunkgen) -- None until it arrives
+        self._terrain = None
+
+        # render cache -- static layers only (see Layer)
+        self._cache = None
+        self._cached_rects = {}
+        self._dirty_entities = {}
+        self._dirty_rects = []
+
     def __post_init__(self):
         # register the death signal for an entity
         self._death_signal = consts.CTX_SIGNAL_HANDLER.register_receiver(
@@ -289,15 +685,114 @@ class Chunk:
     # logic
     # ------------------------------------------------------------------------ #
 
-    def update(self):
+    def update(self, delta_time: float = None):
         # update all entities inside of this chunk
+        if delta_time is None:
+            delta_time = consts.DELTA_TIME
         for entity in self._entities.values():
+            entity._delta_time = delta_time
             entity.update()
             entity.handle_components()
         if consts.DEBUG_MODE:
             for entity in self._entities.values():
                 entity.debug()
 
+    def clean(self):
+        consts.CTX_SIGNAL_HANDLER.get_signal(
+            f"SORA_ENTITY_DEATH-{self._layer._zlevel}"
+        ).remove_receiver(self._death_signal)
+
+    # ------------------------------------------------------------------------ #
+    # streaming
+    # ------------------------------------------------------------------------ #
+
+    def can_stream(self) -> bool:
+        # every entity must implement the chunk store hooks (see chunkstore)
+        return all(entity.can_serialize() for entity in self._entities.values())
+
+    def serialize(self) -> list:
+        return [
+            (type(entity), entity.__serialize__()) for entity in self._entities.values()
+        ]
+
+    # ------------------------------------------------------------------------ #
+    # render cache
+    # ------------------------------------------------------------------------ #
+
+    def render_cache(self):
+        # brings the cache up to date -- returns the on screen area of the chunk
+        width, height = self._chunk_size
+        area = pygame.Rect(
+            self._chunk_position[0] * width,
+            self._chunk_position[1] * height,
+            width,
+            height,
+        ).clip(consts.W_FRAMEBUFFER.get_rect())
+        if not area:
+            return None
+
+        size = consts.W_FRAMEBUFFER.get_size()
+        if self._cache is None or self._cache.get_size() != size:
+            self._cache = pygame.Surface(size, pygame.SRCALPHA)
+            self._cached_rects.clear()
+            self._dirty_rects = [area]
+            self._dirty_entities = dict(self._entities)
+
+        # old + new area of everything that changed
+        for entity_id, entity in self._dirty_entities.items():
+            old = self._cached_rects.pop(entity_id, None)
+            if old:
+                self._dirty_rects.append(old)
+            if entity_id not in self._entities:
+                continue
+            rect = get_render_rect(entity)
+            if rect:
+                self._cached_rects[entity_id] = rect
+                self._dirty_rects.append(rect)
+        self._dirty_entities.clear()
+
+        if self._dirty_rects:
+            self.redraw_cache(area)
+        return area
+
+    def redraw_cache(self, area: pygame.Rect):
+        # overlapping dirty rects are merged, so nothing is drawn twice
+        merged = []
+        for rect in self._dirty_rects:
+            rect = rect.clip(area)
+            if not rect:
+                continue
+            index = rect.collidelist(merged)
+            while index >= 0:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        self._dirty_rects.clear()
+
+        for rect in merged:
+            self._cache.fill((0, 0, 0, 0), rect)
+            self._cache.set_clip(rect)
+            for entity_id, entity in self._entities.items():
+                cached = self._cached_rects.get(entity_id)
+                if cached is None or not cached.colliderect(rect):
+                    continue
+                for renderer in entity.get_components(c_sprite.SpriteRendererComponent):
+                    renderer.render(self._cache)
+            self._cache.set_clip(None)
+
+    def clear_cache(self):
+        self._cache = None
+        self._cached_rects.clear()
+        self._dirty_entities.clear()
+        self._dirty_rects.clear()
+
+    def forget_cached(self, entity: "Entity"):
+        # the area the entity was drawn in is redrawn without it
+        old = self._cached_rects.pop(entity._entity_id, None)
+        if old:
+            self._dirty_rects.append(old)
+        self._dirty_entities.pop(entity._entity_id, None)
+
     # ------------------------------------------------------------------------ #
     # entity logic
     # ------------------------------------------------------------------------ #
@@ -316,15 +811,41 @@ class Chunk:
         self.remove_entity(entity)
 
     def add_entity(self, entity: "Entity"):
-        print(
-            f"{consts.RUN_TIME:.5f} | ADDING", entity, entity._entity_id, entity._zlayer
-        )
         self._entities[entity._entity_id] = entity
+        if self._cache is not None:
+            self._dirty_entities[entity._entity_id] = entity
 
     def remove_entity(self, entity: "Entity"):
         print(f"{consts.RUN_TIME:.5f} | REMOVING", entity._entity_id)
         self._entities.pop(entity._entity_id)
+        if self._cache is not None:
+            self.forget_cached(entity)
         entity.clean()
 
     def remove_not_clean(self, entity: "Entity"):
         self._entities.pop(entity._entity_id)
+        if self._cache is not None:
+            self.forget_cached(entity)
+
+
+# ======================================================================== #
+# utils
+# ======================================================================== #
+
+
+def get_chunk_position(position) -> tuple:
+    return (
+        int(position.x // consts.DEFAULT_CHUNK_PIXEL_WIDTH),
+        int(position.y // consts.DEFAULT_CHUNK_PIXEL_HEIGHT),
+    )
+
+
+def get_render_rect(entity: "Entity"):
+    # the area covered by every sprite renderer of the entity -- None if empty
+    rect = None
+    for renderer in entity.get_components(c_sprite.SpriteRendererComponent):
+        if renderer._target_comp is None:
+            continue
+        sprite_rect = renderer._target_comp._rect
+        rect = sprite_rect.copy() if rect is None else rect.union(sprite_rect)
+    return rect
@@ -0,0 +1,84 @@
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import engine.context as ctx
+import engine.constants as consts
+
+from engine.system import world
+from engine.system import signal
+
+"""
+Chunk lookup benchmark
+
+Layer.get_chunk over a 64x64 layer -- 100k random lookups of existing chunks,
+best of 5.
+- legacy -- the old lookup: `f"{x}||{y}"` string keys, built twice per call
+- dict -- packed int keys
+- grid -- dense ChunkGrid storage
+
+    python engine/tests/bench_chunk_lookup.py [legacy|dict|grid]
+"""
+
+SIZE = 32
+LOOKUPS = 100_000
+MODES = ("legacy", world.STORAGE_DICT, world.STORAGE_GRID)
+
+
+def get_legacy_id(chunk_position: tuple) -> str:
+    return f"{int(chunk_position[0])}||{int(chunk_position[1])}"
+
+
+class LegacyLayer(world.Layer):
+    # string keyed dict -- same as the lookup before packed int keys
+    def add_chunk(self, chunk: "Chunk"):
+        self._chunks[get_legacy_id(chunk._chunk_position)] = chunk
+        chunk._layer = self
+        chunk.__post_init__()
+
+    def get_chunk(self, chunk_position: tuple):
+        if not get_legacy_id(chunk_position) in self._chunks:
+            self.add_chunk(world.Chunk(chunk_position))
+        return self._chunks[get_legacy_id(chunk_position)]
+
+
+def create_layer(mode: str) -> world.Layer:
+    if mode == "legacy":
+        return LegacyLayer(0, storage=world.STORAGE_DICT)
+    return world.Layer(0, storage=mode)
+
+
+def measure(mode: str, positions: list) -> float:
+    layer = create_layer(mode)
+    layer.__post_init__()
+    for x in range(-SIZE, SIZE):
+        for y in range(-SIZE, SIZE):
+            layer.get_chunk((x, y))
+
+    def run():
+        get_chunk = layer.get_chunk
+        for position in positions:
+            get_chunk(position)
+
+    return min(timeit.repeat(run, number=1, repeat=5)) / LOOKUPS
+
+
+def main():
+    consts.CTX_SIGNAL_HANDLER = signal.SignalHandler()
+    modes = sys.argv[1:] or MODES
+
+    rng = random.Random(1)
+    positions = [
+        (rng.randrange(-SIZE, SIZE), rng.randrange(-SIZE, SIZE)) for _ in range(LOOKUPS)
+    ]
+    for mode in modes:
+        print(f"{mode}: {measure(mode, positions) * 1e9:.0f} ns per get_chunk")
+
+
+if __name__ == "__main__":
+    main()
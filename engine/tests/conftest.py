@@ -0,0 +1,102 @@
+import os
+import sys
+
+# headless -- the engine logic under test never needs a window or a gl context
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import pygame
+import pytest
+
+# same import order as main.py -- the engine modules import each other through ctx
+import engine.context as ctx
+import engine.constants as consts
+
+"""
+Shared test setup
+
+Tests run without `ctx.init()` -- fixtures fill in the few context objects the
+code under test reads (framebuffer, signal handler, game state).
+"""
+
+pygame.init()
+
+
+@pytest.fixture
+def framebuffer(monkeypatch):
+    surface = pygame.Surface(
+        (consts.FRAMEBUFFER_WIDTH, consts.FRAMEBUFFER_HEIGHT), pygame.SRCALPHA
+    )
+    monkeypatch.setattr(consts, "W_FRAMEBUFFER", surface)
+    return surface
+
+
+@pytest.fixture
+def signal_handler(monkeypatch):
+    from engine.system import signal
+
+    handler = signal.SignalHandler()
+    monkeypatch.setattr(consts, "CTX_SIGNAL_HANDLER", handler)
+    return handler
+
+
+@pytest.fixture
+def job_system(monkeypatch):
+    from engine.system import jobs
+
+    result = jobs.JobSystem(thread_workers=2, process_workers=1)
+    monkeypatch.setattr(consts, "CTX_JOB_SYSTEM", result)
+    yield result
+    result.__on_clean__()
+
+
+@pytest.fixture
+def world(monkeypatch, tmp_path, framebuffer, signal_handler):
+    # the default game state -- chunk files go to a temp folder
+    from engine.system import gamestate
+    from engine.system import chunkstore
+
+    monkeypatch.setattr(consts, "DELTA_TIME", 1 / 60)
+    manager = gamestate.GameStateManager()
+    monkeypatch.setattr(consts, "CTX_GAMESTATE_MANAGER", manager)
+
+    result = manager.get_current_world()
+    result._chunk_store = chunkstore.ChunkStore("test", str(tmp_path))
+    yield result
+    manager.__on_clean__()
+
+
+@pytest.fixture
+def gl_context(monkeypatch):
+    # headless gl through egl -- skipped where no driver is available
+    import moderngl as mgl
+
+    from engine.graphics import buffer
+    from engine.graphics import shader
+    from engine.graphics import particle
+
+    try:
+        context = mgl.create_standalone_context(backend="egl")
+    except Exception as e:
+        pytest.skip(f"no headless gl context: {e}")
+    monkeypatch.setattr(consts, "MGL_CONTEXT", context)
+
+    # gl objects cached by earlier contexts are dead in this one
+    monkeypatch.setattr(shader.ShaderProgram, "CACHE", {})
+    monkeypatch.setattr(shader.ShaderProgram, "PROGRAM_CACHE", {})
+    monkeypatch.setattr(buffer.GLBufferObject, "CACHE", {})
+    monkeypatch.setattr(buffer.VAOObject, "CACHE", {})
+    monkeypatch.setattr(particle.ParticleRenderer, "SHADER_PROGRAM", None)
+    monkeypatch.setattr(particle.ParticleRenderer, "CORNER_BUFFER", None)
+
+    # draws go into an offscreen target the size of the framebuffer
+    target = context.simple_framebuffer(
+        (consts.FRAMEBUFFER_WIDTH, consts.FRAMEBUFFER_HEIGHT)
+    )
+    target.use()
+    target.clear(0, 0, 0, 1)
+    yield context
+    context.release()
@@ -5,7 +5,6 @@ import random
 from engine.physics import entity
 
 from engine.graphics import buffer
-from engine.graphics import shader
 from engine.graphics.ecs import c_mesh
 
 # ======================================================================== #
@@ -18,15 +17,13 @@ class CubeEntity(entity.Entity):
         self,
         name: str = None,
         zlayer: int = 0,
-        shader_program: shader.ShaderProgram = None,
-        complete_vert_data: list[tuple] = None,
+        manifold: buffer.InstancedRenderingManifold = None,
     ):
         super().__init__(name, zlayer)
 
         # define variables
         self._c_mesh = None
-        self._shader_program = shader_program
-        self._complete_vert_data = complete_vert_data
+        self._manifold = manifold
 
         # create model
         self._model_rman = glm.mat4()
@@ -50,31 +47,9 @@ class CubeEntity(entity.Entity):
         )
 
     def __post_init__(self):
-        # create objects
-        # create default cube object
+        # every cube is one instance of the shared manifold
+        if self._c_mesh:
+            return
         self._c_mesh = self.add_component(
-            c_mesh.MeshComponent(
-                buffer.RenderingManifold(
-                    vao=buffer.VAOObject(
-                        self._shader_program,
-                        [
-                            (
-                                self._complete_vert_data(),
-                                "3f 2f 1f",
-                                "in_position",
-                                "in_texcoords",
-                                "in_tex",
-                            )
-                        ],
-                    )
-                )
-            )
+            c_mesh.InstancedMeshComponent(self._manifold, self._model_rman)
         )
-
-    # ------------------------------------------------------------------------ #
-    # logic
-    # ------------------------------------------------------------------------ #
-
-    def update(self):
-        # upload data
-        self._c_mesh().write_uniform("m_model", self._model_rman)
@@ -0,0 +1,198 @@
+import math
+import random
+
+import pygame
+import pytest
+
+from engine.physics import aabbtree
+from engine.physics import interact
+
+from test_broadphase import create_collider, create_scene
+
+
+def brute_force_raycast(interacts: dict, start, end, mask: int = None) -> list:
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    hits = []
+    for collider in interacts.values():
+        if mask is not None and not collider._collision_mask & mask:
+            continue
+        rect = collider._shape._rect
+        fraction = aabbtree._segment_aabb_fraction(
+            start[0],
+            start[1],
+            dx,
+            dy,
+            (rect.left, rect.top, rect.right, rect.bottom),
+            1.0,
+        )
+        if fraction is not None:
+            hits.append((fraction, collider))
+    hits.sort(key=lambda x: x[0])
+    return hits
+
+
+def check_node(node: aabbtree.AABBTreeNode) -> int:
+    # returns the leaf count -- parents contain their children + stay balanced
+    if node.is_leaf():
+        rect = node.interact._shape._rect
+        left, top, right, bottom = node.aabb
+        assert left <= rect.left and top <= rect.top
+        assert rect.right <= right and rect.bottom <= bottom
+        return 1
+    for child in (node.left, node.right):
+        assert child.parent is node
+        assert aabbtree._union(node.aabb, child.aabb) == node.aabb
+    assert node.height == 1 + max(node.left.height, node.right.height)
+    assert abs(node.left.height - node.right.height) <= 1
+    return check_node(node.left) + check_node(node.right)
+
+
+@pytest.fixture
+def scene():
+    rng = random.Random(21)
+    interacts = create_scene(rng, count=200)
+    for i, collider in enumerate(interacts.values()):
+        collider._collision_mask = 0b01 if i % 2 else 0b10
+    tree = aabbtree.AABBTree()
+    tree.update(interacts)
+    return tree, interacts
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_tree_is_valid(scene):
+    tree, interacts = scene
+    assert check_node(tree._root) == len(interacts)
+    # balanced -- far below the 200 levels of a degenerate tree
+    assert tree.get_height() <= 2 * math.ceil(math.log2(len(interacts))) + 2
+
+
+def test_query_rect(scene):
+    tree, interacts = scene
+    rng = random.Random(1)
+    for _ in range(50):
+        rect = pygame.FRect(
+            rng.uniform(0, 900), rng.uniform(0, 900), rng.uniform(1, 200), 100
+        )
+        expected = {
+            x._uuid for x in interacts.values() if x._shape._rect.colliderect(rect)
+        }
+        assert {x._uuid for x in tree.query_rect(rect)} == expected
+
+        expected = {
+            x._uuid
+            for x in interacts.values()
+            if x._shape._rect.colliderect(rect) and x._collision_mask & 0b01
+        }
+        assert {x._uuid for x in tree.query_rect(rect, mask=0b01)} == expected
+
+
+def test_query_point(scene):
+    tree, interacts = scene
+    rng = random.Random(2)
+    for _ in range(100):
+        point = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+        expected = {
+            x._uuid for x in interacts.values() if x._shape._rect.collidepoint(point)
+        }
+        assert {x._uuid for x in tree.query_point(point)} == expected
+
+
+def test_raycast(scene):
+    tree, interacts = scene
+    rng = random.Random(3)
+    for _ in range(50):
+        start = (rng.uniform(-100, 1100), rng.uniform(-100, 1100))
+        end = (rng.uniform(-100, 1100), rng.uniform(-100, 1100))
+        expected = brute_force_raycast(interacts, start, end, mask=0b10)
+
+        hits = tree.raycast_all(start, end, mask=0b10)
+        assert [f for f, _ in hits] == pytest.approx([f for f, _ in expected])
+        assert {x._uuid for _, x in hits} == {x._uuid for _, x in expected}
+
+        closest = tree.raycast(start, end, mask=0b10)
+        if not expected:
+            assert closest is None
+        else:
+            assert closest[0] == pytest.approx(expected[0][0])
+
+
+def test_query_nearest(scene):
+    tree, interacts = scene
+    rng = random.Random(4)
+    for _ in range(50):
+        x, y = rng.uniform(-200, 1200), rng.uniform(-200, 1200)
+        distances = sorted(
+            aabbtree._point_aabb_distance(
+                x,
+                y,
+                (
+                    c._shape._rect.left,
+                    c._shape._rect.top,
+                    c._shape._rect.right,
+                    c._shape._rect.bottom,
+                ),
+            )
+            for c in interacts.values()
+        )
+        result = tree.query_nearest((x, y), count=5)
+        assert [d for d, _ in result] == pytest.approx(distances[:5])
+
+        # nothing past max_distance is returned
+        limit = distances[2]
+        result = tree.query_nearest((x, y), max_distance=limit, count=10)
+        assert all(d <= limit for d, _ in result)
+        assert len(result) == sum(1 for d in distances if d <= limit)
+
+
+def test_move_refits_only_when_leaving_the_margin(scene):
+    tree, interacts = scene
+    collider = next(x for x in interacts.values() if not x._static)
+    leaf = tree._leaves[collider._uuid]
+    aabb = leaf.aabb
+
+    # inside the fat aabb -- the leaf is left alone
+    collider._entity._position += (tree._margin / 2, 0)
+    tree.move(collider)
+    assert leaf.aabb == aabb
+
+    collider._entity._position += (500, 500)
+    tree.move(collider)
+    assert leaf.aabb != aabb
+    assert collider in tree.query_point(collider._entity._position)
+    assert check_node(tree._root) == len(interacts)
+
+
+def test_sync_only_changes_membership(scene):
+    tree, interacts = scene
+    collider = next(x for x in interacts.values() if not x._static)
+    aabb = tree._leaves[collider._uuid].aabb
+
+    # sync never moves indexed colliders -- only `move` does
+    collider._entity._position += (500, 500)
+    added = create_collider(2000, 2000, 10, 10)
+    interacts[added._uuid] = added
+    removed = interacts.pop(next(iter(interacts)))
+    tree.sync(interacts)
+
+    assert tree._leaves[collider._uuid].aabb == aabb
+    assert added in tree.query_point((2000, 2000))
+    assert removed._uuid not in tree._leaves
+
+
+def test_world_query_nearest_honours_max_distance(world):
+    from engine.physics import entity
+    from engine.physics.ecs import c_AABB
+
+    for x in (0, 100, 200):
+        e = world.add_entity(entity.Entity())
+        e.add_component(c_AABB.AABBColliderComponent(10, 10))
+        e.add_component(interact.InteractionFieldComponent(static=True))
+        e.position = pygame.Vector2(x, 0)
+    world.update()
+
+    assert len(world.query_nearest((0, 0), count=3)) == 3
+    assert len(world.query_nearest((0, 0), max_distance=120, count=3)) == 2
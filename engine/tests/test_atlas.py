@@ -0,0 +1,111 @@
+import random
+
+import pygame
+
+from engine.graphics import atlas
+
+
+def pack(packer: atlas.SkylinePacker, sizes: list) -> list:
+    rects = []
+    for width, height in sizes:
+        position = packer.insert(width, height)
+        if position is not None:
+            rects.append(pygame.Rect(position, (width, height)))
+    return rects
+
+
+def check_skyline(packer: atlas.SkylinePacker):
+    # segments run left to right without gaps and cover the whole width
+    x = 0
+    for left, y, width in packer._skyline:
+        assert left == x and width > 0
+        assert 0 <= y <= packer._height
+        x += width
+    assert x == packer._width
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_packed_rects_never_overlap():
+    rng = random.Random(11)
+    packer = atlas.SkylinePacker(512, 512)
+    sizes = [(rng.randint(4, 64), rng.randint(4, 64)) for _ in range(300)]
+    rects = pack(packer, sizes)
+    bounds = pygame.Rect(0, 0, 512, 512)
+
+    assert len(rects) > 50
+    for i, rect in enumerate(rects):
+        assert bounds.contains(rect)
+        assert rect.collidelist(rects[i + 1 :]) == -1
+    check_skyline(packer)
+
+
+def test_full_page_returns_none():
+    packer = atlas.SkylinePacker(64, 64)
+    rects = pack(packer, [(32, 32)] * 4)
+    assert len(rects) == 4
+    assert packer.insert(1, 1) is None
+    # too big for an empty page as well
+    assert atlas.SkylinePacker(64, 64).insert(65, 10) is None
+
+
+def test_bottom_left_prefers_the_lowest_position():
+    packer = atlas.SkylinePacker(100, 100)
+    assert packer.insert(60, 50) == (0, 0)
+    assert packer.insert(40, 10) == (60, 0)
+    # the 40 wide gap next to the tall rect is lower than the top of the tall rect
+    assert packer.insert(40, 20) == (60, 10)
+    check_skyline(packer)
+
+
+def test_atlas_reuses_regions_and_opens_pages():
+    texture_atlas = atlas.TextureAtlas(page_size=64, padding=1)
+    image = pygame.Surface((30, 30), pygame.SRCALPHA)
+    image.fill((255, 0, 0, 255))
+
+    region = texture_atlas.add(image)
+    assert texture_atlas.add(image) is region
+    assert region.get_rect().topleft == (1, 1)
+    assert region._page.get_surface().get_at((1, 1)) == pygame.Color(255, 0, 0, 255)
+
+    # four padded 30px images fill a 64px page -- the fifth opens a new page
+    for _ in range(4):
+        texture_atlas.add(pygame.Surface((30, 30), pygame.SRCALPHA))
+    assert len(texture_atlas.get_pages()) == 2
+
+    # oversized images get a power of two page of their own
+    big = texture_atlas.add(pygame.Surface((100, 20), pygame.SRCALPHA))
+    assert big._page._size == 128
+    assert big.get_uv() == (1 / 128, 1 / 128, 101 / 128, 21 / 128)
+
+
+def test_atlas_keeps_semi_transparent_pixels():
+    texture_atlas = atlas.TextureAtlas(page_size=64, padding=1)
+    image = pygame.Surface((4, 4), pygame.SRCALPHA)
+    image.fill((200, 100, 50, 128))
+    image.set_at((0, 0), (10, 20, 30, 1))
+    image.set_at((3, 3), (0, 0, 0, 0))
+
+    region = texture_atlas.add(image)
+    page = region._page.get_surface()
+    x, y = region.get_rect().topleft
+    for px in range(4):
+        for py in range(4):
+            assert page.get_at((x + px, y + py)) == image.get_at((px, py))
+
+
+def test_atlas_turns_colorkeys_into_alpha():
+    texture_atlas = atlas.TextureAtlas(page_size=64, padding=1)
+    image = pygame.Surface((2, 1))
+    image.fill((10, 20, 30))
+    image.set_at((1, 0), (255, 0, 255))
+    image.set_colorkey((255, 0, 255))
+
+    region = texture_atlas.add(image)
+    page = region._page.get_surface()
+    x, y = region.get_rect().topleft
+    assert page.get_at((x, y)) == pygame.Color(10, 20, 30, 255)
+    assert page.get_at((x + 1, y)).a == 0
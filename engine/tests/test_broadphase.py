@@ -0,0 +1,148 @@
+import random
+
+import pygame
+import pytest
+
+from engine.system import ecs
+
+from engine.physics import entity
+from engine.physics import interact
+from engine.physics import broadphase
+from engine.physics import aabbtree
+
+from engine.physics.ecs import c_AABB
+
+BROADPHASES = [
+    broadphase.SpatialHashBroadphase,
+    broadphase.SweepAndPruneBroadphase,
+    aabbtree.AABBTree,
+]
+
+
+def create_collider(x: float, y: float, width: float, height: float, static=False):
+    # components wired up by hand -- the broadphase only needs shape + entity
+    e = entity.Entity()
+    e._position = pygame.Vector2(x, y)
+    shape = c_AABB.AABBColliderComponent(width, height)
+    result = interact.InteractionFieldComponent(shape=shape, static=static)
+    for component in (shape, result):
+        component._entity = e
+        component._uuid = ecs.ECSHandler.generate_component_uuid()
+    shape._rect.center = e._position
+    return result
+
+
+def create_scene(rng: random.Random, count: int = 150) -> dict:
+    interacts = {}
+    for i in range(count):
+        collider = create_collider(
+            rng.uniform(0, 1000),
+            rng.uniform(0, 1000),
+            rng.uniform(5, 80),
+            rng.uniform(5, 80),
+            static=i % 4 == 0,
+        )
+        interacts[collider._uuid] = collider
+    return interacts
+
+
+def brute_force_pairs(interacts: dict) -> set:
+    result = set()
+    values = list(interacts.values())
+    for i, i1 in enumerate(values):
+        for i2 in values[i + 1 :]:
+            if i1._static and i2._static:
+                continue
+            if i1._shape._rect.colliderect(i2._shape._rect):
+                result.add(frozenset((i1._uuid, i2._uuid)))
+    return result
+
+
+def get_pair_set(method: broadphase.Broadphase) -> set:
+    pairs = method.get_pairs()
+    keys = [frozenset((i1._uuid, i2._uuid)) for i1, i2 in pairs]
+    # every candidate pair is reported once
+    assert len(keys) == len(set(keys))
+    return {
+        key
+        for key, (i1, i2) in zip(keys, pairs)
+        if i1._shape._rect.colliderect(i2._shape._rect)
+    }
+
+
+def move_dynamic(interacts: dict, rng: random.Random):
+    for collider in interacts.values():
+        if collider._static:
+            continue
+        collider._entity._position += (rng.uniform(-60, 60), rng.uniform(-60, 60))
+        collider._shape._rect.center = collider._entity._position
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+@pytest.mark.parametrize("method_class", BROADPHASES)
+def test_pairs_match_brute_force(method_class):
+    rng = random.Random(7)
+    interacts = create_scene(rng)
+    method = method_class()
+    method.update(interacts)
+    assert get_pair_set(method) == brute_force_pairs(interacts)
+
+
+@pytest.mark.parametrize("method_class", BROADPHASES)
+def test_pairs_follow_moving_colliders(method_class):
+    rng = random.Random(11)
+    interacts = create_scene(rng)
+    method = method_class()
+    method.update(interacts)
+
+    for _ in range(5):
+        move_dynamic(interacts, rng)
+        method.update(interacts)
+        assert get_pair_set(method) == brute_force_pairs(interacts)
+
+
+@pytest.mark.parametrize("method_class", BROADPHASES)
+def test_removed_colliders_leave_the_index(method_class):
+    rng = random.Random(3)
+    interacts = create_scene(rng)
+    method = method_class()
+    method.update(interacts)
+
+    for uuid in list(interacts)[::3]:
+        interacts.pop(uuid)
+    method.update(interacts)
+    assert method._entries.keys() == interacts.keys()
+    assert get_pair_set(method) == brute_force_pairs(interacts)
+
+
+def test_static_colliders_are_indexed_once():
+    interacts = {}
+    wall = create_collider(0, 0, 100, 100, static=True)
+    interacts[wall._uuid] = wall
+
+    method = broadphase.SpatialHashBroadphase(cell_size=64)
+    method.update(interacts)
+    cells = method._ranges[wall._uuid]
+
+    # a static collider is never re-bucketed by `update`, only by `refresh`
+    wall._entity._position += (500, 500)
+    wall._shape._rect.center = wall._entity._position
+    method.update(interacts)
+    assert method._ranges[wall._uuid] == cells
+
+    method.refresh(wall)
+    assert method._ranges[wall._uuid] != cells
+
+
+def test_brute_force_reports_every_candidate():
+    rng = random.Random(5)
+    interacts = create_scene(rng, count=20)
+    method = broadphase.BruteForceBroadphase()
+    method.update(interacts)
+    statics = sum(1 for x in interacts.values() if x._static)
+    expected = len(interacts) * (len(interacts) - 1) // 2 - statics * (statics - 1) // 2
+    assert len(method.get_pairs()) == expected
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+
+from engine.system import jobs
+from engine.system import world
+from engine.system import chunkgen
+
+# 8 x 8 tiles per chunk -- small enough for the pure python noise
+TILE_SIZE = 512
+
+
+def create_generator(tmp_path, **kwargs) -> chunkgen.ChunkGenerator:
+    kwargs.setdefault("cache_folder", str(tmp_path))
+    return chunkgen.ChunkGenerator(
+        seed=7, tile_size=TILE_SIZE, run_type=jobs.TYPE_THREAD, **kwargs
+    )
+
+
+def wait_for(generator: chunkgen.ChunkGenerator):
+    for job in list(generator._pending.values()):
+        job.wait()
+    generator.poll()
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_neighbouring_chunks_line_up():
+    params = (7, 8, 8, 32.0, 4, 0.5, 2.0)
+    _, left = chunkgen.generate_chunk((0, 0), *params)
+    _, right = chunkgen.generate_chunk((1, 0), *params)
+    # one chunk twice as wide covers both
+    _, both = chunkgen.generate_chunk((0, 0), 7, 16, 8, 32.0, 4, 0.5, 2.0)
+    assert np.allclose(np.hstack((left, right)), both)
+
+
+def test_tiles_follow_the_height_thresholds():
+    tiles, heights = chunkgen.generate_chunk((3, -2), 1, 8, 8, 8.0, 2, 0.5, 2.0)
+    assert tiles.shape == heights.shape == (8, 8)
+    assert (np.abs(heights) <= 1).all()
+    assert (tiles[heights < chunkgen.TILE_THRESHOLDS[0]] == chunkgen.TILE_WATER).all()
+    assert (tiles[heights >= chunkgen.TILE_THRESHOLDS[2]] == chunkgen.TILE_ROCK).all()
+
+
+def test_request_applies_data_once_generated(tmp_path, job_system):
+    generator = create_generator(tmp_path)
+    generated = []
+    generator.set_on_generate(lambda chunk, data: generated.append(chunk))
+
+    chunks = [world.Chunk((0, 0)), world.Chunk((0, 0))]
+    for chunk in chunks:
+        generator.request(chunk)
+    # one job for both chunks
+    assert generator.get_pending_count() == 1
+
+    wait_for(generator)
+    assert generated == chunks
+    assert chunks[0]._terrain is chunks[1]._terrain
+    assert chunks[0]._terrain.get_tiles().shape == (8, 8)
+
+    # cached -- applied right away
+    chunk = world.Chunk((0, 0))
+    generator.request(chunk)
+    assert generator.get_pending_count() == 0
+    assert chunk._terrain is chunks[0]._terrain
+
+
+def test_memory_cache_is_lru(tmp_path, job_system):
+    generator = create_generator(tmp_path, cache_size=2, cache_folder=None)
+    for position in [(0, 0), (1, 0)]:
+        generator.prefetch(position)
+    wait_for(generator)
+
+    # touching (0, 0) makes (1, 0) the oldest entry
+    assert generator.get_cached((0, 0)) is not None
+    generator.prefetch((2, 0))
+    wait_for(generator)
+    assert list(generator._cache) == [(0, 0), (2, 0)]
+
+
+def test_disk_cache_is_reused(tmp_path, job_system, monkeypatch):
+    generator = create_generator(tmp_path)
+    generator.prefetch((4, 5))
+    wait_for(generator)
+    expected = generator.get_cached((4, 5)).get_heights()
+    assert os.listdir(generator._cache_folder) == ["4_5.npz"]
+
+    # a new generator with the same settings never runs the noise again
+    def fail(*args):
+        raise AssertionError("chunk was generated instead of loaded")
+
+    monkeypatch.setattr(chunkgen, "generate_chunk", fail)
+    other = create_generator(tmp_path)
+    assert other._cache_folder == generator._cache_folder
+    other.prefetch((4, 5))
+    wait_for(other)
+    assert np.array_equal(other.get_cached((4, 5)).get_heights(), expected)
+
+
+def test_changed_settings_use_another_folder(tmp_path):
+    a = create_generator(tmp_path)
+    b = create_generator(tmp_path, octaves=2)
+    assert a._cache_folder != b._cache_folder
@@ -0,0 +1,73 @@
+import pytest
+
+from engine.system import world
+
+BOUNDS = (-2, -2, 2, 2)
+
+
+@pytest.fixture
+def grid_layer(signal_handler):
+    result = world.Layer(0, storage=world.STORAGE_GRID, grid_bounds=BOUNDS)
+    result.__post_init__()
+    return result
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_chunk_ids_round_trip():
+    for position in [(0, 0), (-1, 5), (123456, -654321), (-(2**20), 2**20)]:
+        assert world.Chunk.get_position(world.Chunk.get_id(position)) == position
+
+
+def test_grid_behaves_like_a_dict():
+    grid = world.ChunkGrid(BOUNDS)
+    chunks = {}
+    for position in [(-2, -2), (1, 1), (0, -1)]:
+        chunk = world.Chunk(position)
+        grid[chunk._chunk_id] = chunk
+        chunks[chunk._chunk_id] = chunk
+
+    assert len(grid) == 3
+    assert set(grid) == set(chunks)
+    assert dict(grid.items()) == chunks
+    assert grid.get_at((1, 1)) is chunks[world.Chunk.get_id((1, 1))]
+    assert grid.get_at((5, 5)) is None
+    assert grid.get(world.Chunk.get_id((5, 5))) is None
+    assert world.Chunk.get_id((0, 0)) not in grid
+
+    assert grid.pop(world.Chunk.get_id((1, 1))) is not None
+    assert grid.pop(world.Chunk.get_id((1, 1))) is None
+    assert len(grid) == 2
+    with pytest.raises(KeyError):
+        grid[world.Chunk.get_id((1, 1))]
+
+
+def test_clamp():
+    grid = world.ChunkGrid(BOUNDS)
+    assert grid.clamp((0, 0)) == (0, 0)
+    assert grid.clamp((10, -10)) == (1, -2)
+    assert grid.clamp((-3, 2)) == (-2, 1)
+
+
+def test_out_of_bounds_chunks_are_clamped(grid_layer):
+    edge = grid_layer.get_chunk((1, 0))
+    assert grid_layer.get_chunk((50, 0)) is edge
+    assert grid_layer.find_chunk((50, 0)) is edge
+    assert grid_layer.find_chunk((-50, -50)) is None
+    assert len(grid_layer._chunks) == 1
+
+
+def test_grid_and_dict_storage_agree(signal_handler):
+    layers = [
+        world.Layer(0, storage=world.STORAGE_DICT),
+        world.Layer(0, storage=world.STORAGE_GRID, grid_bounds=BOUNDS),
+    ]
+    for layer in layers:
+        layer.__post_init__()
+        for x in range(-2, 2):
+            for y in range(-2, 2):
+                assert layer.get_chunk((x, y))._chunk_position == (x, y)
+    assert sorted(layers[0]._chunks) == sorted(layers[1]._chunks)
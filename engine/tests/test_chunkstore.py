@@ -0,0 +1,147 @@
+import os
+
+import pygame
+
+from engine.system import chunkstore
+from engine.physics import entity
+from engine.physics import interact
+from engine.physics.ecs import c_AABB
+from engine.ecs import c_sprite
+from engine.ecs import c_task
+
+
+def wait_for(store: chunkstore.ChunkStore) -> list:
+    for job in list(store._pending_loads.values()):
+        job.wait()
+    return store.poll()
+
+
+def create_wall(world, position, color=(200, 10, 10)) -> entity.Entity:
+    # same shape as the walls in main.py -- sprite + static collider
+    image = pygame.Surface((8, 4), pygame.SRCALPHA)
+    image.fill(color)
+
+    e = world.add_entity(entity.Entity(name="wall"))
+    e.add_component(c_AABB.AABBColliderComponent(20, 300))
+    e.add_component(
+        interact.InteractionFieldComponent(collision_mask=0b0110, static=True)
+    )
+    e.add_component(c_sprite.SpriteComponent(image=image))
+    e.add_component(c_sprite.SpriteRendererComponent())
+    e.position = pygame.Vector2(position)
+    return e
+
+
+def find_entity(world, name: str) -> entity.Entity:
+    return next(x for x in world._entities.values() if x._name == name)
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_store_round_trip(tmp_path):
+    store = chunkstore.ChunkStore("round-trip", str(tmp_path))
+    key = chunkstore.get_key(0, (3, -4))
+    data = [(dict, {"value": 1}), (list, [1, 2, 3])]
+
+    store.save(key, data)
+    assert store.has_chunk(key)
+    job = store.load(key)
+    assert store.load(key) is job
+    assert wait_for(store) == [(key, data)]
+
+    # files are removed once read
+    assert not store.has_chunk(key)
+    assert not os.path.exists(store.get_path(key))
+    store.__on_clean__()
+
+
+def test_store_keeps_files_until_cleared(tmp_path):
+    store = chunkstore.ChunkStore("keep", str(tmp_path))
+    key = chunkstore.get_key(1, (0, 0))
+    store.save(key, [])
+    store.__on_clean__()
+
+    # creating a store does not touch the folder -- clearing does
+    other = chunkstore.ChunkStore("keep", str(tmp_path))
+    assert os.path.exists(other.get_path(key))
+    other.clear()
+    assert not os.path.exists(other.get_path(key))
+
+
+def test_entity_round_trip(world):
+    wall = create_wall(world, (100, 200))
+    wall.get_components(interact.InteractionFieldComponent)[0]._velocity.xy = (3, 4)
+    assert wall.can_serialize()
+
+    data = wall.__serialize__()
+    copy = world.add_entity(entity.Entity.__deserialize__(data))
+    copy.restore_components(data)
+
+    assert copy._name == "wall" and copy._position == (100, 200)
+    assert [type(x) for x in copy._components.values()] == [
+        type(x) for x in wall._components.values()
+    ]
+    field = copy.get_components(interact.InteractionFieldComponent)[0]
+    assert field._shape is copy.get_components(c_AABB.AABBColliderComponent)[0]
+    assert field._static and field._collision_mask == 0b0110
+    assert field._velocity == (3, 4)
+
+    renderer = copy.get_components(c_sprite.SpriteRendererComponent)[0]
+    sprite = copy.get_components(c_sprite.SpriteComponent)[0]
+    assert renderer._target_comp is sprite and not renderer._batched
+    assert sprite._image.get_size() == (8, 4)
+    assert sprite._image.get_at((0, 0)) == pygame.Color(200, 10, 10, 255)
+
+
+def test_only_plain_entities_with_known_components_stream(world):
+    class Player(entity.Entity):
+        pass
+
+    player = world.add_entity(Player())
+    assert not player.can_serialize()
+
+    e = world.add_entity(entity.Entity())
+    e.add_component(c_sprite.SpriteComponent())
+    assert e.can_serialize()
+    e.add_component(interact.InteractionFieldComponent(shape=None))
+    e.add_component(c_sprite.SpriteRendererComponent())
+    assert e.can_serialize()
+
+    # empty sprites (the walls in main.py) survive a round trip too
+    data = e.__serialize__()
+    copy = world.add_entity(entity.Entity.__deserialize__(data))
+    copy.restore_components(data)
+    assert copy.get_components(c_sprite.SpriteComponent)[0]._image.get_size() == (0, 0)
+
+    e.add_component(c_task.TaskComponent("task", lambda: None))
+    assert not e.can_serialize()
+
+
+def test_world_evict_and_load(world):
+    create_wall(world, (100, 200))
+    layer = world.get_layer(0)
+    chunk = layer.get_chunk((0, 0))
+    assert chunk.can_stream()
+
+    world.evict_chunk(layer, chunk)
+    assert not world._entities
+    key = chunkstore.get_key(0, (0, 0))
+    assert world._chunk_store.has_chunk(key)
+
+    # the camera moving back into range requests the chunk
+    world._camera_chunk_pos = None
+    world.update()
+    assert world._chunk_store.is_loading(key)
+    for job in list(world._chunk_store._pending_loads.values()):
+        job.wait()
+    world.update()
+
+    wall = find_entity(world, "wall")
+    assert wall._position == (100, 200)
+    assert wall._entity_id in layer.get_chunk((0, 0))._entities
+    field = wall.get_components(interact.InteractionFieldComponent)[0]
+    # back in the collider tree as well
+    assert field in world.query_point((100, 200))
@@ -0,0 +1,120 @@
+import pytest
+
+from engine.system import ecs
+from engine.physics import entity
+
+
+class PositionComponent(ecs.Component):
+    pass
+
+
+class VelocityComponent(ecs.Component):
+    pass
+
+
+class FrozenComponent(ecs.Component):
+    pass
+
+
+class FastVelocityComponent(VelocityComponent):
+    pass
+
+
+def create_entity(handler: ecs.ECSHandler, *components):
+    e = entity.Entity()
+    for component in components:
+        handler.add_component(component, e)
+    return e
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_query_matches_entities_with_every_class():
+    handler = ecs.ECSHandler()
+    e1 = create_entity(handler, PositionComponent(), VelocityComponent())
+    create_entity(handler, PositionComponent())
+    e3 = create_entity(handler, FastVelocityComponent(), PositionComponent())
+
+    result = handler.query(PositionComponent, VelocityComponent)
+    assert {x[0]._entity_id for x in result} == {e1._entity_id, e3._entity_id}
+    for e, position, velocity in result:
+        assert position._entity is e and velocity._entity is e
+
+
+def test_query_follows_added_and_removed_components():
+    handler = ecs.ECSHandler()
+    e = create_entity(handler, PositionComponent())
+    query = handler.get_query(PositionComponent, without=FrozenComponent)
+    assert len(query) == 1
+
+    frozen = FrozenComponent()
+    handler.add_component(frozen, e)
+    assert handler.query(PositionComponent, without=FrozenComponent) == []
+
+    handler.remove_component(frozen)
+    assert len(handler.query(PositionComponent, without=FrozenComponent)) == 1
+    # the same cached query object is reused
+    assert handler.get_query(PositionComponent, without=(FrozenComponent,)) is query
+
+
+def test_query_needs_component_classes():
+    handler = ecs.ECSHandler()
+    with pytest.raises(ValueError):
+        handler.query()
+    with pytest.raises(TypeError):
+        handler.query(PositionComponent())
+    with pytest.raises(TypeError):
+        handler.query(PositionComponent, without=("frozen",))
+
+
+def test_get_components_of_an_unknown_class_is_empty():
+    handler = ecs.ECSHandler()
+    assert len(handler.get_components(PositionComponent)) == 0
+    assert list(handler.iterate_components(PositionComponent)) == []
+
+
+def test_entity_get_components_is_a_tuple():
+    handler = ecs.ECSHandler()
+    velocity = VelocityComponent()
+    e = create_entity(handler, PositionComponent(), velocity)
+
+    result = e.get_components(VelocityComponent)
+    assert result == (velocity,)
+    assert e.get_components(VelocityComponent) is result
+
+    # cache is dropped when the component set changes
+    fast = FastVelocityComponent()
+    handler.add_component(fast, e)
+    assert set(e.get_components(VelocityComponent)) == {velocity, fast}
+
+
+def test_components_stay_sorted_by_priority():
+    handler = ecs.ECSHandler()
+    low, mid, high = (ecs.Component(priority=x) for x in (0, 5, 10))
+    e = create_entity(handler, mid, low)
+    # appended in order -- no re-sort needed
+    assert list(e._components.values()) == [mid, low]
+
+    handler.add_component(high, e)
+    assert list(e._components.values()) == [high, mid, low]
+    assert e.get_components(ecs.Component) == (high, mid, low)
+
+
+def test_removing_a_component_does_not_clean_it():
+    calls = []
+
+    class SharedComponent(ecs.Component):
+        def __on_clean__(self):
+            calls.append("clean")
+
+        def __on_remove__(self):
+            calls.append("remove")
+
+    handler = ecs.ECSHandler()
+    component = SharedComponent()
+    create_entity(handler, component)
+    handler.remove_component(component)
+    assert calls == ["remove"]
@@ -0,0 +1,64 @@
+import glm
+import numpy as np
+
+from engine.graphics import camera
+
+
+def create_planes(fov: float = 60, aspect: float = 1, near: float = 0.1, far=100.0):
+    # camera at the origin looking down -z
+    projection = glm.perspective(glm.radians(fov), aspect, near, far)
+    view = glm.lookAt(glm.vec3(0, 0, 0), glm.vec3(0, 0, -1), glm.vec3(0, 1, 0))
+    return camera.extract_frustum_planes(projection * view)
+
+
+def cull(planes: np.ndarray, centers: list, radii: list) -> list:
+    # module access -- pytest would collect a bare `test_spheres_in_frustum`
+    return camera.test_spheres_in_frustum(
+        planes,
+        np.array(centers, dtype="float32"),
+        np.array(radii, dtype="float32"),
+    ).tolist()
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_planes_are_normalised():
+    planes = create_planes()
+    assert planes.shape == (6, 4)
+    assert np.allclose(np.linalg.norm(planes[:, :3], axis=1), 1)
+
+
+def test_points_inside_and_outside():
+    planes = create_planes()
+    centers = [
+        (0, 0, -10),  # straight ahead
+        (0, 0, 10),  # behind
+        (50, 0, -10),  # far to the right
+        (0, -50, -10),  # far below
+        (0, 0, -200),  # past the far plane
+        (0, 0, -0.05),  # before the near plane
+    ]
+    assert cull(planes, centers, [0] * 6) == [True, False, False, False, False, False]
+
+
+def test_sphere_radius_is_a_world_distance():
+    planes = create_planes(fov=90)
+    # at z = -10 the right plane is at x = 10 -- a sphere reaching over it is visible
+    assert cull(planes, [(12, 0, -10)], [1]) == [False]
+    assert cull(planes, [(12, 0, -10)], [1.5]) == [True]
+    # far plane at 100
+    assert cull(planes, [(0, 0, -102)], [1.9]) == [False]
+    assert cull(planes, [(0, 0, -102)], [2.1]) == [True]
+
+
+def test_camera_frustum_follows_the_view():
+    cam = camera.Camera3D(1, fov=60, width=100, height=100, forward=glm.vec3(0, 0, -1))
+    ahead = [(0, 0, -10)]
+    assert cull(cam.get_frustum(), ahead, [0]) == [True]
+
+    cam.forward = glm.vec3(0, 0, 1)
+    assert cull(cam.get_frustum(), ahead, [0]) == [False]
+    assert cull(cam.get_frustum(), [(0, 0, 10)], [0]) == [True]
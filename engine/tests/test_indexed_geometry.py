@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+
+from engine.graphics import constants as gconsts
+
+
+def create_grid(size: int, seed: int = 0) -> np.ndarray:
+    # de-indexed grid of quads (x, y, u, v) -- triangles in random order
+    tris = []
+    for y in range(size):
+        for x in range(size):
+            a, b, c, d = (x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1)
+            tris.append((a, b, c))
+            tris.append((a, c, d))
+    random.Random(seed).shuffle(tris)
+    return np.array(
+        [(px, py, px / size, py / size) for tri in tris for px, py in tri],
+        dtype="float32",
+    )
+
+
+def get_triangles(vertices: np.ndarray, indices: np.ndarray) -> list:
+    # triangle multiset -- rotation of a triangle's corners is allowed, winding is not
+    result = []
+    for tri in vertices[indices].reshape(-1, 3, vertices.shape[1]).tolist():
+        corners = [tuple(x) for x in tri]
+        start = corners.index(min(corners))
+        result.append(tuple(corners[start:] + corners[:start]))
+    return sorted(result)
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_weld_vertices_reconstructs_the_input():
+    data = create_grid(8)
+    vertices, indices = gconsts.weld_vertices(data)
+
+    assert len(vertices) == 9 * 9
+    assert len(np.unique(vertices, axis=0)) == len(vertices)
+    assert indices.dtype == np.uint32
+    assert np.array_equal(vertices[indices], data)
+
+
+def test_cube_is_welded_to_its_corners():
+    data = gconsts.generate_vertex_data(
+        gconsts.Cube.VERTICES, gconsts.Cube.VERTEX_INDICES
+    )
+    vertices, indices = gconsts.weld_vertices(data)
+    assert len(vertices) == 8
+    assert len(indices) == 36
+
+
+def test_cache_optimisation_keeps_every_triangle():
+    vertices, indices = gconsts.weld_vertices(create_grid(20))
+    optimized = gconsts.optimize_vertex_cache(indices, len(vertices))
+
+    assert len(optimized) == len(indices)
+    assert get_triangles(vertices, optimized) == get_triangles(vertices, indices)
+
+
+def test_cache_optimisation_lowers_the_miss_ratio():
+    vertices, indices = gconsts.weld_vertices(create_grid(20))
+    optimized = gconsts.optimize_vertex_cache(indices, len(vertices))
+
+    before = gconsts.get_acmr(indices)
+    after = gconsts.get_acmr(optimized)
+    assert after < before
+    # a regular grid with a 16 entry cache should land well below 1 miss per tri
+    assert after < 0.9
+
+
+def test_fetch_optimisation_orders_vertices_by_first_use():
+    vertices, indices = gconsts.weld_vertices(create_grid(10))
+    optimized = gconsts.optimize_vertex_cache(indices, len(vertices))
+    fetched, remapped = gconsts.optimize_vertex_fetch(vertices, optimized)
+
+    _, first = np.unique(remapped, return_index=True)
+    assert np.all(np.diff(first) > 0)
+    assert np.array_equal(fetched[remapped], vertices[optimized])
+
+
+def test_generate_indexed_data():
+    data = create_grid(6)
+    vertices, indices = gconsts.generate_indexed_data(data)
+    assert vertices.dtype == np.float32 and indices.dtype == np.uint32
+    assert get_triangles(vertices, indices) == get_triangles(data, np.arange(len(data)))
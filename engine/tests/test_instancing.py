@@ -0,0 +1,88 @@
+import glm
+import numpy as np
+
+from engine.graphics import buffer
+from engine.graphics import shader
+from engine.graphics.ecs import c_mesh
+from engine.physics import entity
+
+# one triangle -- position, uv, texture index
+TRIANGLE = np.array(
+    [(0, 0, 0, 0, 0, 0), (1, 0, 0, 1, 0, 0), (0, 1, 0, 0, 1, 0)], dtype="float32"
+)
+
+# uv colour -- the default fragment shader indexes a sampler array, which
+# strict drivers (mesa) refuse under glsl 330
+FRAGMENT_SHADER = """#version 330 core
+in vec2 f_uv;
+in float f_tex;
+out vec4 color;
+void main() {
+    color = vec4(f_uv, f_tex, 1.0);
+}
+"""
+
+
+def create_manifold(tmp_path) -> buffer.InstancedRenderingManifold:
+    fragment_path = tmp_path / "flat-fragment.glsl"
+    fragment_path.write_text(FRAGMENT_SHADER)
+    program = shader.ShaderProgram(
+        vertex_shader=shader.Shader("assets/shaders/instanced-vertex.glsl"),
+        fragment_shader=shader.Shader(str(fragment_path)),
+    )
+    return buffer.InstancedRenderingManifold(
+        program,
+        [
+            (
+                buffer.GLBufferObject(TRIANGLE)(),
+                "3f 2f 1f",
+                "in_position",
+                "in_texcoords",
+                "in_tex",
+            )
+        ],
+        capacity=2,
+        tex_uniform_name=None,
+    )
+
+
+def create_instance(world, manifold, x: float) -> entity.Entity:
+    e = world.add_entity(entity.Entity())
+    e.add_component(
+        c_mesh.InstancedMeshComponent(manifold, glm.translate(glm.vec3(x, 0, 0)))
+    )
+    return e
+
+
+def get_offsets(manifold) -> list:
+    # x translation of every live row -- gl column major, so the last row
+    return manifold._models[: len(manifold._owners), 3, 0].tolist()
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_instances_share_one_manifold(world, gl_context, tmp_path):
+    manifold = create_manifold(tmp_path)
+    for x in range(5):
+        create_instance(world, manifold, x)
+    assert get_offsets(manifold) == [0, 1, 2, 3, 4]
+    assert manifold._capacity == 8
+
+    manifold.handle()
+    assert not manifold._dirty
+
+
+def test_removed_instances_keep_the_manifold_alive(world, gl_context, tmp_path):
+    manifold = create_manifold(tmp_path)
+    entities = [create_instance(world, manifold, x) for x in range(3)]
+
+    # an entity dying only gives back its own row
+    entities[0].clean()
+    assert get_offsets(manifold) == [2, 1]
+    assert [x._instance_index for x in manifold._owners] == [0, 1]
+    assert manifold._vao is not None
+    assert manifold._instance_buffer().size == manifold._models.nbytes
+    manifold.handle()
@@ -0,0 +1,114 @@
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from engine.graphics import mesh
+
+# two triangles sharing an edge -- position + uv
+VERTICES = np.array(
+    [
+        (0, 0, 0, 0, 0),
+        (1, 0, 0, 1, 0),
+        (1, 1, 0, 1, 1),
+        (0, 1, -2, 0, 1),
+    ],
+    dtype="float32",
+)
+INDICES = np.array([0, 1, 2, 0, 2, 3], dtype="uint32")
+
+OBJ_SOURCE = """v 0 0 0
+v 1 0 0
+v 1 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+f 1/1 2/2 3/3
+"""
+
+
+def create_mesh(half: bool = False) -> mesh.MeshData:
+    return mesh.MeshData(
+        VERTICES, INDICES, "3f 2f", ["in_position", "in_texcoords"], half=half
+    )
+
+
+def create_source(tmp_path, text: str = "source") -> str:
+    path = tmp_path / "model.obj"
+    path.write_text(text)
+    return str(path)
+
+
+def read_mtime(cache_path: str) -> float:
+    with open(cache_path, "rb") as f:
+        f.seek(mesh.MTIME_OFFSET)
+        return struct.unpack("<d", f.read(8))[0]
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+@pytest.mark.parametrize("half", [False, True])
+def test_cache_round_trip(tmp_path, half):
+    source = create_source(tmp_path)
+    cache_path = str(tmp_path / "cache" / "model.mesh")
+    data = create_mesh(half)
+    data.write_cache(cache_path, source)
+
+    loaded = mesh.MeshData.read_cache(cache_path, source)
+    assert loaded._half == half
+    assert loaded._vertices.dtype == (np.float16 if half else np.float32)
+    assert np.array_equal(loaded._vertices, data._vertices)
+    assert np.array_equal(loaded._indices, INDICES)
+    assert loaded.get_layout() == ("3f2 2f2" if half else "3f 2f")
+    assert loaded.get_attributes() == ["in_position", "in_texcoords"]
+    assert loaded.get_bounds() == ((0, 0, -2), (1, 1, 0))
+    # the data is mapped from the file, not copied
+    assert isinstance(loaded._vertices, np.memmap)
+
+
+def test_touched_source_keeps_the_cache(tmp_path):
+    source = create_source(tmp_path)
+    cache_path = str(tmp_path / "model.mesh")
+    create_mesh().write_cache(cache_path, source)
+
+    mtime = os.path.getmtime(source) + 100
+    os.utime(source, (mtime, mtime))
+    assert mesh.MeshData.read_cache(cache_path, source) is not None
+    # the new mtime is stored -- the next load skips the hash
+    assert read_mtime(cache_path) == mtime
+
+
+def test_changed_source_invalidates_the_cache(tmp_path):
+    source = create_source(tmp_path)
+    cache_path = str(tmp_path / "model.mesh")
+    create_mesh().write_cache(cache_path, source)
+
+    create_source(tmp_path, "changed")
+    mtime = os.path.getmtime(source) + 100
+    os.utime(source, (mtime, mtime))
+    assert mesh.MeshData.read_cache(cache_path, source) is None
+
+
+def test_precisions_use_their_own_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(mesh.MeshData, "CACHE", {})
+    source = create_source(tmp_path, OBJ_SOURCE)
+    folder = str(tmp_path / "cache")
+
+    full = mesh.MeshData.load_obj(source, cache_folder=folder)
+    half = mesh.MeshData.load_obj(source, half=True, cache_folder=folder)
+    assert not full._half and half._half
+    assert mesh.MeshData.load_obj(source, cache_folder=folder) is full
+    assert len(os.listdir(folder)) == 2
+
+    # both files stay valid -- neither precision parses the obj again
+    def fail(*args, **kwargs):
+        raise AssertionError("mesh was parsed instead of read from the cache")
+
+    monkeypatch.setattr(mesh.MeshData, "CACHE", {})
+    monkeypatch.setattr(mesh.MeshData, "parse_obj", fail)
+    assert mesh.MeshData.load_obj(source, cache_folder=folder)._half is False
+    assert mesh.MeshData.load_obj(source, half=True, cache_folder=folder)._half
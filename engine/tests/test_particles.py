@@ -0,0 +1,129 @@
+import pygame
+
+import engine.constants as consts
+
+from engine.ecs import c_particle_handler
+from engine.graphics import particle
+from engine.system import ecs
+from engine.system.world import Layer, STORAGE_GRID
+from engine.physics import entity
+
+
+def create_emitter(world, position=(0, 0), **kwargs):
+    e = world.add_entity(entity.Entity())
+    e.position = pygame.Vector2(position)
+    emitter = e.add_component(
+        c_particle_handler.ParticleHandlerComponent(updates_per_second=60, **kwargs)
+    )
+    return emitter
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_particle_system_steps_active_emitters(world, job_system):
+    world.add_system(c_particle_handler.ParticleSystem())
+    emitter = create_emitter(world, emit_count=4)
+    steps = []
+
+    def create_func(x):
+        steps.append("step")
+        c_particle_handler.default_create_func(x)
+
+    emitter.update_functions(create_func=create_func)
+
+    world.update()
+    # stepped once by the system, the component update only rendered
+    assert steps == ["step"]
+    assert emitter._particle_count == 4
+    assert not emitter._stepped
+
+
+def test_emitters_without_the_system_step_themselves(world):
+    emitter = create_emitter(world, emit_count=3)
+    world.update()
+    world.update()
+    assert emitter._particle_count == 6
+
+
+def test_dead_particles_are_removed(world):
+    emitter = create_emitter(world, emit_count=5, lifetime=0.05)
+    for _ in range(10):
+        world.update()
+    # every particle lives for 3 frames -- older ones were swap-removed
+    assert emitter._particle_count <= 5 * 4
+    assert (emitter.get_alive(emitter._ages) <= 0.05).all()
+
+
+def test_columns_grow_up_to_max_particles(world):
+    emitter = create_emitter(world, emit_count=1000, max_particles=2500)
+    assert emitter._capacity == consts.DEFAULT_PARTICLE_START_CAPACITY
+
+    world.update()
+    emitter._positions[:1000] = 7
+    emitter._velocities[:1000] = 0
+    world.update()
+    assert emitter._capacity == 2048
+    # live rows are carried over into the grown columns
+    assert (emitter._positions[:1000] == 7).all()
+    assert all(len(x) == emitter._capacity for x in emitter._columns)
+
+    for _ in range(3):
+        world.update()
+    assert emitter._particle_count == emitter._capacity == 2500
+
+
+def test_pygame_rendering_without_a_gl_context(world):
+    emitter = create_emitter(world)
+    assert consts.MGL_CONTEXT is None
+    assert emitter._render_func is c_particle_handler.default_render_func
+
+
+def test_particle_system_without_a_world_steps_every_emitter(job_system):
+    handler = ecs.ECSHandler()
+    system = handler.add_system(c_particle_handler.ParticleSystem())
+    emitter = c_particle_handler.ParticleHandlerComponent()
+    handler.add_component(emitter, entity.Entity())
+    assert system.get_args()[0] == [emitter]
+
+
+def test_particle_system_clamps_emitters_outside_of_a_grid(world, job_system):
+    world.add_layer(Layer(1, storage=STORAGE_GRID, grid_bounds=(-2, -2, 2, 2)))
+    system = world.add_system(c_particle_handler.ParticleSystem())
+    e = world.add_entity(entity.Entity(zlayer=1))
+    emitter = e.add_component(c_particle_handler.ParticleHandlerComponent())
+    # far past the grid edge -- stored in the active edge chunk (1, 0)
+    e.position = pygame.Vector2(consts.DEFAULT_CHUNK_PIXEL_WIDTH * 100, 0)
+    world.update()
+    assert world.get_chunk_tick((100, 0)) is None
+    assert system.get_args()[0] == [emitter]
+
+
+def test_gpu_particles_are_drawn_when_the_batch_flushes(world, gl_context, monkeypatch):
+    batch = particle.ParticleBatch()
+    monkeypatch.setattr(consts, "CTX_PARTICLE_BATCH", batch)
+    emitter = create_emitter(world, position=(200, 200), emit_count=50)
+    assert emitter._render_func is c_particle_handler.gpu_render_func
+
+    # the update only uploads -- nothing is drawn before the scene
+    world.update()
+    assert emitter._particle_count == 50
+    target = gl_context.fbo
+    assert not any(target.read())
+
+    batch.flush()
+    assert batch.get_draw_calls() == 1
+    assert any(target.read())
+    assert not batch._draws
+
+
+def test_gpu_instance_buffer_grows_with_the_emitter(world, gl_context, monkeypatch):
+    monkeypatch.setattr(consts, "CTX_PARTICLE_BATCH", particle.ParticleBatch())
+    emitter = create_emitter(world, emit_count=1000)
+    world.update()
+
+    renderer = emitter._renderer
+    assert renderer.get_capacity() >= 1000
+    assert renderer._instance_buffer().size == renderer._staging.nbytes
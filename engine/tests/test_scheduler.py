@@ -0,0 +1,151 @@
+import pytest
+
+from engine.system import ecs
+from engine.system import scheduler
+from engine.physics import entity
+
+
+class PositionComponent(ecs.Component):
+    pass
+
+
+class VelocityComponent(ecs.Component):
+    pass
+
+
+class CounterComponent(ecs.Component):
+    def __init__(self):
+        super().__init__()
+        self._count = 0
+
+    def update(self):
+        self._count += 1
+
+
+def create_entity(handler: ecs.ECSHandler, *components):
+    e = entity.Entity()
+    for component in components:
+        handler.add_component(component, e)
+    return e
+
+
+def get_stage_names(handler: ecs.ECSHandler) -> list:
+    return [[x._name for x in stage] for stage in handler._scheduler.sort_stages()]
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_independent_systems_share_a_stage():
+    handler = ecs.ECSHandler()
+    handler.add_system(scheduler.System("a", lambda: None, reads=(PositionComponent,)))
+    handler.add_system(scheduler.System("b", lambda: None, reads=(PositionComponent,)))
+    handler.add_system(scheduler.System("c", lambda: None, writes=(VelocityComponent,)))
+    assert get_stage_names(handler) == [["a", "b", "c"]]
+
+
+def test_conflicting_systems_keep_registration_order():
+    handler = ecs.ECSHandler()
+    handler.add_system(
+        scheduler.System("integrate", lambda: None, writes=(PositionComponent,))
+    )
+    handler.add_system(
+        scheduler.System("render", lambda: None, reads=(PositionComponent,))
+    )
+    handler.add_system(
+        scheduler.System("input", lambda: None, writes=(VelocityComponent,))
+    )
+    assert get_stage_names(handler) == [["integrate", "input"], ["render"]]
+
+
+def test_explicit_ordering():
+    handler = ecs.ECSHandler()
+    handler.add_system(scheduler.System("late", lambda: None, after=("early",)))
+    handler.add_system(scheduler.System("early", lambda: None))
+    handler.add_system(scheduler.System("first", lambda: None, before=("early",)))
+    assert get_stage_names(handler) == [["first"], ["early"], ["late"]]
+
+
+def test_cycles_are_reported():
+    handler = ecs.ECSHandler()
+    handler.add_system(scheduler.System("a", lambda: None, after=("b",)))
+    handler.add_system(scheduler.System("b", lambda: None, after=("a",)))
+    with pytest.raises(Exception, match="Cyclic"):
+        handler.run_systems()
+
+
+def test_systems_run_over_their_query():
+    handler = ecs.ECSHandler()
+    create_entity(handler, PositionComponent(), VelocityComponent())
+    create_entity(handler, PositionComponent())
+
+    seen = []
+    handler.add_system(
+        scheduler.System(
+            "move",
+            lambda results: seen.extend(results),
+            query=(PositionComponent, VelocityComponent),
+        )
+    )
+    handler.run_systems()
+    assert len(seen) == 1
+
+    with pytest.raises(ValueError):
+        handler.add_system(scheduler.System("move", lambda: None))
+
+
+def test_component_system_updates_every_component():
+    handler = ecs.ECSHandler()
+    c1, c2 = CounterComponent(), CounterComponent()
+    e = create_entity(handler, c1, c2)
+    handler.add_system(scheduler.ComponentSystem(CounterComponent))
+
+    # the system updates both components, the entity walk skips them
+    handler.run_systems()
+    e.handle_components()
+    assert (c1._count, c2._count) == (1, 1)
+
+    handler.remove_system("CounterComponent.update")
+    e.handle_components()
+    assert (c1._count, c2._count) == (2, 2)
+
+
+def test_managed_classes_are_per_handler():
+    managed = ecs.ECSHandler()
+    other = ecs.ECSHandler()
+    managed.add_system(scheduler.ComponentSystem(CounterComponent))
+
+    c1, c2 = CounterComponent(), CounterComponent()
+    e1 = create_entity(managed, c1)
+    e2 = create_entity(other, c2)
+
+    e1.handle_components()
+    e2.handle_components()
+    assert (c1._count, c2._count) == (0, 1)
+
+
+def test_parallel_systems_run_on_the_job_system(job_system):
+    import threading
+
+    handler = ecs.ECSHandler()
+    threads = {}
+    handler.add_system(
+        scheduler.System(
+            "worker",
+            lambda: threads.update(worker=threading.current_thread()),
+            writes=(PositionComponent,),
+            parallel=True,
+        )
+    )
+    handler.add_system(
+        scheduler.System(
+            "main",
+            lambda: threads.update(main=threading.current_thread()),
+            writes=(VelocityComponent,),
+        )
+    )
+    handler.run_systems()
+    assert threads["main"] is threading.main_thread()
+    assert threads["worker"] is not threading.main_thread()
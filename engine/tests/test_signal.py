@@ -0,0 +1,114 @@
+import pytest
+
+from engine.system import signal
+
+
+def create_handler(capacity: int = 4, validation: str = signal.VALIDATE_EMIT):
+    handler = signal.SignalHandler(capacity=capacity, validation=validation)
+    received = []
+    handler.register_signal("event", [int])
+    handler.register_receiver("event", received.append)
+    return handler, received
+
+
+def get_queued(handler: signal.SignalHandler) -> list:
+    return [packet.args for packet in handler.get_signal_queue()]
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_capacity_is_a_power_of_two():
+    assert len(signal.SignalHandler(capacity=5)._queue) == 8
+    assert len(signal.SignalHandler(capacity=8)._queue) == 8
+    assert len(signal.SignalHandler(capacity=1)._queue) == 1
+
+
+def test_signals_are_handled_in_emit_order():
+    handler, received = create_handler()
+    for i in range(3):
+        handler.emit_signal("event", i)
+    assert get_queued(handler) == [(0,), (1,), (2,)]
+
+    handler.handle()
+    assert received == [0, 1, 2]
+    assert not handler.get_signal_queue()
+
+
+def test_ring_grows_without_reordering():
+    handler, received = create_handler(capacity=4)
+    # `handle` rewinds the head -- start near the end so the packets wrap
+    handler._head = 3
+    for i in range(4):
+        handler.emit_signal("event", i)
+    assert handler._queue[0] == (handler.get_signal("event"), (1,))
+
+    # full -- the fifth packet doubles the ring
+    handler.emit_signal("event", 4)
+    assert len(handler._queue) == 8 and handler._head == 0
+    assert get_queued(handler) == [(i,) for i in range(5)]
+
+    handler.handle()
+    assert received == [0, 1, 2, 3, 4]
+
+
+def test_signals_emitted_by_receivers_are_handled_in_the_same_pass():
+    handler, received = create_handler(capacity=2)
+
+    def chain(value):
+        # grows the ring from inside `handle`
+        if value < 10:
+            handler.emit_signal("event", value + 1)
+            handler.emit_signal("event", value + 100)
+
+    handler.register_receiver("event", chain)
+    handler.emit_signal("event", 0)
+    handler.handle()
+
+    assert received[:3] == [0, 1, 100]
+    assert sorted(received) == sorted(list(range(11)) + list(range(100, 110)))
+    assert not handler.get_signal_queue()
+
+
+def test_unregistered_signals_are_dropped():
+    handler, received = create_handler()
+    handler.emit_signal("missing", 1)
+    assert not handler.get_signal_queue()
+
+
+def test_emit_validation():
+    handler, _ = create_handler()
+    with pytest.raises(Exception):
+        handler.emit_signal("event", "text")
+    with pytest.raises(Exception):
+        handler.emit_signal("event")
+
+    # unchecked signals queue anything
+    handler.register_signal("raw", [int], validation=signal.VALIDATE_NONE)
+    handler.emit_signal("raw", "text")
+    assert get_queued(handler) == [("text",)]
+
+
+def test_template_entries_must_be_types():
+    handler = signal.SignalHandler()
+    with pytest.raises(TypeError):
+        handler.register_signal("bad", [1])
+    handler.register_signal("event", [int])
+    with pytest.raises(TypeError):
+        handler.register_receiver("event", None)
+
+
+def test_removed_receivers_are_not_called():
+    handler, received = create_handler()
+    other = []
+    receiver = handler.register_receiver("event", other.append)
+    handler.emit_signal("event", 1)
+    handler.handle()
+
+    handler.get_signal("event").remove_receiver(receiver)
+    handler.emit_signal("event", 2)
+    handler.handle()
+    assert received == [1, 2]
+    assert other == [1]
@@ -0,0 +1,77 @@
+import pygame
+
+import engine.constants as consts
+
+from engine.system.world import Layer
+from engine.physics import entity
+from engine.ecs import c_sprite
+
+# small chunks -- several fit on the framebuffer
+CHUNK_WIDTH = 512
+
+
+def create_sprite(world, position, zlayer=1, batched=False) -> entity.Entity:
+    image = pygame.Surface((8, 8), pygame.SRCALPHA)
+    image.fill((255, 0, 0))
+
+    e = world.add_entity(entity.Entity(zlayer=zlayer))
+    e.add_component(c_sprite.SpriteComponent(image=image))
+    e.add_component(c_sprite.SpriteRendererComponent(batched=batched))
+    e.position = pygame.Vector2(position)
+    return e
+
+
+def create_static_layer(world, monkeypatch) -> Layer:
+    monkeypatch.setattr(consts, "DEFAULT_CHUNK_PIXEL_WIDTH", CHUNK_WIDTH)
+    monkeypatch.setattr(consts, "DEFAULT_CHUNK_PIXEL_HEIGHT", CHUNK_WIDTH)
+    layer = Layer(1, static=True)
+    world.add_layer(layer)
+    return layer
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_batched_sprites_skip_the_batch_on_static_layers(world, monkeypatch):
+    create_static_layer(world, monkeypatch)
+    # no sprite batch in the tests -- submitting to it would fail
+    assert consts.CTX_SPRITE_BATCH is None
+    create_sprite(world, (10, 10), batched=True)
+    world.update()
+
+
+def test_chunks_off_screen_free_their_cache(world, monkeypatch):
+    layer = create_static_layer(world, monkeypatch)
+    create_sprite(world, (10, 10))
+    create_sprite(world, (CHUNK_WIDTH + 10, 10))
+    world.update()
+
+    layer.render_cached_chunks()
+    left, right = layer.find_chunk((0, 0)), layer.find_chunk((1, 0))
+    assert left._cache is not None and right._cache is not None
+    assert consts.W_FRAMEBUFFER.get_at((12, 12)) == pygame.Color(255, 0, 0)
+
+    # a smaller framebuffer only shows the first chunk
+    monkeypatch.setattr(
+        consts, "W_FRAMEBUFFER", pygame.Surface((256, 256), pygame.SRCALPHA)
+    )
+    layer.render_cached_chunks()
+    assert left._cache is not None
+    assert right._cache is None and not right._cached_rects
+    assert layer._cached_chunks == {left._chunk_id}
+
+
+def test_removed_chunks_free_their_cache(world, monkeypatch):
+    layer = create_static_layer(world, monkeypatch)
+    create_sprite(world, (10, 10))
+    world.update()
+    layer.render_cached_chunks()
+
+    chunk = layer.find_chunk((0, 0))
+    layer.remove_chunk(chunk)
+    layer.update()
+    assert chunk._cache is None
+    assert layer.find_chunk((0, 0)) is None
+    assert not layer._cached_chunks
@@ -0,0 +1,57 @@
+import pygame
+import pytest
+
+from engine.graphics import texture
+
+COLOR = (10, 20, 30, 200)
+
+
+def apply_swizzle(swizzle: str, pixel: bytes) -> tuple:
+    # what the gl sampler returns for a texel uploaded from the raw pixel bytes
+    source = {"R": pixel[0], "G": pixel[1], "B": pixel[2], "A": pixel[3]}
+    source.update({"0": 0, "1": 255})
+    return tuple(source[x] for x in swizzle)
+
+
+def create_surface(masks: tuple, alpha: bool) -> pygame.Surface:
+    flags = pygame.SRCALPHA if alpha else 0
+    result = pygame.Surface((4, 4), flags, 32, masks)
+    result.fill(COLOR)
+    return result
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+@pytest.mark.parametrize(
+    "masks",
+    [
+        (0x00FF0000, 0x0000FF00, 0x000000FF, 0xFF000000),  # argb
+        (0x000000FF, 0x0000FF00, 0x00FF0000, 0xFF000000),  # abgr
+        (0xFF000000, 0x00FF0000, 0x0000FF00, 0x000000FF),  # rgba
+        # not its own inverse -- a byte -> channel map would fail here
+        (0x0000FF00, 0x00FF0000, 0xFF000000, 0x000000FF),
+    ],
+)
+def test_swizzle_maps_pixel_bytes_to_rgba(masks):
+    surface = create_surface(masks, alpha=True)
+    swizzle = texture.StreamingTexture.get_swizzle(surface)
+    pixel = bytes(surface.get_view("0"))[:4]
+    assert apply_swizzle(swizzle, pixel) == COLOR
+
+
+def test_missing_alpha_is_opaque():
+    surface = create_surface((0x00FF0000, 0x0000FF00, 0x000000FF, 0), alpha=False)
+    swizzle = texture.StreamingTexture.get_swizzle(surface)
+    assert swizzle[3] == "1"
+    pixel = bytes(surface.get_view("0"))[:4]
+    assert apply_swizzle(swizzle, pixel) == COLOR[:3] + (255,)
+
+
+def test_default_framebuffer_surface(framebuffer):
+    swizzle = texture.StreamingTexture.get_swizzle(framebuffer)
+    framebuffer.fill(COLOR)
+    pixel = bytes(framebuffer.get_view("0"))[:4]
+    assert apply_swizzle(swizzle, pixel) == COLOR
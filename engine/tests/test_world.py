@@ -0,0 +1,125 @@
+import pygame
+
+import engine.constants as consts
+
+from engine.system import ecs
+from engine.system.world import Layer, STORAGE_GRID
+from engine.physics import entity
+from engine.physics import interact
+from engine.physics.ecs import c_AABB
+
+CHUNK_WIDTH = consts.DEFAULT_CHUNK_PIXEL_WIDTH
+
+
+def get_chunk_holding(world, e) -> tuple:
+    # every chunk of the entity's layer that stores it
+    return [
+        chunk._chunk_position
+        for chunk in world.get_layer(e._zlayer)._chunks.values()
+        if e._entity_id in chunk._entities
+    ]
+
+
+# ======================================================================== #
+# tests
+# ======================================================================== #
+
+
+def test_entity_changes_chunk_when_moved(world):
+    e = world.add_entity(entity.Entity())
+    e.position = pygame.Vector2(10, 10)
+    world.update()
+    assert get_chunk_holding(world, e) == [(0, 0)]
+
+    e.position = pygame.Vector2(CHUNK_WIDTH + 10, 10)
+    world.update()
+    assert get_chunk_holding(world, e) == [(1, 0)]
+    assert e._chunk_pos == e._prev_chunk_pos == (1, 0)
+    assert not world._moved_entities
+
+
+def test_entity_changes_layer(world):
+    e = world.add_entity(entity.Entity())
+    world.update()
+    e.zlayer = 2
+    world.update()
+    assert get_chunk_holding(world, e) == [(0, 0)]
+    assert e._layer is world.get_layer(2)
+    assert e._entity_id not in world.get_chunk((0, 0), 0)._entities
+
+
+def test_velocity_moves_entity_across_chunks(world):
+    e = world.add_entity(entity.Entity())
+    e.add_component(c_AABB.AABBColliderComponent(10, 10))
+    collider = e.add_component(interact.InteractionFieldComponent())
+    e.position = pygame.Vector2(CHUNK_WIDTH - 1, 10)
+    # one frame at 60 fps moves the entity 10 pixels to the right
+    collider._velocity = pygame.Vector2(600, 0)
+    world.update()
+
+    assert get_chunk_holding(world, e) == [(1, 0)]
+    assert not world._moved_entities
+
+
+def test_entities_can_leave_a_grid_layer(world):
+    layer = Layer(1, storage=STORAGE_GRID, grid_bounds=(-2, -2, 2, 2))
+    world.add_layer(layer)
+
+    # outside of the grid -- kept in the nearest edge chunk
+    e = world.add_entity(entity.Entity(zlayer=1))
+    e.position = pygame.Vector2(CHUNK_WIDTH * 100, 0)
+    world.update()
+    edge = layer.find_chunk((1, 0))
+    assert get_chunk_holding(world, e) == [(1, 0)]
+
+    e.position = pygame.Vector2(0, 0)
+    world.update()
+    assert get_chunk_holding(world, e) == [(0, 0)]
+    assert e._entity_id not in edge._entities
+
+
+class DeltaComponent(ecs.Component):
+    def __init__(self):
+        super().__init__()
+        self._seen = []
+
+    def update(self):
+        self._seen.append((consts.DELTA_TIME, self._entity._delta_time))
+
+
+def test_outer_chunks_get_a_scaled_delta_time(world):
+    interval = consts.DEFAULT_CHUNK_OUTER_TICK_INTERVAL
+    ring = consts.DEFAULT_CHUNK_SIMULATION_DISTANCE
+    inner = world.add_entity(entity.Entity())
+    outer = entity.Entity()
+    outer._position = pygame.Vector2(CHUNK_WIDTH * ring + 10, 10)
+    world.add_entity(outer)
+    inner_delta = inner.add_component(DeltaComponent())
+    outer_delta = outer.add_component(DeltaComponent())
+
+    for _ in range(interval * 2):
+        world.update()
+
+    frame = consts.DELTA_TIME
+    assert inner_delta._seen == [(frame, frame)] * interval * 2
+    # the global delta time is never touched -- only the entity sees the scaled one
+    assert outer_delta._seen == [(frame, frame * interval)] * 2
+
+
+def test_failing_chunk_update_keeps_the_global_delta_time(world):
+    e = entity.Entity()
+    e._position = pygame.Vector2(
+        CHUNK_WIDTH * consts.DEFAULT_CHUNK_SIMULATION_DISTANCE, 0
+    )
+    e.update = lambda: 1 / 0
+    world.add_entity(e)
+
+    frame = consts.DELTA_TIME
+    for _ in range(consts.DEFAULT_CHUNK_OUTER_TICK_INTERVAL):
+        try:
+            world.update()
+        except ZeroDivisionError:
+            break
+    else:
+        raise AssertionError("the outer chunk never updated")
+    assert consts.DELTA_TIME == frame
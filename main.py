@@ -18,7 +18,6 @@ if not os.environ.get("PYTHONHASHSEED"):
 
 import glm
 import pygame
-import pywavefront
 import numpy as np
 
 import engine.context as ctx
@@ -33,7 +32,9 @@ from engine.system import ecs
 from engine.system import log
 from engine.system import signal
 from engine.system import animation
+from engine.system import scheduler
 
+from engine.graphics import mesh
 from engine.graphics import buffer
 from engine.graphics import shader
 from engine.graphics import camera
@@ -81,6 +82,14 @@ ctx.init()
 # ======================================================================== #
 
 
+# ------------------------------------------------------------------------ #
+# systems
+
+consts.CTX_ECS_HANDLER.add_system(
+    scheduler.ComponentSystem(animation.AnimatedSpriteComponent)
+)
+consts.CTX_ECS_HANDLER.add_system(c_particle_handler.ParticleSystem())
+
 # ------------------------------------------------------------------------ #
 # testing zone
 
@@ -113,7 +122,7 @@ if True:
     )
     e1spr._extra["offset"] = pygame.Vector2(50, 50)
     e1.add_component(c_sprite.SpriteRendererComponent(e1spr))
-    e1._position = pygame.Vector2(100, 100)
+    e1.position = pygame.Vector2(100, 100)
     e1.zlayer = 2
 
     def draw_image():
@@ -155,7 +164,7 @@ if True:
     ph1 = e3.add_component(
         c_particle_handler.ParticleHandlerComponent(updates_per_second=10)
     )
-    e3._position += pygame.Vector2(300, 100)
+    e3.position += pygame.Vector2(300, 100)
 
     # test -- load animation
     reg1 = animation.Animation.from_json(
@@ -180,7 +189,7 @@ if True:
     )
     e4.add_component(c_sprite.SpriteComponent())
     e4.add_component(c_sprite.SpriteRendererComponent())
-    e4._position += pygame.Vector2(300, 100)
+    e4.position += pygame.Vector2(300, 100)
 
     def draw_animation():
         reg1.update()
@@ -261,7 +270,7 @@ if True:
     )
     left_wall.add_component(c_sprite.SpriteComponent())
     left_wall.add_component(c_sprite.SpriteRendererComponent())
-    left_wall._position += pygame.Vector2(100, 200)
+    left_wall.position += pygame.Vector2(100, 200)
 
     right_wall = consts.CTX_WORLD.add_entity(entity.Entity())
     right_wall.add_component(c_AABB.AABBColliderComponent(20, 300))
@@ -270,7 +279,7 @@ if True:
     )
     right_wall.add_component(c_sprite.SpriteComponent())
     right_wall.add_component(c_sprite.SpriteRendererComponent())
-    right_wall._position += pygame.Vector2(500, 200)
+    right_wall.position += pygame.Vector2(500, 200)
 
     top_wall = consts.CTX_WORLD.add_entity(entity.Entity())
     top_wall.add_component(c_AABB.AABBColliderComponent(600, 20))
@@ -279,7 +288,7 @@ if True:
     )
     top_wall.add_component(c_sprite.SpriteComponent())
     top_wall.add_component(c_sprite.SpriteRendererComponent())
-    top_wall._position += pygame.Vector2(200, 100)
+    top_wall.position += pygame.Vector2(200, 100)
 
     bottom_wall = consts.CTX_WORLD.add_entity(entity.Entity(name="bottom-wall"))
     bottom_wall.add_component(c_AABB.AABBColliderComponent(600, 20))
@@ -288,15 +297,15 @@ if True:
     )
     bottom_wall.add_component(c_sprite.SpriteComponent())
     bottom_wall.add_component(c_sprite.SpriteRendererComponent())
-    bottom_wall._position += pygame.Vector2(200, 350)
+    bottom_wall.position += pygame.Vector2(200, 350)
 
 # ------------------------------------------------------------------------ #
 # entities
 
-some_random_block._position += pygame.Vector2(300, 200)
-eleft._position += pygame.Vector2(240, 200)
-eright._position += pygame.Vector2(450, 200)
-edown._position += pygame.Vector2(300, 300)
+some_random_block.position += pygame.Vector2(300, 200)
+eleft.position += pygame.Vector2(240, 200)
+eright.position += pygame.Vector2(450, 200)
+edown.position += pygame.Vector2(300, 300)
 
 
 # some_random_block.alive = False
@@ -336,7 +345,9 @@ _3dcam = consts.CTX_WORLD.add_entity(
         orientation_lock_vec=glm.vec3(0, 1, 0),
     )
 )
-complete_vert_data = buffer.GLBufferObject(
+_3dcam.set_active()
+# welded + cache optimised cube -- drawn through an index buffer
+cube_vertices, cube_indices = gfx_consts.generate_indexed_data(
     np.hstack(
         [
             gfx_consts.Cube.get_cube_vert(),
@@ -367,22 +378,45 @@ complete_vert_data = buffer.GLBufferObject(
         ]
     )
 )
+cube_bounds = gfx_consts.calculate_bounding_sphere(cube_vertices)
+complete_vert_data = buffer.GLBufferObject(cube_vertices)
+complete_index_data = buffer.GLBufferObject(cube_indices)
 shader_program = shader.ShaderProgram(
     vertex_shader=shader.Shader("assets/shaders/default-vertex.glsl"),
     fragment_shader=shader.Shader("assets/shaders/default-fragment.glsl"),
 )
 
 
+instanced_shader_program = shader.ShaderProgram(
+    vertex_shader=shader.Shader("assets/shaders/instanced-vertex.glsl"),
+    fragment_shader=shader.Shader("assets/shaders/default-fragment.glsl"),
+)
+
+
 # create 100 random entities spinning and slightly moving up and down
 from engine.tests import e_cube
 
+cube_manifold = buffer.InstancedRenderingManifold(
+    instanced_shader_program,
+    [
+        (
+            complete_vert_data(),
+            "3f 2f 1f",
+            "in_position",
+            "in_texcoords",
+            "in_tex",
+        )
+    ],
+    index_buffer=complete_index_data,
+)
+
+# one draw call for every cube
+cubes_entity = consts.CTX_WORLD.add_entity(entity.Entity(name="cubes"))
+cubes_entity.add_component(c_mesh.MeshComponent(cube_manifold))
+
 for i in range(100):
     consts.CTX_WORLD.add_entity(
-        e_cube.CubeEntity(
-            name=f"cube-{i}",
-            shader_program=shader_program,
-            complete_vert_data=complete_vert_data,
-        )
+        e_cube.CubeEntity(name=f"cube-{i}", manifold=cube_manifold)
     )
 
 
@@ -401,18 +435,20 @@ rman = render_entity.add_component(
                         "in_tex",
                     )
                 ],
+                index_buffer=complete_index_data,
             ),
-        )
+        ),
+        bounds=cube_bounds,
     )
 )
 
-rman().set_texture(0, texture.Texture(raw_image=consts.W_FRAMEBUFFER))
+# one streaming texture for the pygame framebuffer -- written in place every frame
+framebuffer_texture = texture.StreamingTexture(consts.W_FRAMEBUFFER)
+rman().set_texture(0, framebuffer_texture)
 
 m_model_rman = glm.mat4()
 
 rman().write_uniform("m_model", m_model_rman)
-rman().write_uniform("m_proj", _3dcam._projection)
-rman().write_uniform("m_view", _3dcam._view)
 
 
 def sub_task1():
@@ -422,7 +458,6 @@ def sub_task1():
     result = glm.rotate(result, consts.RUN_TIME, glm.vec3(0, 1, 0))
 
     rman().write_uniform("m_model", result)
-    rman().set_texture(0, texture.Texture(raw_image=consts.W_FRAMEBUFFER))
     rman().set_texture(1, texture.Texture.get_texture("assets/snowman.jpg"))
 
 
@@ -446,8 +481,10 @@ rman2 = render_entity2.add_component(
                         "in_tex",
                     )
                 ],
+                index_buffer=complete_index_data,
             ),
-        )
+        ),
+        bounds=cube_bounds,
     )
 )
 
@@ -530,7 +567,7 @@ rman3 = render_entity3.add_component(
     )
 )
 
-rman3().set_texture(0, texture.Texture(raw_image=consts.W_FRAMEBUFFER))
+rman3().set_texture(0, framebuffer_texture)
 
 m_model_rman3 = glm.mat4()
 m_model_rman3 = glm.rotate(m_model_rman3, math.pi / 2, glm.vec3(1, 0, 0))
@@ -538,20 +575,17 @@ m_model_rman3 = glm.translate(m_model_rman3, glm.vec3(0, 0, 20))
 m_model_rman3 = glm.scale(m_model_rman3, glm.vec3(10))
 
 rman3().write_uniform("m_model", m_model_rman3)
-# rman3().write_uniform("m_proj", ortho_cam._projection)
-# rman3().write_uniform("m_view", ortho_cam._view)
-rman3().write_uniform("m_proj", _3dcam._projection)
-rman3().write_uniform("m_view", _3dcam._view)
+# ortho_cam.set_active()
 
 
 def sub_task3():
     global rman3, m_model_rman3
 
-    rman3().set_texture(0, texture.Texture(raw_image=consts.W_FRAMEBUFFER))
+    framebuffer_texture.update()
     # rman3().set_texture(0, consts.MGL_FRAMEBUFFER.get_color_attachments()[0])
 
 
-render_entity3.add_component(c_task.TaskComponent("sub_task", sub_task3))
+render_entity3.add_component(c_task.TaskComponent("sub_task", sub_task3), priority=1)
 
 
 # load the bugatti model and render it
@@ -559,10 +593,10 @@ cat_shader = shader.ShaderProgram(
     vertex_shader=shader.Shader("assets/shaders/model-vertex.glsl"),
     fragment_shader=shader.Shader("assets/shaders/model-fragment.glsl"),
 )
-c_name, c_material = pywavefront.Wavefront(
-    "assets/models/cat/20430_Cat_v1_NEW.obj", parse=True
-).materials.popitem()
-c_vdata = buffer.GLBufferObject(np.array(c_material.vertices, dtype="float32"))
+# parsed once, then memory-mapped from the mesh cache on later launches
+c_mesh_data = mesh.MeshData.load_obj("assets/models/cat/20430_Cat_v1_NEW.obj")
+c_vdata = c_mesh_data.create_vertex_buffer()
+c_idata = c_mesh_data.create_index_buffer()
 c_tex = texture.Texture.get_texture(
     "assets/models/cat/20430_cat_diff_v1.jpg", yflip=True
 )
@@ -574,18 +608,12 @@ cat_model_mesh = cat_entity.add_component(
         buffer.RenderingManifold(
             vao=buffer.VAOObject(
                 cat_shader,
-                [
-                    (
-                        c_vdata(),
-                        "2f 3f 3f",
-                        "in_texcoords",
-                        "in_normal",
-                        "in_position",
-                    )
-                ],
+                [c_mesh_data.get_attribute_format(c_vdata)],
+                index_buffer=c_idata,
             ),
             tex_count=1,
-        )
+        ),
+        bounds=c_mesh_data.get_bounding_sphere(),
     )
 )
 
@@ -594,8 +622,6 @@ model = glm.rotate(model, -math.pi / 2, glm.vec3(1, 0, 0))
 model = glm.scale(model, glm.vec3(0.3))
 
 cat_model_mesh().write_uniform("m_model", model)
-cat_model_mesh().write_uniform("m_proj", _3dcam._projection)
-cat_model_mesh().write_uniform("m_view", _3dcam._view)
 cat_model_mesh().set_texture(0, c_tex)
 
 
@@ -609,10 +635,7 @@ def camera_task():
     )
     _3dcam.target = glm.vec3(0, 0, 0)
 
-    # update data in shader
-    shader_program["m_view"].write(_3dcam._view)
-    shader_program2["m_view"].write(_3dcam._view)
-    cat_model_mesh().write_uniform("m_view", _3dcam._view)
+    # view + projection go through the shared camera uniform block
 
     # print out fps
     print(f"{consts.RUN_TIME:.5f} | FPS: {consts.W_CLOCK.get_fps()}")